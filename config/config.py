@@ -12,6 +12,106 @@ PROCESSED_DATA_DIR = BASE_DIR / 'data' / 'processed'
 # --- Chemin model ---
 MODEL_DIR = BASE_DIR / "exported_model"
 
+# --- Rechargement du modèle en arrière-plan ---
+# Le nouveau modèle est téléchargé et validé dans MODEL_STAGING_DIR avant de remplacer MODEL_DIR
+# (l'ancien est conservé dans MODEL_BACKUP_DIR)
+MODEL_STAGING_DIR = Path(os.getenv("MODEL_STAGING_DIR", BASE_DIR / "exported_model.staging"))
+MODEL_BACKUP_DIR = Path(os.getenv("MODEL_BACKUP_DIR", BASE_DIR / "exported_model.previous"))
+# Tailles des batchs synthétiques passés dans une session neuve avant de servir du trafic
+MODEL_WARMUP_BATCH_SIZES = [int(size) for size in os.getenv("MODEL_WARMUP_BATCH_SIZES", "1,64,1024").split(",") if size]
+
+# --- Inférence batch ---
+# Nombre maximum de lignes envoyées à ONNX en un seul appel session.run
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", 1024))
+
+# --- Micro-batching /individual_score ---
+# Regroupe les requêtes unitaires arrivant dans la même fenêtre en un seul appel ONNX
+MICRO_BATCHING_ENABLED = os.getenv("MICRO_BATCHING_ENABLED", "false").lower() in ("1", "true", "yes")
+MICRO_BATCH_WINDOW_MS = float(os.getenv("MICRO_BATCH_WINDOW_MS", 2.0))
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", 64))
+MICRO_BATCH_QUEUE_SIZE = int(os.getenv("MICRO_BATCH_QUEUE_SIZE", 1024))
+
+# --- Cache des prédictions /individual_score ---
+# Clé : version du modèle + vecteur de features ordonné ; vidé à chaque rechargement du modèle
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", 10000))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", 300.0))
+
+# --- Exécution ONNX ---
+# Pool de threads dédié à l'inférence (hors boucle d'évènements uvicorn)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", min(4, os.cpu_count() or 1)))
+# SessionOptions ONNX Runtime (0 = laisser ONNX Runtime choisir)
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", 0))
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", 0))
+ORT_GRAPH_OPTIMIZATION_LEVEL = os.getenv("ORT_GRAPH_OPTIMIZATION_LEVEL", "all")  # disabled | basic | extended | all
+ORT_EXECUTION_MODE = os.getenv("ORT_EXECUTION_MODE", "sequential")  # sequential | parallel
+ORT_ENABLE_CPU_MEM_ARENA = os.getenv("ORT_ENABLE_CPU_MEM_ARENA", "true").lower() in ("1", "true", "yes")
+ORT_ENABLE_MEM_PATTERN = os.getenv("ORT_ENABLE_MEM_PATTERN", "true").lower() in ("1", "true", "yes")
+
+# --- Backend d'inférence ---
+# "thread" : une session ONNX dans le process API ; "process" : pool de workers (1 session chacun)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "thread").lower()
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", os.cpu_count() or 1))
+INFERENCE_WORKER_TIMEOUT_S = float(os.getenv("INFERENCE_WORKER_TIMEOUT_S", 30.0))
+
+# --- Journalisation des prédictions ---
+# Writer unique qui regroupe les logs en inserts multi-lignes (toutes les N lignes ou T ms)
+LOG_WRITER_ENABLED = os.getenv("LOG_WRITER_ENABLED", "true").lower() in ("1", "true", "yes")
+LOG_FLUSH_ROWS = int(os.getenv("LOG_FLUSH_ROWS", 500))
+LOG_FLUSH_INTERVAL_MS = float(os.getenv("LOG_FLUSH_INTERVAL_MS", 200.0))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+# Politique de file pleine sans tampon disque (avec LOG_SPILL_ENABLED, les lignes partent sur disque par lots)
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "block").lower()  # block | drop_newest | drop_oldest
+LOG_QUEUE_BLOCK_TIMEOUT_MS = float(os.getenv("LOG_QUEUE_BLOCK_TIMEOUT_MS", 50.0))
+# "auto" : COPY FROM STDIN sur PostgreSQL, INSERT multi-lignes ailleurs ; "insert" force les INSERT
+LOG_INGESTION_METHOD = os.getenv("LOG_INGESTION_METHOD", "auto").lower()  # auto | copy | insert
+
+# --- Base de données ---
+# Moteur asynchrone (asyncpg pour Postgres, aiosqlite pour SQLite) et pool de connexions explicite
+DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").lower() in ("1", "true", "yes")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT_S = float(os.getenv("DB_POOL_TIMEOUT_S", 30.0))
+DB_POOL_RECYCLE_S = int(os.getenv("DB_POOL_RECYCLE_S", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Tampon disque des logs (segments NDJSON append-only) quand la base est lente ou indisponible
+LOG_SPILL_ENABLED = os.getenv("LOG_SPILL_ENABLED", "true").lower() in ("1", "true", "yes")
+LOG_SPILL_DIR = Path(os.getenv("LOG_SPILL_DIR", BASE_DIR / "data" / "log_spill"))
+LOG_SPILL_SEGMENT_BYTES = int(os.getenv("LOG_SPILL_SEGMENT_BYTES", 8 * 1024 * 1024))
+LOG_SPILL_FSYNC = os.getenv("LOG_SPILL_FSYNC", "true").lower() in ("1", "true", "yes")
+LOG_SPILL_REPLAY_INTERVAL_S = float(os.getenv("LOG_SPILL_REPLAY_INTERVAL_S", 5.0))
+
+# --- Partitionnement et rétention des logs (PostgreSQL) ---
+# Partitionnement natif par plage de `timestamp` à la création de la table
+LOG_PARTITIONING = os.getenv("LOG_PARTITIONING", "none").lower()  # none | daily | monthly
+LOG_PARTITIONS_AHEAD = int(os.getenv("LOG_PARTITIONS_AHEAD", 3))
+LOG_PARTITION_MAINTENANCE_INTERVAL_S = float(os.getenv("LOG_PARTITION_MAINTENANCE_INTERVAL_S", 3600.0))
+# Rétention : les partitions entièrement plus anciennes sont supprimées ou détachées (archive), 0 = désactivée
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", 0))
+LOG_RETENTION_ACTION = os.getenv("LOG_RETENTION_ACTION", "drop").lower()  # drop | detach
+
+# --- Monitoring du drift en ligne ---
+# Histogrammes glissants par feature comparés au profil de référence (mêmes bins)
+DRIFT_MONITOR_ENABLED = os.getenv("DRIFT_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+DRIFT_REFERENCE_PATH = Path(os.getenv("DRIFT_REFERENCE_PATH", MODEL_DIR / "reference_profile.json"))
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", 5000))  # dernières prédictions par version du modèle
+DRIFT_MIN_SAMPLES = int(os.getenv("DRIFT_MIN_SAMPLES", 200))
+
+# --- Métriques Prometheus (/metrics) ---
+# Compteurs, requêtes en cours et histogrammes de latence par endpoint, version et étape
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# --- Export Parquet des logs (analyse de drift hors ligne) ---
+LOG_EXPORT_DIR = Path(os.getenv("LOG_EXPORT_DIR", BASE_DIR / "data" / "exports" / "prediction_logs"))
+LOG_EXPORT_BATCH_ROWS = int(os.getenv("LOG_EXPORT_BATCH_ROWS", 50000))  # lignes par row group
+# Délai laissé aux transactions d'écriture en cours avant un export incrémental (ids validés dans le désordre)
+LOG_EXPORT_SAFETY_LAG_S = float(os.getenv("LOG_EXPORT_SAFETY_LAG_S", 10.0))
+
+# --- Scoring en flux (NDJSON) ---
+# Taille maximale d'une ligne : borne la mémoire si le client n'envoie jamais de retour à la ligne
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", 64 * 1024))
+
 # --- Déclaration couleurs ---
 VIOLET_CLAIR = '#99abf7'
 VIOLET_FONCE = '#7451eb'
@@ -0,0 +1,365 @@
+"""Benchmark reproductible de l'API de scoring, sans réseau ni modèle de production.
+
+Un petit modèle CatBoost exporté en ONNX (signature `ScoringData`, données
+synthétiques, graine fixe) est généré une fois, puis l'application ASGI est
+pilotée en mémoire (httpx.ASGITransport, lifespan compris) sur `/individual_score`
+et `/multiple_score` pour chaque taille de batch et niveau de concurrence.
+Débit, latences p50/p95/p99 et RSS sont écrits en JSON ; comparé à une baseline,
+le script sort en erreur (code 1) si un scénario régresse au-delà des seuils.
+
+Exemples :
+    python -m scripts.benchmark_api --save-baseline
+    python -m scripts.benchmark_api --batch-sizes 1,100,10000 --concurrency 1,8 --max-latency-increase 0.15
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from config.config import BASE_DIR
+
+BENCHMARK_DIR = BASE_DIR / "data" / "benchmarks"
+BENCHMARK_VERSION = "benchmark"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+# Percentiles de latence comparés à la baseline
+LATENCY_KEYS = ("p50", "p95", "p99")
+
+
+def field_bounds(field) -> tuple[float | None, float | None]:
+    lower = upper = None
+    for constraint in field.metadata:
+        lower = getattr(constraint, "ge", lower)
+        upper = getattr(constraint, "le", upper)
+    return lower, upper
+
+
+def generate_rows(nb_rows: int, seed: int = 0) -> list[dict]:
+    """Synthetic rows respecting the `ScoringData` types and bounds (scale taken from the schema example)."""
+    from src.api.schemas import ScoringData
+
+    rng = np.random.default_rng(seed)
+    example = ScoringData.model_config["json_schema_extra"]["example"]
+    columns = {}
+    for name, field in ScoringData.model_fields.items():
+        lower, upper = field_bounds(field)
+        scale = max(abs(float(example[name])) * 2, 1.0)
+        if field.annotation is bool:
+            columns[name] = (rng.random(nb_rows) < 0.5).tolist()
+            continue
+        low = lower if lower is not None else -scale
+        high = upper if upper is not None else (low + scale if lower is not None else scale)
+        if field.annotation is int:
+            columns[name] = rng.integers(int(low), int(high), endpoint=True, size=nb_rows).tolist()
+        else:
+            columns[name] = np.round(rng.uniform(low, high, size=nb_rows), 4)
+
+    # Règles croisées de ScoringData : emploi <= âge, min <= moyenne <= max des sources externes
+    columns["YEARS_EMPLOYED"] = np.minimum(columns["YEARS_EMPLOYED"], np.asarray(columns["YEARS_BIRTH"]) - 18)
+    sources = np.sort(np.column_stack([columns[n] for n in ("FE_EXT_SOURCE_MIN", "FE_EXT_SOURCE_MEAN", "FE_EXT_SOURCE_MAX")]), axis=1)
+    columns["FE_EXT_SOURCE_MIN"], columns["FE_EXT_SOURCE_MEAN"], columns["FE_EXT_SOURCE_MAX"] = sources.T
+    columns = {name: np.asarray(values).tolist() for name, values in columns.items()}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def drop_zipmap(path: Path):
+    """Expose the (n, 2) probability tensor instead of the ZipMap output (one dict per row)
+    that CatBoost appends to classifiers, as the production model does."""
+    import onnx
+
+    model = onnx.load(str(path))
+    graph = model.graph
+    zipmap = next((node for node in graph.node if node.op_type == "ZipMap"), None)
+    if zipmap is None:
+        return
+    tensor_name, output_name = zipmap.input[0], zipmap.output[0]
+    graph.node.remove(zipmap)
+    # Le tenseur de probabilités reprend le nom de la sortie du graphe
+    for node in graph.node:
+        for i, name in enumerate(node.output):
+            if name == tensor_name:
+                node.output[i] = output_name
+    output = next(output for output in graph.output if output.name == output_name)
+    output.CopyFrom(onnx.helper.make_tensor_value_info(output_name, onnx.TensorProto.FLOAT, [None, 2]))
+    onnx.checker.check_model(model)
+    onnx.save(model, str(path))
+
+
+def build_benchmark_model(path: Path, nb_rows: int = 5000, seed: int = 0) -> Path:
+    """Train a small CatBoost classifier on synthetic rows and export it to ONNX."""
+    try:
+        import onnx
+        from catboost import CatBoostClassifier
+    except ImportError as e:
+        raise ImportError("catboost and onnx are required to generate the benchmark model "
+                          "(pip install -e '.[dev]'), or pass an existing ONNX file with --model") from e
+    from src.api.schemas import ScoringData
+
+    columns = list(ScoringData.model_fields)
+    X = np.array([[float(row[name]) for name in columns] for row in generate_rows(nb_rows, seed)], dtype=np.float32)
+    # Cible synthétique dépendant des sources externes et des retards de paiement
+    rng = np.random.default_rng(seed)
+    logits = 3 * (0.5 - X[:, columns.index("FE_EXT_SOURCE_MEAN")]) + 0.05 * X[:, columns.index("INSTAL_DPD_MEAN")]
+    y = (rng.random(nb_rows) < 1 / (1 + np.exp(-logits))).astype(int)
+
+    model = CatBoostClassifier(iterations=100, depth=6, random_seed=seed, verbose=False, allow_writing_files=False)
+    model.fit(X, y)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    model.save_model(str(path), format="onnx")
+    drop_zipmap(path)
+    return path
+
+
+def build_benchmark_runtime(model_path: Path):
+    import onnxruntime as ort
+    from src.api.schemas import ScoringData
+    from src.model.model_service import build_model_runtime, build_session_options
+
+    session = ort.InferenceSession(str(model_path), sess_options=build_session_options(), providers=["CPUExecutionProvider"])
+    signature = {
+        "exists": True,
+        "columns": [{"name": name} for name in ScoringData.model_fields],
+        "nb_features": len(ScoringData.model_fields),
+        "best_threshold": 0.5,
+    }
+    info = {"exists": True, "mlflow_model_id": BENCHMARK_VERSION, "best_threshold": 0.5}
+    return build_model_runtime(session, signature, info)
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Ko, macOS : octets
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def latency_summary(latencies_s: list[float]) -> dict:
+    latencies_ms = np.asarray(latencies_s) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, (50, 95, 99))
+    return {
+        "mean": round(float(latencies_ms.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(latencies_ms.max()), 3),
+    }
+
+
+def scenario_name(endpoint: str, batch_size: int, concurrency: int) -> str:
+    return f"{endpoint.strip('/')}/batch={batch_size}/concurrency={concurrency}"
+
+
+async def run_scenario(client, endpoint: str, bodies: list[bytes], batch_size: int, concurrency: int,
+                       nb_requests: int, nb_warmup: int) -> dict:
+    """Closed loop: `concurrency` clients send `nb_requests` pre-encoded requests back to back."""
+    headers = {"content-type": "application/json"}
+    for i in range(nb_warmup):
+        await client.post(endpoint, content=bodies[i % len(bodies)], headers=headers)
+
+    latencies, errors = [], 0
+    next_request = iter(range(nb_requests))
+
+    async def worker():
+        nonlocal errors
+        for i in next_request:
+            start = time.perf_counter()
+            response = await client.post(endpoint, content=bodies[i % len(bodies)], headers=headers)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "name": scenario_name(endpoint, batch_size, concurrency),
+        "endpoint": endpoint,
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "requests": nb_requests,
+        "rows": nb_requests * batch_size,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(nb_requests / elapsed, 2),
+        "throughput_rows_s": round(nb_requests * batch_size / elapsed, 2),
+        "latency_ms": latency_summary(latencies),
+        "rss_mb": round(current_rss_mb(), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def build_scenarios(batch_sizes: list[int], concurrency_levels: list[int]) -> list[tuple[str, int, int]]:
+    # /individual_score ne prend qu'une ligne : seule la concurrence varie
+    scenarios = [("/individual_score", 1, c) for c in concurrency_levels]
+    scenarios += [("/multiple_score", b, c) for b in batch_sizes for c in concurrency_levels]
+    return scenarios
+
+
+async def run_benchmark(runtime, scenarios: list[tuple[str, int, int]], rows: list[dict],
+                        rows_per_scenario: int, min_requests: int, nb_warmup: int) -> list[dict]:
+    import httpx
+    from src.api import main
+
+    original_loader = main.load_model_runtime
+    main.load_model_runtime = lambda: runtime
+    results = []
+    try:
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+                for endpoint, batch_size, concurrency in scenarios:
+                    if endpoint == "/individual_score":
+                        bodies = [json.dumps(row).encode() for row in rows[:1000]]
+                    else:
+                        # Quelques batchs distincts, tirés en boucle sur le pool de lignes synthétiques
+                        bodies = [
+                            json.dumps([rows[(start + i) % len(rows)] for i in range(batch_size)]).encode()
+                            for start in range(0, min(len(rows), 4 * batch_size), batch_size)
+                        ]
+                    nb_requests = max(min_requests, rows_per_scenario // batch_size)
+                    result = await run_scenario(client, endpoint, bodies, batch_size, concurrency, nb_requests, nb_warmup)
+                    results.append(result)
+                    latency = result["latency_ms"]
+                    print(
+                        f"{result['name']:<45} {result['throughput_rows_s']:>12,.0f} lignes/s  "
+                        f"p50={latency['p50']:.2f} p95={latency['p95']:.2f} p99={latency['p99']:.2f} ms  "
+                        f"RSS={result['rss_mb']:.0f} Mo  erreurs={result['errors']}"
+                    )
+    finally:
+        main.load_model_runtime = original_loader
+    return results
+
+
+def compare_to_baseline(results: list[dict], baseline: dict, max_throughput_drop: float,
+                        max_latency_increase: float, max_rss_increase: float) -> list[str]:
+    """Regression messages for scenarios present in both runs (empty list: no regression)."""
+    reference = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    regressions = []
+    for scenario in results:
+        name = scenario["name"]
+        if scenario["errors"]:
+            regressions.append(f"{name}: {scenario['errors']} failed request(s)")
+        base = reference.get(name)
+        if base is None:
+            continue
+        if scenario["throughput_rows_s"] < base["throughput_rows_s"] * (1 - max_throughput_drop):
+            regressions.append(
+                f"{name}: throughput {scenario['throughput_rows_s']:,.0f} rows/s "
+                f"< baseline {base['throughput_rows_s']:,.0f} - {max_throughput_drop:.0%}"
+            )
+        for key in LATENCY_KEYS:
+            current, previous = scenario["latency_ms"][key], base["latency_ms"][key]
+            if current > previous * (1 + max_latency_increase):
+                regressions.append(f"{name}: {key} {current:.3f} ms > baseline {previous:.3f} ms + {max_latency_increase:.0%}")
+        if scenario["rss_mb"] > base["rss_mb"] * (1 + max_rss_increase):
+            regressions.append(f"{name}: RSS {scenario['rss_mb']:.0f} MB > baseline {base['rss_mb']:.0f} MB + {max_rss_increase:.0%}")
+    return regressions
+
+
+def environment() -> dict:
+    import onnxruntime as ort
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "onnxruntime": ort.__version__,
+    }
+
+
+def relative_path(path: Path) -> str:
+    """Path relative to the repository when possible, so that a committed baseline is portable."""
+    try:
+        return str(path.resolve().relative_to(BASE_DIR.resolve()))
+    except ValueError:
+        return str(path)
+
+
+def int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=BENCHMARK_DIR / "model.onnx",
+                        help="Modèle ONNX du benchmark (généré s'il n'existe pas)")
+    parser.add_argument("--regenerate", action="store_true", help="Régénère le modèle CatBoost -> ONNX")
+    parser.add_argument("--batch-sizes", type=int_list, default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8, 32])
+    parser.add_argument("--rows-per-scenario", type=int, default=20000, help="Lignes scorées par scénario")
+    parser.add_argument("--min-requests", type=int, default=20, help="Nombre minimal de requêtes par scénario")
+    parser.add_argument("--warmup", type=int, default=5, help="Requêtes de chauffe par scénario (non mesurées)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre ce run comme baseline")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.10, help="Baisse de débit tolérée (fraction)")
+    parser.add_argument("--max-latency-increase", type=float, default=0.20, help="Hausse de latence tolérée (fraction)")
+    parser.add_argument("--max-rss-increase", type=float, default=0.25, help="Hausse de RSS tolérée (fraction)")
+    args = parser.parse_args()
+
+    # Base SQLite jetable : les logs de prédiction ne touchent pas la base configurée
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.db'}"
+    from config.logger import logger
+    logger.setLevel("WARNING")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.regenerate or not args.model.exists():
+        print(f"ℹ️ Generating benchmark model -> {args.model}")
+        build_benchmark_model(args.model, seed=args.seed)
+    runtime = build_benchmark_runtime(args.model)
+    rows = generate_rows(max(args.batch_sizes + [1000]) * 4, seed=args.seed)
+
+    print(f"\n🚀 API benchmark ({len(rows)} synthetic rows, model {args.model.name})")
+    scenarios = build_scenarios(args.batch_sizes, args.concurrency)
+    results = asyncio.run(run_benchmark(runtime, scenarios, rows, args.rows_per_scenario, args.min_requests, args.warmup))
+    runtime.close()
+
+    report = {
+        "created_on": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {key: (relative_path(value) if isinstance(value, Path) else value) for key, value in vars(args).items()},
+        "scenarios": results,
+    }
+    output = args.output or BENCHMARK_DIR / "results" / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1))
+    print(f"✅ Results written to {output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=1))
+        print(f"✅ Baseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"ℹ️ No baseline at {args.baseline}: run with --save-baseline to create one.")
+        return
+
+    regressions = compare_to_baseline(
+        results, json.loads(args.baseline.read_text()),
+        args.max_throughput_drop, args.max_latency_increase, args.max_rss_increase
+    )
+    if regressions:
+        print("❌ Performance regressions against the baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("✅ No regression against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Construit le profil de référence livré avec le modèle, à partir des données
+d'entraînement : bornes des bins, effectifs, moments et quantiles par feature,
+et distribution des scores du modèle. Le fichier est écrit à côté de
+`model.onnx` / `MLmodel` (MODEL_DIR) et publié avec eux sur Hugging Face.
+
+Exemple :
+    python -m scripts.build_reference_profile --data data/external/kaggle_master_dataset.parquet --bins 10
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from config.config import EXTERNAL_DATA_DIR, DRIFT_REFERENCE_PATH
+from src.api.schemas import ScoringData
+from src.model.model_service import get_model_signature, load_model_runtime, score_feature_matrix
+from src.model.reference_profile import build_reference_profile, save_reference_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=EXTERNAL_DATA_DIR / "kaggle_master_dataset.parquet", help="Parquet d'entraînement")
+    parser.add_argument("--bins", type=int, default=10, help="Nombre de bins (quantiles) par feature")
+    parser.add_argument("--output", default=DRIFT_REFERENCE_PATH, help="Fichier JSON du profil")
+    parser.add_argument("--no-score", action="store_true", help="Ne calcule pas la distribution des scores")
+    args = parser.parse_args()
+
+    signature = get_model_signature()
+    columns = [col["name"] for col in signature["columns"]] if signature["exists"] else list(ScoringData.model_fields)
+    # Seules les colonnes du modèle sont lues
+    df = pd.read_parquet(args.data, columns=columns)
+
+    scores, model_version = None, None
+    runtime = None if args.no_score else load_model_runtime()
+    if runtime is not None:
+        matrix = np.ascontiguousarray(df[list(runtime.column_names)].to_numpy(dtype=np.float32))
+        scores, _ = score_feature_matrix(runtime, matrix)
+        model_version = runtime.version
+        runtime.close()
+    elif not args.no_score:
+        print("⚠️ Modèle introuvable : profil construit sans distribution des scores.")
+
+    profile = build_reference_profile(df, columns, nb_bins=args.bins, scores=scores, model_version=model_version)
+    save_reference_profile(profile, args.output)
+    print(f"✅ Profil de référence ({len(df)} lignes, {len(columns)} features, modèle {model_version}) écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Exporte 'prediction_logs' en Parquet (features typées) pour l'analyse de drift.
+
+Par défaut l'export est incrémental : seules les lignes postérieures au dernier
+export du dossier (watermark) sont écrites, ce qui convient à un job nocturne.
+Il s'arrête au dernier id visible au lancement et attend `--safety-lag`
+secondes que les écritures en cours soient validées.
+
+Exemple :
+    python -m scripts.export_prediction_logs --output-dir data/exports/prediction_logs
+    python -m scripts.export_prediction_logs --start 2026-01-01 --end 2026-02-01 --full
+"""
+import argparse
+from datetime import datetime
+
+from config.config import LOG_EXPORT_DIR, LOG_EXPORT_BATCH_ROWS, LOG_EXPORT_SAFETY_LAG_S
+from src.api.database.database import engine
+from src.api.database.export import export_prediction_logs
+from src.api.database.monitoring import to_naive_utc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default=LOG_EXPORT_DIR, help="Dossier des fichiers Parquet et du watermark")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Début de la période (ISO 8601, UTC)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Fin de la période, exclue (ISO 8601, UTC)")
+    parser.add_argument("--batch-rows", type=int, default=LOG_EXPORT_BATCH_ROWS, help="Lignes par row group")
+    parser.add_argument("--full", action="store_true", help="Ignore et ne met pas à jour le watermark")
+    parser.add_argument(
+        "--safety-lag", type=float, default=LOG_EXPORT_SAFETY_LAG_S,
+        help="Secondes laissées aux écritures en cours avant un export incrémental"
+    )
+    args = parser.parse_args()
+
+    summary = export_prediction_logs(
+        engine,
+        output_dir=args.output_dir,
+        start=to_naive_utc(args.start) if args.start else None,
+        end=to_naive_utc(args.end) if args.end else None,
+        batch_rows=args.batch_rows,
+        incremental=not args.full,
+        safety_lag_s=args.safety_lag,
+    )
+    if summary["file"]:
+        print(f"✅ {summary['rows']} ligne(s) exportée(s) dans {summary['file']} (dernier id {summary['last_id']})")
+    else:
+        print(f"ℹ️ Aucune nouvelle ligne à exporter (dernier id {summary['last_id']})")
+
+
+if __name__ == "__main__":
+    main()
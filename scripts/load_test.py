@@ -0,0 +1,251 @@
+"""Générateur de charge en boucle ouverte pour l'API de scoring.
+
+Les requêtes partent à des instants planifiés à l'avance (taux cible constant ou
+arrivées de Poisson), que les réponses précédentes soient revenues ou non : une
+API qui ralentit ne ralentit pas le trafic. La latence est mesurée depuis
+l'instant d'envoi *prévu* (correction de la coordinated omission), la latence
+de service (depuis l'envoi effectif) est rapportée à côté.
+
+Sources de trafic :
+  - jsonl    : un payload JSON par ligne (ou une ligne de log avec sa clé "inputs")
+  - logs     : export Parquet des `prediction_logs` (fichier ou dossier de scripts.export_prediction_logs)
+  - training : échantillon du Parquet d'entraînement
+
+Exemples :
+    python -m scripts.load_test --source training --path data/external/kaggle_master_dataset.parquet --rate 50 --duration 60
+    python -m scripts.load_test --source logs --path data/exports/prediction_logs --rate 200 --arrival constant
+    python -m scripts.load_test --source training --path data/external/kaggle_master_dataset.parquet \\
+        --rate 20 --drift "AMT_ANNUITY*2" --drift-start 30
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.api.schemas import ScoringData
+
+SOURCES = ("jsonl", "logs", "training")
+ARRIVALS = ("poisson", "constant")
+PERCENTILES = {"p50": 50, "p90": 90, "p99": 99, "p99.9": 99.9}
+DRIFT_PATTERN = re.compile(r"^\s*(\w+)\s*([*+=])\s*(-?[\d.eE+-]+)\s*$")
+
+
+@dataclass(frozen=True)
+class Drift:
+    """Shift applied to one feature: `column*factor`, `column+offset` or `column=value`."""
+    column: str
+    operator: str
+    value: float
+
+    @classmethod
+    def parse(cls, expression: str) -> "Drift":
+        match = DRIFT_PATTERN.match(expression)
+        if not match:
+            raise ValueError(f"Invalid drift '{expression}'. Use COLUMN*FACTOR, COLUMN+OFFSET or COLUMN=VALUE.")
+        column, operator, value = match.groups()
+        return cls(column, operator, float(value))
+
+    def apply(self, record: dict) -> dict:
+        value = record.get(self.column)
+        if value is None and self.operator != "=":
+            return record
+        if self.operator == "*":
+            value = value * self.value
+        elif self.operator == "+":
+            value = value + self.value
+        else:
+            value = self.value
+        return {**record, self.column: value}
+
+
+def to_records(df: pd.DataFrame, columns: list[str]) -> list[dict]:
+    """Model columns only, NaN sent as null (the API answers 422, as in production)."""
+    df = df[[column for column in columns if column in df.columns]]
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def load_records(source: str, path: Path | str, sample: int | None = None, seed: int = 0) -> list[dict]:
+    """
+    Objectif : Charger le trafic à rejouer sous forme de payloads `/individual_score`.
+    """
+    path = Path(path)
+    columns = list(ScoringData.model_fields)
+    if source == "jsonl":
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records.append(record.get("inputs", record) if isinstance(record, dict) else record)
+    elif source in ("logs", "training"):
+        df = pd.read_parquet(path)
+        if source == "logs" and "status_code" in df.columns:
+            # Les appels rejetés n'ont pas d'entrée typée
+            df = df[df["status_code"] != 422]
+        if sample and sample < len(df):
+            df = df.sample(n=sample, random_state=seed)
+        records = to_records(df, columns)
+    else:
+        raise ValueError(f"Unknown source '{source}'. Use one of {', '.join(SOURCES)}.")
+    if sample and source == "jsonl":
+        records = records[:sample]
+    if not records:
+        raise ValueError(f"No record to replay in {path}")
+    return records
+
+
+def arrival_offsets(rate: float, nb_requests: int, arrival: str = "poisson", seed: int = 0) -> np.ndarray:
+    """Planned send times (seconds from start) for a target rate in requests per second."""
+    if rate <= 0:
+        raise ValueError("rate must be > 0")
+    if arrival == "constant":
+        return np.arange(nb_requests) / rate
+    if arrival == "poisson":
+        # Arrivées de Poisson : intervalles exponentiels de moyenne 1/rate
+        gaps = np.random.default_rng(seed).exponential(1 / rate, size=nb_requests)
+        return np.cumsum(gaps) - gaps[0]
+    raise ValueError(f"Unknown arrival process '{arrival}'. Use one of {', '.join(ARRIVALS)}.")
+
+
+def build_payloads(records: list[dict], nb_requests: int, offsets: np.ndarray, batch_size: int = 1,
+                   drifts: list[Drift] | None = None, drift_start_s: float = 0.0, drift_fraction: float = 1.0,
+                   seed: int = 0) -> tuple[list[bytes], int]:
+    """Encode the request bodies in advance (records replayed in a loop); returns (bodies, nb_drifted)."""
+    rng = np.random.default_rng(seed)
+    bodies, nb_drifted = [], 0
+    for i in range(nb_requests):
+        batch = [records[(i * batch_size + k) % len(records)] for k in range(batch_size)]
+        if drifts and offsets[i] >= drift_start_s and rng.random() < drift_fraction:
+            for drift in drifts:
+                batch = [drift.apply(record) for record in batch]
+            nb_drifted += 1
+        bodies.append(json.dumps(batch[0] if batch_size == 1 else batch).encode())
+    return bodies, nb_drifted
+
+
+def percentiles_ms(latencies_s) -> dict:
+    if not len(latencies_s):
+        return {}
+    latencies_ms = np.asarray(latencies_s) * 1000
+    summary = {name: round(float(np.percentile(latencies_ms, q)), 3) for name, q in PERCENTILES.items()}
+    summary["max"] = round(float(latencies_ms.max()), 3)
+    return summary
+
+
+async def run_load(client, endpoint: str, bodies: list[bytes], offsets: np.ndarray, max_inflight: int = 1000) -> dict:
+    """
+    Objectif : Envoyer chaque corps à son instant planifié sans attendre les
+    réponses précédentes (au plus `max_inflight` requêtes en vol).
+
+    Latence corrigée = fin - instant prévu ; latence de service = fin - envoi effectif.
+    Si le générateur prend du retard (limite de requêtes en vol atteinte), le
+    retard est compté dans la latence corrigée au lieu d'être masqué.
+    """
+    headers = {"content-type": "application/json"}
+    slots = asyncio.Semaphore(max_inflight)
+    corrected, service, statuses = [], [], {}
+    max_send_lag = 0.0
+
+    async def send(body: bytes, planned: float):
+        sent = time.perf_counter()
+        try:
+            response = await client.post(endpoint, content=body, headers=headers)
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        finally:
+            slots.release()
+        done = time.perf_counter()
+        corrected.append(done - planned)
+        service.append(done - sent)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    tasks = []
+    start = time.perf_counter()
+    for body, offset in zip(bodies, offsets):
+        planned = start + offset
+        delay = planned - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        max_send_lag = max(max_send_lag, time.perf_counter() - planned)
+        tasks.append(asyncio.create_task(send(body, planned)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    nb_requests = len(bodies)
+    nb_ok = statuses.get("200", 0)
+    return {
+        "requests": nb_requests,
+        "duration_s": round(elapsed, 3),
+        "achieved_rate": round(nb_requests / elapsed, 2),
+        "statuses": statuses,
+        "error_rate": round(1 - nb_ok / nb_requests, 4) if nb_requests else 0.0,
+        "max_send_lag_ms": round(max_send_lag * 1000, 3),
+        "latency_ms": percentiles_ms(corrected),
+        "service_time_ms": percentiles_ms(service),
+    }
+
+
+async def run_http(url: str, endpoint: str, bodies: list[bytes], offsets: np.ndarray, max_inflight: int, timeout_s: float) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout_s) as client:
+        return await run_load(client, endpoint, bodies, offsets, max_inflight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=SOURCES, required=True)
+    parser.add_argument("--path", type=Path, required=True, help="Fichier NDJSON, export Parquet ou Parquet d'entraînement")
+    parser.add_argument("--sample", type=int, default=None, help="Nombre de lignes tirées de la source")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, required=True, help="Taux cible (requêtes/s)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Durée du test (s)")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson")
+    parser.add_argument("--batch-size", type=int, default=1, help="> 1 : requêtes /multiple_score de N lignes")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Requêtes simultanées maximum")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout HTTP (s)")
+    parser.add_argument("--drift", action="append", default=[], help='Dérive injectée, ex. "AMT_ANNUITY*2" (répétable)')
+    parser.add_argument("--drift-start", type=float, default=0.0, help="Début de la dérive (s après le départ)")
+    parser.add_argument("--drift-fraction", type=float, default=1.0, help="Part des requêtes dérivées après le début")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Rapport JSON")
+    args = parser.parse_args()
+
+    records = load_records(args.source, args.path, args.sample, args.seed)
+    drifts = [Drift.parse(expression) for expression in args.drift]
+    nb_requests = max(1, int(args.rate * args.duration))
+    offsets = arrival_offsets(args.rate, nb_requests, args.arrival, args.seed)
+    bodies, nb_drifted = build_payloads(
+        records, nb_requests, offsets, args.batch_size, drifts, args.drift_start, args.drift_fraction, args.seed
+    )
+    endpoint = "/individual_score" if args.batch_size == 1 else "/multiple_score"
+
+    print(f"🚀 {nb_requests} requests to {args.url}{endpoint} ({args.arrival}, {args.rate:g} req/s, "
+          f"{len(records)} source rows, {nb_drifted} drifted)")
+    report = asyncio.run(run_http(args.url, endpoint, bodies, offsets, args.max_inflight, args.timeout))
+    report.update({"source": args.source, "endpoint": endpoint, "arrival": args.arrival, "target_rate": args.rate,
+                   "drifts": args.drift, "drifted_requests": nb_drifted})
+
+    latency, service = report["latency_ms"], report["service_time_ms"]
+    print(f"Débit atteint : {report['achieved_rate']:.1f} req/s (cible {args.rate:g}), statuts {report['statuses']}")
+    print("Latence corrigée (ms) : " + "  ".join(f"{k}={v:.2f}" for k, v in latency.items()))
+    print("Temps de service (ms) : " + "  ".join(f"{k}={v:.2f}" for k, v in service.items()))
+    if report["max_send_lag_ms"] > 100:
+        print(f"⚠️ Generator fell behind schedule by up to {report['max_send_lag_ms']:.0f} ms (raise --max-inflight?)")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=1))
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import cProfile
 import pstats
-from src.model.model_service import get_prediction, load_model_instance
+from src.model.model_service import get_prediction, load_model_runtime
 from src.api.schemas import ScoringData
 
 # Accès direct à l'exemple via la configuration de la classe (Pydantic v2)
@@ -10,17 +10,17 @@ sample = ScoringData.model_config['json_schema_extra']['example']
 request = ScoringData(**sample)
 data_dict = request.model_dump()
 
-model = load_model_instance()
+runtime = load_model_runtime()
 
-if model is None:
+if runtime is None:
     print("❌ Erreur : Le modèle n'a pas pu être chargé.")
 else:
     profiler = cProfile.Profile()
     profiler.enable()
 
-    # Deuxième appel pour voir l'effet du cache (get_model_signature)
-    print("\n🚀 Deuxième appel (avec cache)...")
-    get_prediction(model, data_dict)
+    # Signature, seuil et nom d'entrée sont précompilés dans le runtime
+    print("\n🚀 Appel avec runtime précompilé...")
+    get_prediction(runtime, data_dict)
 
     profiler.disable()
 
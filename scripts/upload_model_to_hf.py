@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 from config.config import BASE_DIR, MODEL_DIR
 from config.logger import logger
 from src.model.hf_interaction import upload_model_to_hf
+from src.model.reference_profile import REFERENCE_PROFILE_FILE
 from src.model.mlflow_interaction import set_tracking_uri, download_model_artifacts, find_model_file
 
 load_dotenv(BASE_DIR / ".env.dev")
@@ -42,6 +43,10 @@ if __name__ == '__main__':
     # logger.info(f"Upload: local_file={model_file}, repo_id={repo_id}, path_in_repo={path_in_repo}")
     # result = upload_model_to_hf(str(model_file), repo_id, path_in_repo, token=token)
     
+    # Le profil de référence du drift est versionné avec le modèle
+    if not (MODEL_DIR / REFERENCE_PROFILE_FILE).exists():
+        logger.warning(f"{REFERENCE_PROFILE_FILE} absent : lancer `python -m scripts.build_reference_profile` avant l'upload")
+
     # Upload de tout le dossier MODEL_DIR
     logger.info(f"Upload du dossier complet: {MODEL_DIR} -> {repo_id}")
     result = upload_model_to_hf(MODEL_DIR, repo_id, path_in_repo=".", token=token)
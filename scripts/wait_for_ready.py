@@ -0,0 +1,49 @@
+"""Attend que l'API soit prête (GET /ready renvoie 200) : modèle chargé et chauffé, base joignable.
+
+Utilisé par start.sh avant de lancer Streamlit, et comme healthcheck Docker.
+
+Exemple :
+    python -m scripts.wait_for_ready --url http://localhost:8000/ready --timeout 120
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def is_ready(url: str, timeout_s: float = 2.0) -> tuple[bool, dict | None]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout_s) as response:
+            return response.status == 200, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        # 503 : l'API répond mais n'est pas encore prête
+        return False, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, OSError, ValueError):
+        return False, None
+
+
+def wait_for_ready(url: str, timeout_s: float, interval_s: float = 0.5) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while True:
+        ready, body = is_ready(url)
+        if ready:
+            return True
+        if time.monotonic() >= deadline:
+            print(f"❌ API not ready after {timeout_s:g} s: {body['checks'] if body else 'no response'}", file=sys.stderr)
+            return False
+        time.sleep(interval_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/ready")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Attente maximale (s)")
+    parser.add_argument("--interval", type=float, default=0.5, help="Intervalle entre deux essais (s)")
+    args = parser.parse_args()
+    sys.exit(0 if wait_for_ready(args.url, args.timeout, args.interval) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pyarrow est optionnel : seul le format Arrow en dépend
+    pa = None
+    pa_ipc = None
+
+RAW_MEDIA_TYPE = "application/octet-stream"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+RAW_OUTPUT_COLUMNS = ("score", "prediction")
+DECISION_LABELS = ("Accordé", "Refusé")
+
+
+def _reorder(matrix: np.ndarray, columns: list[str], column_names: tuple[str, ...]) -> np.ndarray:
+    """Return `matrix` in the model column order (no copy when already ordered)."""
+    missing = [name for name in column_names if name not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    if tuple(columns) == column_names:
+        return matrix
+    return np.ascontiguousarray(matrix[:, [columns.index(name) for name in column_names]])
+
+
+def decode_raw_matrix(body: bytes, columns_header: str | None, column_names: tuple[str, ...]) -> np.ndarray:
+    """Decode a raw little-endian float32 row-major matrix.
+
+    `columns_header` is the comma-separated column list of the matrix. When it
+    matches the model order, the request buffer is fed to ONNX without any copy.
+    """
+    if not columns_header:
+        raise ValueError("Header 'X-Columns' is required for raw float32 payloads")
+    columns = [name.strip() for name in columns_header.split(",")]
+    row_size = 4 * len(columns)
+    if len(body) % row_size:
+        raise ValueError(f"Payload size ({len(body)} bytes) is not a multiple of a row ({row_size} bytes)")
+
+    matrix = np.frombuffer(body, dtype="<f4").reshape(-1, len(columns))
+    return _reorder(matrix, columns, column_names)
+
+
+def decode_arrow_matrix(body: bytes, column_names: tuple[str, ...]) -> np.ndarray:
+    """Decode an Arrow IPC stream into a float32 feature matrix.
+
+    Either one column per feature (assembled with a single copy), or a single
+    `features` FixedSizeList<float32> column in model order (zero-copy).
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow IPC payloads")
+    table = pa_ipc.open_stream(pa.py_buffer(body)).read_all()
+
+    if table.column_names == ["features"] and pa.types.is_fixed_size_list(table.schema.field("features").type):
+        features = table.column("features").combine_chunks()
+        if features.type.list_size != len(column_names):
+            raise ValueError(f"'features' has {features.type.list_size} values per row, expected {len(column_names)}")
+        values = features.flatten()
+        if values.type != pa.float32() or values.null_count:
+            values = values.cast(pa.float32()).fill_null(float("nan"))
+        return values.to_numpy(zero_copy_only=False).reshape(-1, len(column_names))
+
+    missing = [name for name in column_names if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    matrix = np.empty((table.num_rows, len(column_names)), dtype=np.float32)
+    for j, name in enumerate(column_names):
+        column = table.column(name)
+        if column.null_count:
+            column = column.cast(pa.float64()).fill_null(float("nan"))
+        matrix[:, j] = column.to_numpy()
+    return matrix
+
+
+def encode_raw_predictions(scores: np.ndarray, predictions: np.ndarray) -> bytes:
+    """Encode results as a little-endian float32 (n_rows, 2) matrix: score, prediction."""
+    return np.column_stack([scores, predictions]).astype("<f4").tobytes()
+
+
+def encode_arrow_predictions(scores: np.ndarray, predictions: np.ndarray) -> bytes:
+    """Encode results as an Arrow IPC stream (score, prediction, dictionary-encoded decision)."""
+    table = pa.table({
+        "score": pa.array(scores.astype(np.float32)),
+        "prediction": pa.array(predictions.astype(np.int8)),
+        "decision": pa.DictionaryArray.from_arrays(pa.array(predictions.astype(np.int8)), pa.array(DECISION_LABELS)),
+    })
+    sink = pa.BufferOutputStream()
+    with pa_ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,101 @@
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.api.validation import BOOL_STRINGS, boolean_columns, get_batch_validator
+from src.model.model_service import ModelRuntime, score_feature_matrix
+
+CSV_MEDIA_TYPE = "text/csv"
+CSV_OUTPUT_COLUMNS = ("score", "prediction", "decision", "error")
+
+
+@dataclass(frozen=True)
+class ScoredCsvChunk:
+    """One scored CSV chunk: the enriched CSV text plus what is needed to log it."""
+    content: str
+    matrix: np.ndarray          # (n_rows, n_features) float64, NaN pour les cellules vides
+    valid_rows: np.ndarray      # index des lignes scorées
+    scores: np.ndarray          # scores des lignes scorées
+    predictions: np.ndarray
+    error_codes: dict[int, list[str]]
+    latency_ms: float
+
+
+def read_csv_chunks(file, runtime: ModelRuntime, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Parse a CSV file lazily, `chunk_size` rows at a time.
+
+    Model columns are read as text and only converted by `csv_to_matrix`, so a
+    badly typed cell never aborts the parsing of a chunk.
+    """
+    return pd.read_csv(file, dtype={name: str for name in runtime.column_names}, chunksize=chunk_size)
+
+
+def csv_to_matrix(frame: pd.DataFrame, column_names: tuple[str, ...]) -> np.ndarray:
+    """Lenient float64 conversion of the model columns, with the rules of
+    `records_to_matrix`: empty or non-numeric cells become NaN (reported by the
+    batch validator as `invalid_value`) and boolean strings are only accepted
+    for the boolean fields.
+    """
+    matrix = np.empty((len(frame), len(column_names)), dtype=np.float64)
+    for j, (name, boolean) in enumerate(zip(column_names, boolean_columns(tuple(column_names)))):
+        column = frame[name]
+        if boolean:
+            flags = column.str.strip().str.lower().map(BOOL_STRINGS)
+            column = flags.where(flags.notna(), column)
+        matrix[:, j] = pd.to_numeric(column, errors="coerce")
+    return matrix
+
+
+def score_csv_chunk(runtime: ModelRuntime, frame: pd.DataFrame, header: bool) -> ScoredCsvChunk:
+    """Validate and score one parsed chunk, returning it as CSV enriched with
+    score, prediction, decision and error columns.
+
+    Invalid rows, badly typed cells included, keep an empty score and list
+    their error codes in `error`.
+    """
+    missing = [name for name in runtime.column_names if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    matrix = csv_to_matrix(frame, runtime.column_names)
+    validation = get_batch_validator(runtime.column_names).validate(matrix)
+    valid_rows = np.flatnonzero(validation.valid)
+
+    scores = np.full(len(frame), np.nan)
+    predictions = pd.Series(pd.NA, index=frame.index, dtype="Int8")
+    decisions = pd.Series(None, index=frame.index, dtype=object)
+    valid_scores, valid_predictions = np.empty(0), np.empty(0, dtype=np.int8)
+    start = time.perf_counter()
+    if len(valid_rows):
+        valid_scores, valid_predictions = score_feature_matrix(runtime, matrix[valid_rows].astype(np.float32))
+        scores[valid_rows] = np.round(valid_scores, 4)
+        predictions.iloc[valid_rows] = valid_predictions
+        decisions.iloc[valid_rows] = np.where(valid_predictions == 1, "Refusé", "Accordé")
+
+    errors = np.full(len(frame), None, dtype=object)
+    for i, codes in validation.error_codes.items():
+        errors[i] = "|".join(codes)
+
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    enriched = frame.assign(score=scores, prediction=predictions, decision=decisions, error=errors)
+    return ScoredCsvChunk(
+        content=enriched.to_csv(index=False, header=header),
+        matrix=matrix,
+        valid_rows=valid_rows,
+        scores=valid_scores,
+        predictions=valid_predictions,
+        error_codes=validation.error_codes,
+        latency_ms=latency_ms,
+    )
+
+
+def score_next_chunk(runtime: ModelRuntime, reader: Iterator[pd.DataFrame], header: bool) -> ScoredCsvChunk | None:
+    """Parse and score the next chunk of `reader`; None once the file is exhausted."""
+    frame = next(reader, None)
+    if frame is None:
+        return None
+    return score_csv_chunk(runtime, frame, header)
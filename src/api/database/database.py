@@ -1,10 +1,32 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
-from .table_models import Base
+from .table_models import Base, PredictionLog, FEATURE_COLUMNS
+from .migrations import add_missing_columns
+from .partitions import create_partitioned_table, ensure_partitions, apply_retention
+from src.api.schemas import ScoringData
 
+import asyncio
+import io
 import os
+import csv
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager, contextmanager
 from dotenv import load_dotenv
 
+from config.config import (
+    LOG_INGESTION_METHOD,
+    DB_ASYNC_ENABLED,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_S,
+    DB_POOL_RECYCLE_S,
+    DB_POOL_PRE_PING
+)
+
 load_dotenv()
 
 ENV = os.getenv("APP_ENV", "development")
@@ -17,23 +39,314 @@ elif ENV == "production":
 
 SQLALCHEMY_DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Drivers asynchrones équivalents aux drivers synchrones
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to its async driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def pool_kwargs(url: str) -> dict:
+    """Explicit pool settings. In-memory SQLite uses a single-connection pool without them."""
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith("sqlite:")):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_S,
+        "pool_recycle": DB_POOL_RECYCLE_S,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+class PoolMetrics:
+    """Checkout counters and connection wait times of an engine's pool."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.nb_checkouts = 0
+        self.nb_timeouts = 0
+        self.nb_waits = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._lock = threading.Lock()
+        event.listen(engine, "checkout", self._on_checkout)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.nb_checkouts += 1
+
+    def record_wait(self, wait_ms: float):
+        with self._lock:
+            self.nb_waits += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.nb_timeouts += 1
+
+    def stats(self) -> dict:
+        pool = self.engine.pool
+        capacity = pool.size() + DB_MAX_OVERFLOW if hasattr(pool, "overflow") else None
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else None
+        waits = self.nb_waits
+        return {
+            "pool": pool.__class__.__name__,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity and checked_out is not None else None,
+            "checkouts": self.nb_checkouts,
+            "timeouts": self.nb_timeouts,
+            "mean_wait_ms": round(self.total_wait_ms / waits, 3) if waits else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+
 connect_args = {}
 if SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, **pool_kwargs(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics = PoolMetrics(engine)
+
+# Moteur asynchrone (asyncpg / aiosqlite) : les écritures ne consomment plus de thread
+async_engine = None
+AsyncSessionLocal = None
+async_pool_metrics = None
+if DB_ASYNC_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_url = to_async_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(async_url, **pool_kwargs(async_url))
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    async_pool_metrics = PoolMetrics(async_engine.sync_engine)
+
+
+@contextmanager
+def timed_begin(sync_engine, metrics: PoolMetrics):
+    """engine.begin() recording how long the connection took to obtain."""
+    start = time.perf_counter()
+    try:
+        with sync_engine.begin() as conn:
+            metrics.record_wait((time.perf_counter() - start) * 1000)
+            yield conn
+    except PoolTimeoutError:
+        metrics.record_timeout()
+        raise
+
+
+@asynccontextmanager
+async def timed_async_begin(async_engine_, metrics: PoolMetrics):
+    """Async counterpart of `timed_begin`."""
+    start = time.perf_counter()
+    try:
+        async with async_engine_.begin() as conn:
+            metrics.record_wait((time.perf_counter() - start) * 1000)
+            yield conn
+    except PoolTimeoutError:
+        metrics.record_timeout()
+        raise
 
 def init_db():
     """
     Objectif : Créer physiquement la table 'prediction_logs' dans Postgres
     si elle n'existe pas encore.
     """
+    # LOG_PARTITIONING (PostgreSQL) : table partitionnée par plage de timestamp
+    partitioned = create_partitioned_table(engine)
     Base.metadata.create_all(bind=engine)
+    # Table créée avant le schéma typé : ajoute les colonnes et index manquants
+    add_missing_columns(engine)
+    if partitioned:
+        ensure_partitions(engine)
+        apply_retention(engine)
+
+def bulk_insert_prediction_logs(rows: list[dict]):
+    """
+    Objectif : Insérer un lot de logs en une seule transaction (executemany),
+    au lieu d'un commit par prédiction.
+    """
+    with timed_begin(engine, pool_metrics) as conn:
+        conn.execute(insert(PredictionLog), rows)
+
+async def async_bulk_insert_prediction_logs(rows: list[dict]):
+    """
+    Objectif : Même insertion par lot via le moteur asynchrone, sans bloquer
+    de thread pendant l'attente de la base.
+    """
+    async with timed_async_begin(async_engine, async_pool_metrics) as conn:
+        await conn.execute(insert(PredictionLog), rows)
+
+# Colonnes alimentées par COPY (l'id est généré par la séquence)
+COPY_COLUMNS = tuple(column.name for column in PredictionLog.__table__.columns if column.name != "id")
+JSON_COLUMNS = ("inputs", "outputs")
+FEATURE_CASTS = {
+    column: ScoringData.model_fields[name].annotation for name, column in FEATURE_COLUMNS.items()
+}
+
+
+def _cast_feature(value, cast):
+    """Typed feature value, or None when the raw value does not fit the column."""
+    if value is None or isinstance(value, str):
+        return None
+    try:
+        if cast is int and float(value) != int(value):
+            return None
+        return cast(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def to_log_row(entry: dict) -> dict:
+    """
+    Objectif : Transformer un log de l'API (inputs / outputs en dict) en ligne
+    typée de 'prediction_logs' : une colonne par feature et par élément du
+    résultat. L'entrée brute n'est gardée en JSON que pour les appels en erreur.
+    """
+    inputs = entry.get("inputs") or {}
+    outputs = entry.get("outputs") or {}
+    error = outputs.get("error")
+    if error is not None and outputs.get("error_codes"):
+        error = f"{error}: {'|'.join(outputs['error_codes'])}"
+
+    row = {
+        "timestamp": entry.get("timestamp") or datetime.now(timezone.utc),
+        "model_version": entry.get("model_version"),
+        "latency_ms": entry.get("latency_ms"),
+        "status_code": entry.get("status_code"),
+        "inputs": inputs if entry.get("status_code") != 200 and inputs else None,
+        "outputs": None,
+        "score": outputs.get("score"),
+        "prediction": outputs.get("prediction"),
+        "threshold": outputs.get("threshold"),
+        "error": error,
+    }
+    for name, column in FEATURE_COLUMNS.items():
+        row[column] = _cast_feature(inputs.get(name), FEATURE_CASTS[column])
+    return row
+
+
+def use_copy(dialect_name: str) -> bool:
+    """COPY is used on PostgreSQL unless LOG_INGESTION_METHOD forces plain inserts."""
+    return dialect_name == "postgresql" and LOG_INGESTION_METHOD in ("auto", "copy")
+
+
+def copy_records(rows: list[dict]) -> list[tuple]:
+    """Rows as COPY tuples in COPY_COLUMNS order, JSON columns serialized and
+    timestamps as naive UTC (the column is a `timestamp without time zone`)."""
+    now = datetime.now(timezone.utc)
+    records = []
+    for row in rows:
+        record = []
+        for column in COPY_COLUMNS:
+            value = row.get(column)
+            if column == "timestamp":
+                value = (value or now).astimezone(timezone.utc).replace(tzinfo=None)
+            elif column in JSON_COLUMNS and value is not None:
+                value = json.dumps(value)
+            record.append(value)
+        records.append(tuple(record))
+    return records
+
+
+def copy_prediction_logs(rows: list[dict]):
+    """
+    Objectif : Charger un lot de logs avec COPY FROM STDIN (format CSV) via
+    psycopg2, bien plus rapide que des INSERT sur PostgreSQL.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(copy_records(rows))
+    buffer.seek(0)
+    with timed_begin(engine, pool_metrics) as conn:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {PredictionLog.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+async def async_copy_prediction_logs(rows: list[dict]):
+    """
+    Objectif : Même chargement en COPY binaire via asyncpg (copy_records_to_table).
+    """
+    async with timed_async_begin(async_engine, async_pool_metrics) as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            PredictionLog.__tablename__, records=copy_records(rows), columns=list(COPY_COLUMNS)
+        )
+
+def write_prediction_logs(entries: list[dict]):
+    """Store API log entries as typed rows: COPY on PostgreSQL, multi-row
+    INSERT (executemany) elsewhere, e.g. SQLite."""
+    rows = [to_log_row(entry) for entry in entries]
+    if use_copy(engine.dialect.name):
+        copy_prediction_logs(rows)
+    else:
+        bulk_insert_prediction_logs(rows)
+
+async def async_write_prediction_logs(entries: list[dict]):
+    """Async counterpart of `write_prediction_logs`."""
+    rows = [to_log_row(entry) for entry in entries]
+    if use_copy(async_engine.dialect.name):
+        await async_copy_prediction_logs(rows)
+    else:
+        await async_bulk_insert_prediction_logs(rows)
+
+def database_stats() -> dict:
+    """Pool metrics of the sync engine and, when enabled, of the async engine."""
+    return {
+        "async": DB_ASYNC_ENABLED,
+        "ingestion": "copy" if use_copy(engine.dialect.name) else "insert",
+        "sync_pool": pool_metrics.stats(),
+        "async_pool": async_pool_metrics.stats() if async_pool_metrics else None,
+    }
+
+def ping_database() -> bool:
+    """Readiness check: a pooled connection answers `SELECT 1`."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+async def async_ping_database() -> bool:
+    """Async counterpart of `ping_database`, on the async engine when it is enabled."""
+    if async_engine is None:
+        return await asyncio.to_thread(ping_database)
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+async def dispose_engines():
+    """Close every pooled connection (application shutdown)."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
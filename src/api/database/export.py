@@ -0,0 +1,153 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, REAL, SmallInteger, func, select
+from sqlalchemy.engine import Engine
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel : seul l'export Parquet en dépend
+    pa = None
+    pq = None
+
+from config.config import LOG_EXPORT_DIR, LOG_EXPORT_BATCH_ROWS, LOG_EXPORT_SAFETY_LAG_S
+from .database import to_log_row
+from .table_models import PredictionLog, FEATURE_COLUMNS
+
+LOG_TABLE = PredictionLog.__table__
+WATERMARK_FILE = "_watermark.json"
+JSON_COLUMNS = ("inputs", "outputs")
+# Les features reprennent les noms du modèle (comparables au dataset d'entraînement)
+EXPORT_NAMES = {column: name for name, column in FEATURE_COLUMNS.items()}
+EXPORT_COLUMNS = tuple(column for column in LOG_TABLE.columns if column.name not in JSON_COLUMNS)
+
+
+def _arrow_type(column):
+    sql_type = column.type
+    if isinstance(sql_type, SmallInteger):
+        return pa.int16()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, REAL):
+        return pa.float32()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def export_schema():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet exports")
+    return pa.schema([(EXPORT_NAMES.get(column.name, column.name), _arrow_type(column)) for column in EXPORT_COLUMNS])
+
+
+def flatten_row(row) -> dict:
+    """Typed export row; legacy rows still holding JSON blobs are flattened on the fly."""
+    values = dict(row)
+    if values["outputs"] is not None and values["score"] is None and values["error"] is None:
+        typed = to_log_row({"status_code": values["status_code"], "inputs": values["inputs"], "outputs": values["outputs"]})
+        values.update({name: typed[name] for name in typed if name not in ("timestamp", "model_version", "latency_ms")})
+    return {EXPORT_NAMES.get(column.name, column.name): values[column.name] for column in EXPORT_COLUMNS}
+
+
+def read_watermark(output_dir: Path) -> dict | None:
+    path = Path(output_dir) / WATERMARK_FILE
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def max_log_id(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(LOG_TABLE.c.id))).scalar() or 0
+
+
+def write_watermark(output_dir: Path, last_id: int, path: Path):
+    # Écriture atomique : un export interrompu ne déplace jamais le watermark
+    tmp = Path(output_dir) / f"{WATERMARK_FILE}.tmp"
+    tmp.write_text(json.dumps({
+        "last_id": last_id,
+        "file": path.name,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }))
+    os.replace(tmp, Path(output_dir) / WATERMARK_FILE)
+
+
+def export_prediction_logs(
+    engine: Engine,
+    output_dir: Path | str = LOG_EXPORT_DIR,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    batch_rows: int = LOG_EXPORT_BATCH_ROWS,
+    incremental: bool = True,
+    safety_lag_s: float = LOG_EXPORT_SAFETY_LAG_S,
+) -> dict:
+    """
+    Objectif : Exporter 'prediction_logs' en Parquet (une colonne typée par
+    feature) sans charger la table en mémoire : curseur côté serveur lu par
+    lots de `batch_rows` lignes, chaque lot écrit comme un row group.
+
+    En mode incrémental, seules les lignes d'id supérieur au watermark du
+    dossier sont exportées, puis le watermark avance (fichier `_watermark.json`).
+    Les ids ne sont pas validés dans leur ordre d'attribution (écrivains
+    concurrents, lots COPY) : l'export s'arrête donc au plus grand id visible
+    à son lancement, puis attend `safety_lag_s` secondes avant de lire. Toute
+    transaction ayant tiré un id inférieur a eu ce délai pour être validée.
+    Garantie : aucune ligne n'est sautée tant qu'aucune transaction d'écriture
+    de logs ne dure plus de `safety_lag_s` secondes.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    schema = export_schema()
+
+    watermark = read_watermark(output_dir) if incremental else None
+    after_id = watermark["last_id"] if watermark else 0
+    query = select(*EXPORT_COLUMNS, *(LOG_TABLE.c[name] for name in JSON_COLUMNS)).where(LOG_TABLE.c.id > after_id)
+    if incremental:
+        upper_id = max_log_id(engine)
+        if upper_id <= after_id:
+            return {"rows": 0, "file": None, "last_id": after_id}
+        # Les ids au-delà de la borne sont laissés au prochain export
+        time.sleep(safety_lag_s)
+        query = query.where(LOG_TABLE.c.id <= upper_id)
+    if start is not None:
+        query = query.where(LOG_TABLE.c.timestamp >= start)
+    if end is not None:
+        query = query.where(LOG_TABLE.c.timestamp < end)
+    query = query.order_by(LOG_TABLE.c.id)
+
+    tmp_path = output_dir / "_export.parquet.tmp"
+    writer = None
+    first_id = last_id = None
+    nb_rows = 0
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_rows).execute(query)
+            for rows in result.mappings().partitions():
+                records = [flatten_row(row) for row in rows]
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                    first_id = records[0]["id"]
+                writer.write_table(pa.Table.from_pylist(records, schema=schema))
+                last_id = records[-1]["id"]
+                nb_rows += len(records)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        return {"rows": 0, "file": None, "last_id": after_id}
+    writer.close()
+    path = output_dir / f"prediction_logs_{first_id:012d}_{last_id:012d}.parquet"
+    os.replace(tmp_path, path)
+    if incremental:
+        write_watermark(output_dir, last_id, path)
+    return {"rows": nb_rows, "file": str(path), "last_id": last_id}
@@ -0,0 +1,270 @@
+import asyncio
+import inspect
+import time
+from datetime import datetime, timezone
+
+from config.config import (
+    LOG_FLUSH_ROWS,
+    LOG_FLUSH_INTERVAL_MS,
+    LOG_QUEUE_SIZE,
+    LOG_QUEUE_POLICY,
+    LOG_QUEUE_BLOCK_TIMEOUT_MS,
+    LOG_SPILL_REPLAY_INTERVAL_S
+)
+from config.logger import logger
+from src.api.database.database import write_prediction_logs
+from src.api.database.spill_buffer import SpillBuffer
+
+QUEUE_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+class PredictionLogWriter:
+    """Long-lived writer flushing prediction logs with multi-row inserts.
+
+    Logs are queued in memory (bounded) and written every `flush_rows` rows or
+    every `flush_interval_ms`, whichever comes first, by `write_rows` (awaited
+    when it is a coroutine function, run in a thread otherwise). When the queue
+    is full, `policy` decides what happens:
+    - "block": the caller waits up to `block_timeout_ms`, then the row is dropped
+    - "drop_newest": the new row is dropped
+    - "drop_oldest": the oldest queued row is dropped to make room
+
+    With a `spill` buffer, `policy` is bypassed and rows are never lost: rows
+    refused by the full queue are buffered and spilled to disk in batches by a
+    background task (the caller waits neither on a slow database nor on the
+    disk), as is every row of a failed flush, and spilled segments are replayed
+    every `replay_interval_s` once the database accepts writes again.
+    """
+
+    def __init__(
+        self,
+        flush_rows: int = LOG_FLUSH_ROWS,
+        flush_interval_ms: float = LOG_FLUSH_INTERVAL_MS,
+        max_queue_size: int = LOG_QUEUE_SIZE,
+        policy: str = LOG_QUEUE_POLICY,
+        block_timeout_ms: float = LOG_QUEUE_BLOCK_TIMEOUT_MS,
+        write_rows=write_prediction_logs,
+        spill: SpillBuffer | None = None,
+        replay_interval_s: float = LOG_SPILL_REPLAY_INTERVAL_S,
+    ):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown log queue policy '{policy}'. Use one of {', '.join(QUEUE_POLICIES)}.")
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.block_timeout_s = block_timeout_ms / 1000
+        self.write_rows = write_rows
+        self.spill = spill
+        self.replay_interval_s = replay_interval_s
+        self._queue: asyncio.Queue | None = None
+        self._not_empty: asyncio.Event | None = None
+        self._batch_ready: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._replay_task: asyncio.Task | None = None
+        self._replay_wakeup: asyncio.Event | None = None
+        self._overflow: list[dict] = []
+        self._overflow_task: asyncio.Task | None = None
+        self._stopping = False
+        self.nb_enqueued = 0
+        self.nb_written = 0
+        self.nb_dropped = 0
+        self.nb_failed = 0
+        self.nb_spilled = 0
+        self.nb_flushes = 0
+        self.last_flush_ms = 0.0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._not_empty = asyncio.Event()
+        self._batch_ready = asyncio.Event()
+        self._replay_wakeup = asyncio.Event()
+        self._overflow = []
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_loop())
+        if self.spill:
+            self._replay_task = asyncio.create_task(self._replay_loop())
+        logger.info(
+            f"✅ Prediction log writer started (flush={self.flush_rows} rows/"
+            f"{self.flush_interval_s * 1000:.0f} ms, queue={self.max_queue_size}, policy={self.policy})"
+        )
+
+    async def stop(self):
+        """Flush every queued row, then stop the flush loop.
+
+        A segment being replayed is written and deleted before the final drain
+        (cancelling it mid-write could commit its rows and keep the file).
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        if self._replay_task:
+            self._replay_wakeup.set()
+            await self._replay_task
+            self._replay_task = None
+        self._not_empty.set()
+        self._batch_ready.set()
+        await self._task
+        self._task = None
+        if self._overflow_task:
+            await self._overflow_task
+            self._overflow_task = None
+        if self.spill:
+            # Les segments restants seront rejoués au prochain démarrage
+            await asyncio.to_thread(self.spill.close)
+        logger.info(f"✅ Prediction log writer stopped ({self.nb_written} rows written, {self.nb_dropped} dropped, {self.nb_spilled} spilled)")
+
+    async def put(self, entry: dict) -> bool:
+        """Queue one log row; returns False if it did not enter the queue (dropped or spilled)."""
+        entry.setdefault("timestamp", datetime.now(timezone.utc))
+        if self._stopping:
+            await self._drop([entry])
+            return False
+
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            if self.spill:
+                # File pleine = base lente : la ligne part sur disque, par lots, sans faire attendre la requête
+                self._overflow.append(entry)
+                if self._overflow_task is None or self._overflow_task.done():
+                    self._overflow_task = asyncio.create_task(self._spill_overflow())
+                return False
+            if self.policy == "drop_oldest":
+                # Sans await entre les deux : aucun autre put ne peut prendre la place libérée
+                oldest = self._queue.get_nowait()
+                self._queue.put_nowait(entry)
+                await self._drop([oldest])
+            elif self.policy == "block":
+                try:
+                    await asyncio.wait_for(self._queue.put(entry), self.block_timeout_s)
+                except TimeoutError:
+                    await self._drop([entry])
+                    return False
+            else:
+                await self._drop([entry])
+                return False
+
+        self.nb_enqueued += 1
+        self._not_empty.set()
+        if self._queue.qsize() >= self.flush_rows:
+            self._batch_ready.set()
+        return True
+
+    async def _flush_loop(self):
+        while True:
+            if self._queue.empty():
+                if self._stopping:
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            # Attend un lot complet ou la fin de la fenêtre, ce qui arrive en premier
+            if self._queue.qsize() < self.flush_rows and not self._stopping:
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval_s)
+                except TimeoutError:
+                    pass
+
+            rows = [self._queue.get_nowait() for _ in range(min(self._queue.qsize(), self.flush_rows))]
+            await self._flush(rows)
+
+    async def _write(self, rows: list[dict]):
+        if inspect.iscoroutinefunction(self.write_rows):
+            await self.write_rows(rows)
+        else:
+            await asyncio.to_thread(self.write_rows, rows)
+
+    async def _flush(self, rows: list[dict]):
+        start = time.perf_counter()
+        try:
+            await self._write(rows)
+            self.nb_written += len(rows)
+        except Exception as e:
+            logger.error(f"❌ Database Logging Error: {len(rows)} row(s) not written: {e}")
+            if not await self._spill(rows):
+                self.nb_failed += len(rows)
+        self.nb_flushes += 1
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    async def _spill_overflow(self):
+        """Spill the rows refused by the full queue: one disk append (and fsync) per batch."""
+        while self._overflow:
+            rows, self._overflow = self._overflow, []
+            await self._drop(rows)
+
+    async def _drop(self, rows: list[dict]):
+        """Rows refused by the queue policy: spilled when possible, dropped otherwise."""
+        if not await self._spill(rows):
+            self.nb_dropped += len(rows)
+
+    async def _spill(self, rows: list[dict]) -> bool:
+        if self.spill is None:
+            return False
+        try:
+            await asyncio.to_thread(self.spill.append, rows)
+        except OSError as e:
+            logger.error(f"❌ Log spill failed: {len(rows)} row(s) lost: {e}")
+            return False
+        self.nb_spilled += len(rows)
+        return True
+
+    async def replay(self) -> int:
+        """Write spilled segments back, oldest first; stops at the first failure.
+
+        A segment is written in a single call (one transaction) and deleted
+        afterwards, so a failed replay never writes a row twice. Once the writer
+        is stopping, the segment in flight is finished and the others are left
+        for the next start.
+        """
+        await asyncio.to_thread(self.spill.seal)
+        nb_rows = 0
+        for path in self.spill.sealed_segments():
+            if self._stopping:
+                break
+            rows = await asyncio.to_thread(self.spill.read_segment, path)
+            try:
+                if rows:
+                    await self._write(rows)
+            except Exception as e:
+                logger.warning(f"⚠️ Log replay postponed ({path.name}): {e}")
+                break
+            await asyncio.to_thread(self.spill.remove, path, len(rows))
+            self.nb_written += len(rows)
+            nb_rows += len(rows)
+        if nb_rows:
+            logger.info(f"✅ {nb_rows} spilled log row(s) replayed")
+        return nb_rows
+
+    async def _replay_loop(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._replay_wakeup.wait(), self.replay_interval_s)
+            except TimeoutError:
+                pass
+            if not self._stopping and self.spill.pending():
+                try:
+                    await self.replay()
+                except Exception as e:
+                    # Le rejeu reprendra au prochain intervalle
+                    logger.error(f"❌ Log replay failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "flush_rows": self.flush_rows,
+            "flush_interval_ms": self.flush_interval_s * 1000,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queue_size,
+            "enqueued": self.nb_enqueued,
+            "written": self.nb_written,
+            "dropped": self.nb_dropped,
+            "failed": self.nb_failed,
+            "spilled": self.nb_spilled,
+            "spill": self.spill.stats() if self.spill else None,
+            "flushes": self.nb_flushes,
+            "mean_rows_per_flush": round(self.nb_written / self.nb_flushes, 2) if self.nb_flushes else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
@@ -0,0 +1,80 @@
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Engine
+
+from config.logger import logger
+from .table_models import PredictionLog, FEATURE_COLUMNS
+
+LOG_TABLE = PredictionLog.__table__
+TYPED_COLUMNS = ("score", "prediction", "threshold", "error", *FEATURE_COLUMNS.values())
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    """
+    Objectif : Ajouter à une table 'prediction_logs' existante les colonnes et
+    index du schéma typé (ALTER TABLE ... ADD COLUMN, sans réécrire la table).
+    Idempotent : ne fait rien sur une table déjà à jour.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(LOG_TABLE.name):
+        return []
+
+    existing = {column["name"] for column in inspector.get_columns(LOG_TABLE.name)}
+    missing = [column for column in LOG_TABLE.columns if column.name not in existing]
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as conn:
+        for column in missing:
+            conn.execute(text(
+                f"ALTER TABLE {preparer.quote(LOG_TABLE.name)} "
+                f"ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=engine.dialect)}"
+            ))
+        for index in LOG_TABLE.indexes:
+            index.create(conn, checkfirst=True)
+
+    if missing:
+        logger.info(f"✅ prediction_logs migrated: {len(missing)} column(s) added")
+    return [column.name for column in missing]
+
+
+def backfill_typed_columns(engine: Engine, batch_size: int = 5000, drop_json: bool = False) -> int:
+    """
+    Objectif : Remplir les colonnes typées des lignes historiques à partir de
+    leurs blobs JSON, par lots parcourus par id croissant (pas d'OFFSET).
+
+    Avec `drop_json`, les blobs des appels réussis sont ensuite vidés (seules
+    les entrées brutes des appels en erreur sont conservées).
+    Retourne le nombre de lignes migrées.
+    """
+    # Import local : database importe ce module pour init_db
+    from .database import to_log_row
+
+    # Paramètres préfixés : un bindparam ne peut pas porter le nom d'une colonne mise à jour
+    values = {name: bindparam(f"b_{name}") for name in TYPED_COLUMNS}
+    if drop_json:
+        values.update(inputs=bindparam("b_inputs"), outputs=bindparam("b_outputs"))
+    statement = update(LOG_TABLE).where(LOG_TABLE.c.id == bindparam("row_id")).values(values)
+    query = (
+        select(LOG_TABLE.c.id, LOG_TABLE.c.status_code, LOG_TABLE.c.inputs, LOG_TABLE.c.outputs)
+        .where(LOG_TABLE.c.outputs.is_not(None), LOG_TABLE.c.score.is_(None), LOG_TABLE.c.error.is_(None))
+        .order_by(LOG_TABLE.c.id)
+        .limit(batch_size)
+    )
+
+    last_id, nb_rows = 0, 0
+    while True:
+        with engine.begin() as conn:
+            batch = conn.execute(query.where(LOG_TABLE.c.id > last_id)).all()
+            if not batch:
+                break
+            params = []
+            for row_id, status_code, inputs, outputs in batch:
+                typed = to_log_row({"status_code": status_code, "inputs": inputs, "outputs": outputs})
+                param = {f"b_{name}": typed[name] for name in TYPED_COLUMNS}
+                if drop_json:
+                    param.update(b_inputs=typed["inputs"], b_outputs=None)
+                params.append({"row_id": row_id, **param})
+            conn.execute(statement, params)
+        last_id = batch[-1][0]
+        nb_rows += len(batch)
+        logger.info(f"ℹ️ Backfill prediction_logs: {nb_rows} row(s) migrated (last id {last_id})")
+
+    return nb_rows
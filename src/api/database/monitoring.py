@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.engine import Engine
+
+from .table_models import PredictionLog
+
+BUCKETS = ("minute", "hour", "day", "all")
+PERCENTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+# Troncature des timestamps côté SQLite (date_trunc sur PostgreSQL)
+SQLITE_BUCKET_FORMATS = {
+    "minute": "%Y-%m-%dT%H:%M:00",
+    "hour": "%Y-%m-%dT%H:00:00",
+    "day": "%Y-%m-%dT00:00:00",
+}
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; aware datetimes are converted, naive ones taken as UTC."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def bucket_expression(dialect_name: str, bucket: str):
+    if bucket == "all":
+        return literal("all")
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket, PredictionLog.timestamp)
+    return func.strftime(SQLITE_BUCKET_FORMATS[bucket], PredictionLog.timestamp)
+
+
+def summary_query(dialect_name: str, bucket: str, start: datetime, end: datetime, model_version: str | None = None):
+    """
+    Objectif : Une seule requête d'agrégation par (période, version) : volumes,
+    taux d'erreur et d'accord, latences moyenne / max et percentiles.
+
+    Les percentiles sont calculés par rang (nearest-rank) avec des fonctions
+    de fenêtre, disponibles sur PostgreSQL comme sur SQLite.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'. Use one of {', '.join(BUCKETS)}.")
+
+    log = PredictionLog
+    filters = [log.timestamp >= start, log.timestamp < end]
+    if model_version is not None:
+        filters.append(log.model_version == model_version)
+
+    bucket_column = bucket_expression(dialect_name, bucket)
+    partition = [log.model_version] if bucket == "all" else [bucket_column, log.model_version]
+    ranked = (
+        select(
+            bucket_column.label("bucket"),
+            log.model_version,
+            log.latency_ms,
+            log.status_code,
+            log.prediction,
+            log.score,
+            func.row_number().over(partition_by=partition, order_by=log.latency_ms.asc().nulls_last()).label("latency_rank"),
+            func.count(log.latency_ms).over(partition_by=partition).label("nb_latencies"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+
+    percentiles = [
+        func.min(case((ranked.c.latency_rank >= quantile * ranked.c.nb_latencies, ranked.c.latency_ms))).label(name)
+        for name, quantile in PERCENTILES.items()
+    ]
+    return (
+        select(
+            ranked.c.bucket,
+            ranked.c.model_version,
+            func.count().label("requests"),
+            func.sum(case((ranked.c.status_code >= 400, 1), else_=0)).label("errors"),
+            func.count(ranked.c.prediction).label("scored"),
+            func.sum(case((ranked.c.prediction == 0, 1), else_=0)).label("approved"),
+            func.avg(ranked.c.score).label("mean_score"),
+            func.avg(ranked.c.latency_ms).label("mean"),
+            func.max(ranked.c.latency_ms).label("max"),
+            *percentiles,
+        )
+        .group_by(ranked.c.bucket, ranked.c.model_version)
+        .order_by(ranked.c.bucket, ranked.c.model_version)
+    )
+
+
+def _round(value, digits: int = 3):
+    return round(float(value), digits) if value is not None else None
+
+
+def monitoring_summary(engine: Engine, bucket: str, start: datetime, end: datetime,
+                       model_version: str | None = None) -> list[dict]:
+    """Aggregated monitoring series, one compact dict per (bucket, model_version)."""
+    with engine.connect() as conn:
+        rows = conn.execute(summary_query(engine.dialect.name, bucket, start, end, model_version)).mappings().all()
+
+    series = []
+    for row in rows:
+        requests, scored = row["requests"], row["scored"]
+        series.append({
+            "bucket": row["bucket"].isoformat() if isinstance(row["bucket"], datetime) else row["bucket"],
+            "model_version": row["model_version"],
+            "requests": requests,
+            "errors": row["errors"],
+            "error_rate": _round(row["errors"] / requests, 4),
+            "approval_rate": _round(row["approved"] / scored, 4) if scored else None,
+            "mean_score": _round(row["mean_score"], 4),
+            "latency_ms": {name: _round(row[name]) for name in ("mean", *PERCENTILES, "max")},
+        })
+    return series
@@ -0,0 +1,204 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Index, MetaData, PrimaryKeyConstraint, Table, inspect, text
+from sqlalchemy.engine import Engine
+
+from config.config import (
+    LOG_PARTITIONING,
+    LOG_PARTITIONS_AHEAD,
+    LOG_PARTITION_MAINTENANCE_INTERVAL_S,
+    LOG_RETENTION_DAYS,
+    LOG_RETENTION_ACTION
+)
+from config.logger import logger
+from .table_models import PredictionLog
+
+GRANULARITIES = ("daily", "monthly")
+RETENTION_ACTIONS = ("drop", "detach")
+LOG_TABLE = PredictionLog.__table__
+PARTITION_PREFIX = f"{LOG_TABLE.name}_p"
+DEFAULT_PARTITION = f"{LOG_TABLE.name}_default"
+
+
+def partition_start(day: date, granularity: str) -> date:
+    """First day of the partition holding `day`."""
+    return day if granularity == "daily" else day.replace(day=1)
+
+
+def next_partition_start(start: date, granularity: str) -> date:
+    if granularity == "daily":
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(start: date, granularity: str) -> str:
+    return f"{PARTITION_PREFIX}{start:%Y%m%d}" if granularity == "daily" else f"{PARTITION_PREFIX}{start:%Y%m}"
+
+
+def partition_bounds(name: str) -> tuple[date, date] | None:
+    """[start, end) of a partition from its name, None for the default partition or foreign tables."""
+    suffix = name.removeprefix(PARTITION_PREFIX)
+    if suffix == name or not suffix.isdigit() or len(suffix) not in (6, 8):
+        return None
+    granularity = "daily" if len(suffix) == 8 else "monthly"
+    start = datetime.strptime(suffix, "%Y%m%d" if granularity == "daily" else "%Y%m").date()
+    return start, next_partition_start(start, granularity)
+
+
+def upcoming_partitions(today: date, granularity: str, ahead: int) -> list[tuple[str, date, date]]:
+    """Current partition plus the `ahead` next ones, as (name, start, end)."""
+    partitions = []
+    start = partition_start(today, granularity)
+    for _ in range(ahead + 1):
+        end = next_partition_start(start, granularity)
+        partitions.append((partition_name(start, granularity), start, end))
+        start = end
+    return partitions
+
+
+def expired_partitions(names: list[str], today: date, retention_days: int) -> list[str]:
+    """Partitions whose whole range is older than the retention window."""
+    cutoff = today - timedelta(days=retention_days)
+    expired = []
+    for name in sorted(names):
+        bounds = partition_bounds(name)
+        if bounds and bounds[1] <= cutoff:
+            expired.append(name)
+    return expired
+
+
+def partitioned_log_table() -> Table:
+    """
+    Objectif : Copie de la table 'prediction_logs' partitionnée par plage de
+    `timestamp`. PostgreSQL impose la clé de partition dans la clé primaire.
+    """
+    metadata = MetaData()
+    columns = [column._copy() for column in LOG_TABLE.columns]
+    for column in columns:
+        column.primary_key = False
+    # Clé composite : l'id doit être déclaré explicitement auto-incrémenté (SERIAL)
+    next(column for column in columns if column.name == "id").autoincrement = True
+    table = Table(
+        LOG_TABLE.name, metadata, *columns,
+        PrimaryKeyConstraint("id", "timestamp"),
+        postgresql_partition_by="RANGE (timestamp)"
+    )
+    # Index composites de __table_args__ (ceux des colonnes `index=True` sont déjà copiés)
+    existing = {index.name for index in table.indexes}
+    for index in LOG_TABLE.indexes:
+        if index.name not in existing:
+            Index(index.name, *[table.c[column.name] for column in index.columns])
+    return table
+
+
+def list_partitions(conn) -> list[str]:
+    rows = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :parent"
+    ), {"parent": LOG_TABLE.name})
+    return [row[0] for row in rows]
+
+
+def is_partitioned(engine: Engine) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM pg_partitioned_table JOIN pg_class ON pg_class.oid = partrelid WHERE relname = :name"),
+            {"name": LOG_TABLE.name}
+        ).first() is not None
+
+
+def create_partitioned_table(engine: Engine, granularity: str = LOG_PARTITIONING) -> bool:
+    """
+    Objectif : Créer 'prediction_logs' partitionnée (PostgreSQL uniquement) si
+    elle n'existe pas encore. Une table existante n'est jamais convertie.
+    Retourne True si la table est partitionnée.
+    """
+    if granularity == "none":
+        return False
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown log partitioning '{granularity}'. Use none, {' or '.join(GRANULARITIES)}.")
+    if engine.dialect.name != "postgresql":
+        logger.warning(f"⚠️ Log partitioning needs PostgreSQL ('{engine.dialect.name}'): plain table used")
+        return False
+
+    if inspect(engine).has_table(LOG_TABLE.name):
+        if not is_partitioned(engine):
+            logger.warning("⚠️ prediction_logs already exists unpartitioned: partitioning skipped")
+            return False
+        return True
+
+    partitioned_log_table().create(engine)
+    with engine.begin() as conn:
+        # Filet de sécurité : une ligne hors des partitions créées n'est jamais rejetée
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {LOG_TABLE.name} DEFAULT"))
+    logger.info(f"✅ prediction_logs created with {granularity} partitions")
+    return True
+
+
+def ensure_partitions(engine: Engine, granularity: str = LOG_PARTITIONING, ahead: int = LOG_PARTITIONS_AHEAD,
+                      today: date | None = None) -> list[str]:
+    """Create the current and upcoming partitions; returns the ones created."""
+    today = today or datetime.now(timezone.utc).date()
+    created = []
+    with engine.begin() as conn:
+        existing = set(list_partitions(conn))
+        for name, start, end in upcoming_partitions(today, granularity, ahead):
+            if name in existing:
+                continue
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {LOG_TABLE.name} FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            created.append(name)
+    if created:
+        logger.info(f"✅ prediction_logs partitions created: {', '.join(created)}")
+    return created
+
+
+def apply_retention(engine: Engine, retention_days: int = LOG_RETENTION_DAYS, action: str = LOG_RETENTION_ACTION,
+                    today: date | None = None) -> list[str]:
+    """
+    Objectif : Retirer les partitions entièrement hors de la fenêtre de
+    rétention : DROP TABLE, ou DETACH PARTITION pour les archiver (la table
+    détachée reste interrogeable et exportable). Aucun DELETE ligne à ligne.
+    """
+    if retention_days <= 0:
+        return []
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unknown log retention action '{action}'. Use {' or '.join(RETENTION_ACTIONS)}.")
+
+    today = today or datetime.now(timezone.utc).date()
+    with engine.begin() as conn:
+        expired = expired_partitions(list_partitions(conn), today, retention_days)
+        for name in expired:
+            if action == "drop":
+                conn.execute(text(f"DROP TABLE {name}"))
+            else:
+                conn.execute(text(f"ALTER TABLE {LOG_TABLE.name} DETACH PARTITION {name}"))
+    if expired:
+        logger.info(f"✅ Retention ({retention_days} days): {action} {', '.join(expired)}")
+    return expired
+
+
+def maintain_partitions(engine: Engine) -> dict:
+    """Upcoming partitions then retention, if the table is partitioned."""
+    if LOG_PARTITIONING not in GRANULARITIES or not is_partitioned(engine):
+        return {"created": [], "expired": []}
+    return {
+        "created": ensure_partitions(engine),
+        "expired": apply_retention(engine),
+    }
+
+
+async def partition_maintenance_loop(engine: Engine, interval_s: float = LOG_PARTITION_MAINTENANCE_INTERVAL_S):
+    """Run `maintain_partitions` every `interval_s` (in a thread: DDL is blocking)."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await asyncio.to_thread(maintain_partitions, engine)
+        except Exception as e:
+            logger.error(f"❌ Partition maintenance failed: {e}")
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config.config import LOG_SPILL_DIR, LOG_SPILL_SEGMENT_BYTES, LOG_SPILL_FSYNC
+from config.logger import logger
+
+ACTIVE_SUFFIX = ".ndjson.open"
+SEALED_SUFFIX = ".ndjson"
+
+
+class SpillBuffer:
+    """Append-only segment files holding prediction logs the database could not take.
+
+    Rows are appended as NDJSON to an active segment (`*.ndjson.open`), which is
+    sealed (renamed `*.ndjson`) once it reaches `segment_bytes` or before a
+    replay. Sealed segments are replayed oldest first and deleted only once
+    written, so rows survive a database outage and an API restart (an active
+    segment left by a crash is sealed at startup, a torn last line is skipped).
+    """
+
+    def __init__(self, directory: Path | str = LOG_SPILL_DIR, segment_bytes: int = LOG_SPILL_SEGMENT_BYTES,
+                 fsync: bool = LOG_SPILL_FSYNC):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Path | None = None
+        self.nb_spilled = 0
+        self.nb_replayed = 0
+        self.nb_corrupted = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob(f"*{ACTIVE_SUFFIX}"):
+            path.rename(path.with_name(path.name.removesuffix(ACTIVE_SUFFIX) + SEALED_SUFFIX))
+        self._sequence = max((self._segment_number(path) for path in self.sealed_segments()), default=0)
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        return int(path.name.split(".")[0].removeprefix("segment-"))
+
+    def append(self, entries: list[dict]):
+        """Durably append rows (flushed, and fsynced when enabled) to the active segment."""
+        if not entries:
+            return
+        data = "".join(json.dumps(self._encode(entry), default=str) + "\n" for entry in entries)
+        with self._lock:
+            if self._file is None:
+                self._sequence += 1
+                self._path = self.directory / f"segment-{self._sequence:012d}{ACTIVE_SUFFIX}"
+                self._file = open(self._path, "a", encoding="utf-8")
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.nb_spilled += len(entries)
+            if self._file.tell() >= self.segment_bytes:
+                self._seal_locked()
+
+    def seal(self):
+        """Close the active segment so that it can be replayed."""
+        with self._lock:
+            self._seal_locked()
+
+    def _seal_locked(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._path.rename(self._path.with_name(self._path.name.removesuffix(ACTIVE_SUFFIX) + SEALED_SUFFIX))
+        self._file = None
+        self._path = None
+
+    def sealed_segments(self) -> list[Path]:
+        return sorted(self.directory.glob(f"segment-*{SEALED_SUFFIX}"), key=self._segment_number)
+
+    def pending(self) -> bool:
+        return self._file is not None or bool(self.sealed_segments())
+
+    def read_segment(self, path: Path) -> list[dict]:
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(self._decode(json.loads(line)))
+                except (json.JSONDecodeError, ValueError):
+                    # Dernière ligne tronquée par un arrêt brutal
+                    self.nb_corrupted += 1
+                    logger.warning(f"⚠️ Skipping corrupted line in {path.name}")
+        return entries
+
+    def remove(self, path: Path, nb_rows: int):
+        path.unlink()
+        self.nb_replayed += nb_rows
+
+    def close(self):
+        self.seal()
+
+    @staticmethod
+    def _encode(entry: dict) -> dict:
+        timestamp = entry.get("timestamp")
+        return {**entry, "timestamp": timestamp.isoformat()} if isinstance(timestamp, datetime) else entry
+
+    @staticmethod
+    def _decode(entry: dict) -> dict:
+        if isinstance(entry.get("timestamp"), str):
+            entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+        return entry
+
+    def stats(self) -> dict:
+        segments = self.sealed_segments()
+        with self._lock:
+            active_bytes = self._file.tell() if self._file else 0
+        return {
+            "directory": str(self.directory),
+            "pending_segments": len(segments) + (1 if active_bytes else 0),
+            "pending_bytes": sum(path.stat().st_size for path in segments) + active_bytes,
+            "spilled": self.nb_spilled,
+            "replayed": self.nb_replayed,
+            "corrupted": self.nb_corrupted,
+        }
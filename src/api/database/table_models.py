@@ -1,12 +1,24 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, JSON
+from sqlalchemy import Column, Integer, SmallInteger, Float, REAL, Boolean, String, DateTime, JSON, Index
 from sqlalchemy.orm import declarative_base
 from datetime import datetime, timezone
+
+from src.api.schemas import ScoringData
+
 Base = declarative_base()
 
+# Une colonne typée par feature du modèle (nom en minuscules : pas de guillemets en SQL)
+FEATURE_TYPES = {float: REAL, int: Integer, bool: Boolean}
+FEATURE_COLUMNS = {name: name.lower() for name in ScoringData.model_fields}
+
+
 class PredictionLog(Base):
     """
     Objectif : Mapper cette classe à une table 'prediction_logs' dans PostgreSQL.
     Cette table va stocker chaque appel fait à l'API de scoring.
+
+    Les features et le résultat sont des colonnes typées (requêtes de monitoring
+    sans parsing JSON). `inputs` ne conserve l'entrée brute que pour les appels
+    en erreur, `outputs` n'est renseigné que pour les lignes historiques.
     """
 
     __tablename__ = 'prediction_logs'
@@ -14,9 +26,22 @@ class PredictionLog(Base):
     # Déclaration des colonne de la table :
 
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    model_version = Column(String)
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    model_version = Column(String, index=True)
     latency_ms = Column(Float)
-    inputs = Column(JSON)
-    outputs = Column(JSON)
+    inputs = Column(JSON(none_as_null=True))
+    outputs = Column(JSON(none_as_null=True))
     status_code = Column(Integer)
+
+    # Résultat de la prédiction
+    score = Column(REAL)
+    prediction = Column(SmallInteger)
+    threshold = Column(REAL)
+    error = Column(String)
+
+    # Fenêtres de monitoring par version : index scan sur (version, période)
+    __table_args__ = (Index("ix_prediction_logs_version_timestamp", "model_version", "timestamp"),)
+
+
+for _name, _column in FEATURE_COLUMNS.items():
+    setattr(PredictionLog, _column, Column(_column, FEATURE_TYPES[ScoringData.model_fields[_name].annotation]))
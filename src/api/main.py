@@ -1,10 +1,36 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from src.api.routes import router
-from src.model.model_service import load_model_instance, get_model_signature, get_model_info
+from src.api.model_reload import ModelReloader
+from src.model.model_service import load_model_runtime, warm_up
 from config.logger import logger
-from src.api.database.database import init_db 
+from src.api.database.database import (
+    engine,
+    init_db,
+    write_prediction_logs,
+    async_write_prediction_logs,
+    async_ping_database,
+    dispose_engines
+)
+from src.api.database.log_writer import PredictionLogWriter
+from src.api.database.spill_buffer import SpillBuffer
+from src.api.database.partitions import partition_maintenance_loop
+from src.model.batcher import MicroBatcher
+from src.model.prediction_cache import PredictionCache
+from src.model.drift_monitor import DriftMonitor
+from config.config import DRIFT_MONITOR_ENABLED, DRIFT_REFERENCE_PATH, LOG_PARTITIONING, LOG_SPILL_ENABLED, MICRO_BATCHING_ENABLED, PREDICTION_CACHE_ENABLED, LOG_WRITER_ENABLED, DB_ASYNC_ENABLED, INFERENCE_THREADS, INFERENCE_BACKEND, INFERENCE_WORKERS
+
+async def warm_up_runtime(app: FastAPI):
+    """Warm the loaded runtime up off the event loop; /ready stays 503 until it is done."""
+    try:
+        app.state.warmup["timings_ms"] = await asyncio.to_thread(warm_up, app.state.runtime)
+        app.state.warmup["done"] = True
+    except Exception as e:
+        logger.error(f"❌ Model warm-up failed: {e}")
+        app.state.warmup["error"] = str(e)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -12,21 +38,74 @@ async def lifespan(app: FastAPI):
     init_db()
     # Démarrage : Charge le modèle dans l'état de l'application
     logger.info("ℹ️ Application starting up...")
-    app.state.model = load_model_instance()
-    
-    # "Warm-up" du cache pour la signature et les infos du modèle
-    get_model_signature()
-    get_model_info()
-
-    if app.state.model:
-        logger.info("✅ Model successfully injected into app state")
+    # Session, signature, seuil et version sont précompilés en un seul objet immuable
+    app.state.runtime = load_model_runtime()
+
+    if app.state.runtime:
+        logger.info("✅ Model runtime successfully injected into app state")
     else:
         logger.error("❌ Application started WITHOUT an active model")
+
+    # Démarrage : chauffe du modèle (batchs synthétiques) en tâche de fond, suivie par /ready
+    app.state.warmup = {"done": False, "timings_ms": None, "error": None}
+    app.state.warmup_task = asyncio.create_task(warm_up_runtime(app)) if app.state.runtime else None
+
+    # Démarrage : pool de threads dédié à l'inférence, la boucle d'évènements reste libre
+    # (en mode "process", au moins un thread par worker pour les occuper tous)
+    nb_threads = max(INFERENCE_THREADS, INFERENCE_WORKERS) if INFERENCE_BACKEND == "process" else INFERENCE_THREADS
+    app.state.inference_executor = ThreadPoolExecutor(
+        max_workers=nb_threads, thread_name_prefix="onnx-inference"
+    )
+
+    # Démarrage : cache des prédictions (optionnel)
+    app.state.prediction_cache = PredictionCache() if PREDICTION_CACHE_ENABLED else None
+
+    # Démarrage : monitoring du drift en ligne (profil de référence livré avec le modèle)
+    profile = app.state.runtime.reference_profile if app.state.runtime else None
+    app.state.drift_monitor = DriftMonitor(profile) if DRIFT_MONITOR_ENABLED and profile else None
+    if DRIFT_MONITOR_ENABLED and not profile:
+        logger.warning(f"⚠️ Drift monitor disabled: no reference profile at {DRIFT_REFERENCE_PATH}")
+
+    # Démarrage : writer des logs de prédiction par lots (sinon un insert par requête),
+    # avec tampon disque si la base est lente ou indisponible
+    write_rows = async_write_prediction_logs if DB_ASYNC_ENABLED else write_prediction_logs
+    spill = SpillBuffer() if LOG_SPILL_ENABLED else None
+    app.state.log_writer = PredictionLogWriter(write_rows=write_rows, spill=spill) if LOG_WRITER_ENABLED else None
+    if app.state.log_writer:
+        await app.state.log_writer.start()
+
+    # Démarrage : création des partitions à venir et rétention des logs (table partitionnée)
+    app.state.partition_task = (
+        asyncio.create_task(partition_maintenance_loop(engine)) if LOG_PARTITIONING != "none" else None
+    )
+
+    # Démarrage : rechargements du modèle en tâche de fond (un seul à la fois)
+    app.state.model_reloader = ModelReloader()
+
+    # Démarrage : ordonnanceur de micro-batching devant la session ONNX (optionnel)
+    app.state.batcher = MicroBatcher(executor=app.state.inference_executor) if MICRO_BATCHING_ENABLED else None
+    if app.state.batcher:
+        await app.state.batcher.start()
     yield
     # Arrêt : On peut nettoyer ici si besoin
     logger.info("ℹ️ Application shutting down...")
-    if hasattr(app.state, "model"):
-        del app.state.model
+    # Un rechargement en cours est abandonné : le modèle servi reste en place
+    await app.state.model_reloader.stop()
+    if app.state.warmup_task:
+        await asyncio.gather(app.state.warmup_task, return_exceptions=True)
+    if app.state.batcher:
+        await app.state.batcher.stop()
+    if app.state.log_writer:
+        # Vide la file : les logs déjà acceptés sont écrits avant l'arrêt
+        await app.state.log_writer.stop()
+    if app.state.partition_task:
+        app.state.partition_task.cancel()
+    app.state.inference_executor.shutdown(wait=True)
+    await dispose_engines()
+    if getattr(app.state, "runtime", None):
+        app.state.runtime.close()
+    if hasattr(app.state, "runtime"):
+        del app.state.runtime
     logger.info("✅ Cleanup completed")
 
 app = FastAPI(lifespan=lifespan)
@@ -45,6 +124,29 @@ async def router_health():
         logger.error(f"❌ API Health check failed: {e}")
         raise HTTPException(status_code=500, detail="API is experiencing issues.")
 
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once the model is loaded and warmed up and the database
+    answers, 503 otherwise. Orchestrators and the UI wait on it before sending traffic.
+    """
+    warmup = getattr(app.state, "warmup", {})
+    checks = {
+        "model_loaded": getattr(app.state, "runtime", None) is not None,
+        "warmed_up": warmup.get("done", False),
+        "database": await async_ping_database(),
+    }
+    is_ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            "ready": is_ready,
+            "checks": checks,
+            "warmup_ms": warmup.get("timings_ms"),
+            "warmup_error": warmup.get("error"),
+        },
+    )
+
 
 
 app.include_router(router)
\ No newline at end of file
@@ -0,0 +1,267 @@
+import functools
+import inspect
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from config.config import METRICS_ENABLED
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Bornes en secondes : de 50 µs (étapes courtes) à 10 s (gros batchs)
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+STAGES = ("parse", "validation", "features", "inference", "serialization", "log_enqueue")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    """One metric family; children are keyed by the tuple of label values (in `labelnames` order)."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, child in sorted(self._children.items()):
+            lines.extend(self._render_child(labels, child))
+        return lines
+
+    def _render_child(self, labels: tuple, value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self._children[labels] = self._children.get(labels, 0) + amount
+
+    def value(self, labels: tuple = ()) -> float:
+        return self._children.get(labels, 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self._children[labels] = self._children.get(labels, 0) - amount
+
+    def set(self, labels: tuple, value: float):
+        self._children[labels] = value
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, nb_buckets: int):
+        self.counts = [0] * (nb_buckets + 1)  # dernier slot : +Inf
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; per-bucket counts are stored and only cumulated when rendered."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: tuple, value: float):
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = _HistogramChild(len(self.buckets))
+        # Borne "le" inclusive : première borne >= valeur
+        child.counts[bisect_left(self.buckets, value)] += 1
+        child.sum += value
+
+    def count(self, labels: tuple) -> int:
+        child = self._children.get(labels)
+        return sum(child.counts) if child else 0
+
+    def _render_child(self, labels: tuple, child: _HistogramChild) -> list[str]:
+        names = self.labelnames + ("le",)
+        lines, cumulated = [], 0
+        for bound, count in zip((*self.buckets, float("inf")), child.counts):
+            cumulated += count
+            lines.append(f"{self.name}_bucket{_format_labels(names, (*labels, _format_value(bound)))} {cumulated}")
+        label_str = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{label_str} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{label_str} {cumulated}")
+        return lines
+
+
+class MetricsRegistry:
+    """Dependency-free registry rendered in the Prometheus text exposition format (0.0.4).
+
+    Updates are plain dict/list operations done on the event loop thread (no lock),
+    a few hundred nanoseconds each.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+REQUESTS = REGISTRY.register(Counter(
+    "api_requests_total", "Requests handled, by endpoint, model version and status code.",
+    ("endpoint", "model_version", "status"),
+))
+ERRORS = REGISTRY.register(Counter(
+    "api_request_errors_total", "Requests answered with a 4xx/5xx status code.",
+    ("endpoint", "model_version", "status"),
+))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "api_requests_in_flight", "Requests currently being handled, by endpoint.", ("endpoint",),
+))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "api_request_duration_seconds", "End-to-end handler latency (body read to response built).",
+    ("endpoint", "model_version"),
+))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "api_stage_duration_seconds",
+    "Latency per stage: parse, validation, features, inference, serialization, log_enqueue.",
+    ("endpoint", "model_version", "stage"),
+))
+
+
+class RequestTimer:
+    """Stage durations (seconds) accumulated while one request is handled."""
+    __slots__ = ("started", "mark", "returned", "stages")
+
+    def __init__(self):
+        self.started = self.mark = perf_counter()
+        self.returned = False
+        self.stages: dict[str, float] = {}
+
+    def record(self, stage: str, started: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + (perf_counter() - started)
+
+
+_current_timer: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+def record_stage(stage: str, started: float):
+    """Add the time elapsed since `started` (a `perf_counter()` value) to `stage` of the current request."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.record(stage, started)
+
+
+class TimedRequest(Request):
+    """Request whose JSON decoding (body read included) is timed as the 'parse' stage."""
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            timer = _current_timer.get()
+            await super().json()
+            if timer is not None:
+                timer.record("parse", timer.started)
+                timer.mark = perf_counter()
+        return self._json
+
+
+def _timed_endpoint(endpoint):
+    """Mark endpoint entry (end of Pydantic validation) and exit (start of serialization)."""
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        if timer is not None:
+            timer.record("validation", timer.mark)
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            if timer is not None:
+                timer.mark = perf_counter()
+                timer.returned = True
+    return wrapper
+
+
+def _model_version(request: Request) -> str:
+    runtime = getattr(request.app.state, "runtime", None)
+    return runtime.version if runtime else "none"
+
+
+class MetricsRoute(APIRoute):
+    """APIRoute recording request counts, in-flight gauges, errors and per-stage latencies.
+
+    Parsing and validation happen inside FastAPI before the endpoint runs, and
+    serialization after it returns: they are timed around the endpoint call.
+    Endpoints add their own stages with `record_stage`.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if METRICS_ENABLED and inspect.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not METRICS_ENABLED:
+            return handler
+        endpoint = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            timer = RequestTimer()
+            token = _current_timer.set(timer)
+            version = _model_version(request)
+            IN_FLIGHT.inc((endpoint,))
+            status = 500
+            try:
+                response = await handler(TimedRequest(request.scope, request.receive))
+                status = response.status_code
+                if timer.returned:
+                    timer.record("serialization", timer.mark)
+                return response
+            except StarletteHTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                _current_timer.reset(token)
+                IN_FLIGHT.dec((endpoint,))
+                labels = (endpoint, version, str(status))
+                REQUESTS.inc(labels)
+                if status >= 400:
+                    ERRORS.inc(labels)
+                REQUEST_LATENCY.observe((endpoint, version), perf_counter() - timer.started)
+                for stage, seconds in timer.stages.items():
+                    STAGE_LATENCY.observe((endpoint, version, stage), seconds)
+
+        return timed_handler
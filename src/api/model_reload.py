@@ -0,0 +1,162 @@
+import asyncio
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config.config import MODEL_DIR, MODEL_STAGING_DIR, MODEL_BACKUP_DIR, DRIFT_MONITOR_ENABLED
+from config.logger import logger
+from src.model.drift_monitor import DriftMonitor
+from src.model.hf_interaction import download_repo_from_hf
+from src.model.model_service import (
+    ModelRuntime,
+    clear_model_metadata_cache,
+    load_model_runtime,
+    validate_model_dir,
+    warm_up,
+)
+
+
+def promote_model_dir(staging_dir: Path, model_dir: Path, backup_dir: Path):
+    """Replace `model_dir` by the validated `staging_dir` (two renames); the current model moves to `backup_dir`."""
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    if model_dir.exists():
+        model_dir.rename(backup_dir)
+    staging_dir.rename(model_dir)
+
+
+def restore_model_dir(model_dir: Path, backup_dir: Path):
+    """Put the previous model back after a failed reload."""
+    if backup_dir.exists():
+        shutil.rmtree(model_dir, ignore_errors=True)
+        backup_dir.rename(model_dir)
+
+
+def swap_runtime(app, new_runtime: ModelRuntime) -> ModelRuntime | None:
+    """
+    Substitue le runtime en une seule affectation, sur la boucle d'évènements :
+    les requêtes en cours terminent sur l'ancien, les suivantes voient le nouveau.
+    Retourne l'ancien runtime, à fermer par l'appelant.
+    """
+    old_runtime = getattr(app.state, "runtime", None)
+    app.state.runtime = new_runtime
+    if DRIFT_MONITOR_ENABLED and new_runtime.reference_profile and (
+        old_runtime is None or new_runtime.reference_profile != old_runtime.reference_profile
+    ):
+        # Nouveau profil livré avec le modèle : nouvelles fenêtres sur ses bins
+        app.state.drift_monitor = DriftMonitor(new_runtime.reference_profile)
+    cache = getattr(app.state, "prediction_cache", None)
+    if cache:
+        # Sans await entre les deux : aucune requête ne voit le nouveau runtime avec le cache de l'ancien
+        cache.invalidate()
+    return old_runtime
+
+
+class ModelReloader:
+    """Runs model reloads as background jobs, one at a time, and tracks their progress.
+
+    Every blocking step (download to a staging directory, artifact validation,
+    promotion of the staging directory, session creation and warm-up) runs in a
+    worker thread, so the event loop keeps serving the current runtime at full
+    speed. Only the final swap happens on the loop. If a step fails, the current
+    runtime stays in place and the previous model directory is restored.
+    """
+
+    def __init__(self, model_dir: Path = MODEL_DIR, staging_dir: Path = MODEL_STAGING_DIR,
+                 backup_dir: Path = MODEL_BACKUP_DIR):
+        self.model_dir = Path(model_dir)
+        self.staging_dir = Path(staging_dir)
+        self.backup_dir = Path(backup_dir)
+        self._task: asyncio.Task | None = None
+        self._status: dict = {"state": "idle", "job_id": None}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> dict:
+        return {**self._status, "stages": dict(self._status.get("stages", {}))}
+
+    def start(self, app, repo_id: str, token: str | None = None) -> dict:
+        """Start a reload job; raises RuntimeError if one is already running."""
+        if self.running:
+            raise RuntimeError(f"A model reload is already running (job {self._status['job_id']})")
+        runtime = getattr(app.state, "runtime", None)
+        self._status = {
+            "job_id": uuid.uuid4().hex[:12],
+            "state": "running",
+            "stage": "pending",
+            "repo_id": repo_id,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+            "stages": {},
+            "previous_version": runtime.version if runtime else None,
+            "new_version": None,
+            "error": None,
+        }
+        self._task = asyncio.create_task(self._run(app, repo_id, token))
+        return self.status()
+
+    async def wait(self) -> dict:
+        """Wait for the running job (if any) without cancelling it when the caller is cancelled."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+        return self.status()
+
+    async def stop(self):
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _stage(self, name: str, func, *args):
+        self._status["stage"] = name
+        start = time.perf_counter()
+        result = await asyncio.to_thread(func, *args)
+        self._status["stages"][name] = round(time.perf_counter() - start, 3)
+        return result
+
+    def _download(self, repo_id: str, token: str | None):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        download_repo_from_hf(repo_id, token=token, local_dir=self.staging_dir)
+
+    async def _run(self, app, repo_id: str, token: str | None):
+        promoted = False
+        try:
+            logger.info(f"ℹ️ Model reload {self._status['job_id']} started: downloading {repo_id} to {self.staging_dir}")
+            await self._stage("downloading", self._download, repo_id, token)
+            await self._stage("validating", validate_model_dir, self.staging_dir)
+            await self._stage("promoting", promote_model_dir, self.staging_dir, self.model_dir, self.backup_dir)
+            promoted = True
+
+            runtime = await self._stage("loading", load_model_runtime)
+            if runtime is None:
+                raise RuntimeError("Failed to load the downloaded model into memory.")
+            try:
+                await self._stage("warming_up", warm_up, runtime)
+            except Exception:
+                await asyncio.to_thread(runtime.close)
+                raise
+
+            self._status["stage"] = "swapping"
+            old_runtime = swap_runtime(app, runtime)
+            if old_runtime:
+                # En mode "process", les prédictions en cours se terminent avant l'arrêt des anciens workers
+                await asyncio.to_thread(old_runtime.close)
+            self._status.update({"state": "succeeded", "stage": "done", "new_version": runtime.version})
+            logger.info(f"✅ Model reloaded and updated in app state (version {runtime.version})")
+        except asyncio.CancelledError:
+            self._status.update({"state": "failed", "error": "cancelled"})
+            raise
+        except Exception as e:
+            logger.error(f"❌ Reload error during '{self._status['stage']}': {e}")
+            if promoted:
+                await asyncio.to_thread(restore_model_dir, self.model_dir, self.backup_dir)
+                # load_model_runtime a rempli les caches avec le modèle rejeté
+                clear_model_metadata_cache()
+            self._status.update({"state": "failed", "error": str(e)})
+        finally:
+            self._status["finished_at"] = datetime.now(timezone.utc).isoformat()
@@ -1,32 +1,62 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request, BackgroundTasks, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+import asyncio
+import functools
 import os
 import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal
+import numpy as np
 from dotenv import load_dotenv
 
-from config.config import MODEL_DIR, BASE_DIR
+from config.config import BASE_DIR, INFERENCE_BACKEND, BATCH_CHUNK_SIZE
 from config.logger import logger
 
-from src.model.hf_interaction import download_model_from_hf
+from src.model.worker_pool import InferenceWorkerPool
 from src.model.model_service import (
-    get_model_signature, 
+    ModelRuntime,
     get_model_status, 
-    get_model_info, 
     get_prediction,
-    load_model_instance
+    get_matrix_prediction,
+    score_feature_matrix,
+    format_predictions
 )
+from src.api.columnar import (
+    RAW_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE,
+    RAW_OUTPUT_COLUMNS,
+    decode_raw_matrix,
+    decode_arrow_matrix,
+    encode_raw_predictions,
+    encode_arrow_predictions
+)
+from src.api.csv_scoring import CSV_MEDIA_TYPE, read_csv_chunks, score_next_chunk
+from src.api.streaming import NDJSON_MEDIA_TYPE, RequestStreamingResponse, iter_ndjson_chunks, to_ndjson
+from src.api.validation import get_batch_validator, records_to_matrix
+from src.api.metrics import REGISTRY, PROMETHEUS_MEDIA_TYPE, MetricsRoute, record_stage
 from src.api.schemas import (
     ScoringData, 
     PredictionResponse, 
+    BatchItemError, 
     ModelStatusResponse, 
     ModelSignatureResponse, 
-    ModelInfoResponse
+    ModelInfoResponse,
+    MonitoringSummaryResponse
 )
 
-from sqlalchemy.orm import Session
 from src.api.database.table_models import PredictionLog
-from src.api.database.database import get_db, SessionLocal
+from src.api.database.database import (
+    engine,
+    SessionLocal,
+    async_write_prediction_logs,
+    database_stats,
+    to_log_row,
+    write_prediction_logs
+)
+from src.api.database.monitoring import monitoring_summary, to_naive_utc
+from config.config import DB_ASYNC_ENABLED, METRICS_ENABLED
 
-router = APIRouter()
+router = APIRouter(route_class=MetricsRoute)
 load_dotenv(dotenv_path=BASE_DIR / ".devenv")
 
 def log_prediction_to_db(
@@ -42,13 +72,13 @@ def log_prediction_to_db(
     """
     db = SessionLocal()
     try:
-        log_entry = PredictionLog(
-            model_version=model_version,
-            latency_ms=latency_ms,
-            status_code=status_code,
-            inputs=inputs,
-            outputs=outputs
-        )
+        log_entry = PredictionLog(**to_log_row({
+            "model_version": model_version,
+            "latency_ms": latency_ms,
+            "status_code": status_code,
+            "inputs": inputs,
+            "outputs": outputs
+        }))
         db.add(log_entry)
         db.commit()
     except Exception as e:
@@ -57,6 +87,103 @@ def log_prediction_to_db(
         db.close()
 
 
+async def log_prediction(request: Request, background_tasks: BackgroundTasks, **entry):
+    """
+    Queue a prediction log on the batched writer when it is running, otherwise
+    fall back to one `log_prediction_to_db` background task per row.
+    Successful predictions also feed the online drift monitor.
+    """
+    monitor = getattr(request.app.state, "drift_monitor", None)
+    if monitor and entry["status_code"] == 200:
+        monitor.observe(entry["model_version"], {**entry["inputs"], "score": entry["outputs"].get("score")})
+
+    writer = getattr(request.app.state, "log_writer", None)
+    if writer:
+        await writer.put(entry)
+    elif DB_ASYNC_ENABLED:
+        background_tasks.add_task(async_write_prediction_logs, [entry])
+    else:
+        background_tasks.add_task(log_prediction_to_db, **entry)
+
+
+def log_predictions_to_db(entries: list[dict]):
+    """
+    Background task writing the log rows of one scored chunk with a single
+    multi-row insert.
+    """
+    try:
+        write_prediction_logs(entries)
+    except Exception as e:
+        logger.error(f"❌ Database Logging Error: {len(entries)} row(s) not written: {e}")
+
+
+def row_inputs(column_names, row: list) -> dict:
+    """Typed inputs of one validated matrix row (NaN cells logged as missing values)."""
+    return {name: None if value != value else value for name, value in zip(column_names, row)}
+
+
+def matrix_log_entries(
+    version: str,
+    column_names,
+    matrix: np.ndarray,
+    outputs: list[dict],
+    latency_ms: float,
+    status_code: int
+) -> list[dict]:
+    """One log entry per row of a feature matrix (NaN cells logged as missing values)."""
+    return [
+        {
+            "model_version": version,
+            "latency_ms": latency_ms,
+            "status_code": status_code,
+            "inputs": row_inputs(column_names, row),
+            "outputs": output,
+        }
+        for row, output in zip(matrix.tolist(), outputs)
+    ]
+
+
+async def log_predictions(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    entries: list[dict],
+    runtime: ModelRuntime | None = None,
+    matrix: np.ndarray | None = None,
+    scores: np.ndarray | None = None
+):
+    """
+    Log one scored chunk of a bulk endpoint: one entry per row, queued on the
+    batched writer when it is running, otherwise written by one background
+    multi-row insert. The successfully scored rows (`matrix`, in the column
+    order of `runtime`) and their `scores` feed the drift monitor in a single
+    vectorized update.
+    """
+    monitor = getattr(request.app.state, "drift_monitor", None)
+    if monitor and matrix is not None and len(matrix):
+        monitor.observe_columns(runtime.version, runtime.column_names, matrix, scores)
+
+    if not entries:
+        return
+    writer = getattr(request.app.state, "log_writer", None)
+    if writer:
+        for entry in entries:
+            await writer.put(entry)
+    elif DB_ASYNC_ENABLED:
+        background_tasks.add_task(async_write_prediction_logs, entries)
+    else:
+        background_tasks.add_task(log_predictions_to_db, entries)
+
+
+async def run_inference(request: Request, func, *args):
+    """
+    Run a blocking inference function on the dedicated inference thread pool
+    so that session.run never blocks the event loop.
+    """
+    executor = getattr(request.app.state, "inference_executor", None)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+
 @router.get("/router_health")
 async def router_health():
     """Verifies the router is properly connected to the main application."""
@@ -89,13 +216,15 @@ async def model_status():
         raise HTTPException(status_code=500, detail="Internal server error while checking model status.")
 
 @router.get("/model_signature", response_model=ModelSignatureResponse)
-async def model_signature():
+async def model_signature(request: Request):
     """
     Retrieve the model signature (expected input variables).
-    Provides the list of columns and total number of features.
+    Provides the list of columns and total number of features of the runtime
+    currently serving predictions.
     """
     try:
-        signature = get_model_signature()
+        runtime = getattr(request.app.state, "runtime", None)
+        signature = runtime.signature if runtime else {"exists": False}
         if not signature["exists"]:
             logger.warning("⚠️ Model signature requested but MLmodel file is missing")
             raise HTTPException(status_code=404, detail="Signature file (MLmodel) not found.")
@@ -112,13 +241,14 @@ async def model_signature():
         raise HTTPException(status_code=500, detail="Internal server error while retrieving signature.")
 
 @router.get("/model_info", response_model=ModelInfoResponse)
-async def model_info():
+async def model_info(request: Request):
     """
-    Provide detailed information about the model.
+    Provide detailed information about the model currently serving predictions.
     Includes CatBoost version, MLflow ID, creation date and decision threshold.
     """
     try:
-        infos = get_model_info()
+        runtime = getattr(request.app.state, "runtime", None)
+        infos = runtime.info if runtime else {"exists": False}
         if not infos["exists"]:
             logger.warning("⚠️ Model info requested but MLmodel metadata is missing")
             raise HTTPException(status_code=404, detail="Model information not found.")
@@ -130,6 +260,80 @@ async def model_info():
         logger.error(f"❌ Error retrieving model info: {e}")
         raise HTTPException(status_code=500, detail="Internal server error while retrieving model info.")
 
+@router.get("/runtime_stats")
+async def runtime_stats(request: Request):
+    """
+    Expose the internal metrics of the inference runtime components.
+    Includes micro-batching batch sizes and queue wait times, prediction cache
+    hit/miss/eviction counters and the log writer queue depth when enabled, and
+    the database connection pool usage.
+    """
+    batcher = getattr(request.app.state, "batcher", None)
+    cache = getattr(request.app.state, "prediction_cache", None)
+    log_writer = getattr(request.app.state, "log_writer", None)
+    runtime = getattr(request.app.state, "runtime", None)
+    session = runtime.session if runtime else None
+    return {
+        "message": "Runtime statistics retrieved",
+        "backend": INFERENCE_BACKEND,
+        "model_version": runtime.version if runtime else None,
+        "batcher": batcher.stats() if batcher else None,
+        "prediction_cache": cache.stats() if cache else None,
+        "log_writer": log_writer.stats() if log_writer else None,
+        "database": database_stats(),
+        "workers": session.stats() if isinstance(session, InferenceWorkerPool) else None
+    }
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """
+    Prometheus scrape endpoint (text exposition format): request and error
+    counters, in-flight gauges and latency histograms per endpoint and model
+    version, with the latency split by stage (parse, validation, features,
+    inference, serialization, log_enqueue).
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false).")
+    return Response(content=REGISTRY.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+@router.get("/monitoring/summary", response_model=MonitoringSummaryResponse)
+async def monitoring_summary_endpoint(
+    bucket: Literal["minute", "hour", "day", "all"] = "hour",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    model_version: str | None = None
+):
+    """
+    Aggregated monitoring of the prediction logs, computed in SQL.
+    Returns, per time bucket and model version, request and error counts,
+    error and approval rates and latency mean / p50 / p95 / p99 / max.
+    Defaults to the last 24 hours.
+    """
+    end = to_naive_utc(end or datetime.now(timezone.utc))
+    start = to_naive_utc(start) if start else end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be before end")
+
+    try:
+        series = await asyncio.to_thread(monitoring_summary, engine, bucket, start, end, model_version)
+    except Exception as e:
+        logger.error(f"❌ Monitoring query failed: {e}")
+        raise HTTPException(status_code=500, detail="Monitoring query failed.")
+    return {"bucket": bucket, "start": start, "end": end, "series": series}
+
+@router.get("/monitoring/drift")
+async def monitoring_drift(request: Request, model_version: str | None = None):
+    """
+    Online drift statistics of the recent predictions against the reference profile.
+    For each model version and feature: PSI, binned KS distance, missing rate,
+    number of samples in the sliding window and a status
+    (stable / moderate / drift / insufficient_data).
+    """
+    monitor = getattr(request.app.state, "drift_monitor", None)
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Drift monitor disabled (no reference profile).")
+    return monitor.stats(model_version)
+
 @router.post("/individual_score", response_model=PredictionResponse)
 async def individual_score(
     request: Request, 
@@ -142,44 +346,68 @@ async def individual_score(
     """
     start_time = time.time()
 
-    model = getattr(request.app.state, "model", None)
-    if not model:
+    # On fige le runtime courant : un reload concurrent n'affecte pas cette requête
+    runtime = getattr(request.app.state, "runtime", None)
+    if not runtime:
         logger.error("❌ Scoring failed: Model is not loaded in app state")
         raise HTTPException(status_code=503, detail="Model is currently not loaded on the server. Please reload it.")
     
     try:
         # On convertit l'objet Pydantic en dict pour le service
+        stage_start = time.perf_counter()
         data_dict = data.model_dump()
-        results = get_prediction(model, data_dict)
+        cache = getattr(request.app.state, "prediction_cache", None)
+        cache_key = cache.make_key(runtime, data_dict) if cache else None
+        results = cache.get(cache_key) if cache else None
+        record_stage("features", stage_start)
+
+        if results is None:
+            stage_start = time.perf_counter()
+            generation = cache.generation if cache else None
+            batcher = getattr(request.app.state, "batcher", None)
+            if batcher:
+                # Regroupé avec les requêtes concurrentes en un seul appel ONNX
+                try:
+                    results = await batcher.submit(runtime, data_dict)
+                except asyncio.QueueFull:
+                    logger.warning("⚠️ Scoring rejected: micro-batching queue is full")
+                    raise HTTPException(status_code=503, detail="Scoring queue is full. Please retry later.")
+            else:
+                results = await run_inference(request, get_prediction, runtime, data_dict)
+            record_stage("inference", stage_start)
+            if cache and "error" not in results:
+                cache.put(cache_key, results, generation)
         latency = (time.time() - start_time)*1000
 
-        # On récupère l'ID du modèle dynamiquement (ou V3 par défaut)
-        model_info = get_model_info()
-        version = model_info.get("mlflow_model_id", "V3")
+        # ID du modèle figé dans le runtime (ou V3 par défaut)
+        version = runtime.version
 
         # Préparation des données pour le log (format JSON sérialisable)
+        stage_start = time.perf_counter()
         inputs_log = data.model_dump(mode='json')
 
         if "error" in results:
-            background_tasks.add_task(
-                log_prediction_to_db,
+            await log_prediction(
+                request, background_tasks,
                 model_version=version,
                 latency_ms=latency,
                 status_code=400,
                 inputs=inputs_log,
                 outputs={"error": results["error"]}
             )
+            record_stage("log_enqueue", stage_start)
             raise HTTPException(status_code=400, detail=results["error"])
         
         # Enregistrement en arrière-plan pour ne pas bloquer la réponse client
-        background_tasks.add_task(
-            log_prediction_to_db,
+        await log_prediction(
+            request, background_tasks,
             model_version=version,
             latency_ms=latency,
             status_code=200,
             inputs=inputs_log,
             outputs=results
         )
+        record_stage("log_enqueue", stage_start)
         
         return results
     except HTTPException:
@@ -190,51 +418,70 @@ async def individual_score(
     
 
 
-@router.post("/multiple_score", response_model=list[PredictionResponse])
+@router.post("/multiple_score", response_model=list[PredictionResponse | BatchItemError])
 async def multiple_score(
     request: Request, 
-    data_list: list[ScoringData],
+    records: list[dict[str, Any]],
     background_tasks: BackgroundTasks
 ):
     """
     Perform batch predictions for a list of clients.
-    Returns a list of results with scores and decisions for each entry.
+    Rows are validated together on the feature matrix: valid rows are scored,
+    invalid rows are returned in place with their error codes. Scored rows are
+    logged with their validated, typed values.
     """
-    model = getattr(request.app.state, "model", None)
-    if not model:
+    runtime = getattr(request.app.state, "runtime", None)
+    if not runtime:
         logger.error("❌ Bulk scoring failed: Model is not loaded")
         raise HTTPException(status_code=503, detail="Model is not loaded")
     
     try:
-        model_info = get_model_info()
-        version = model_info.get("mlflow_model_id", "V3")
-        
-        results = []
-        for d in data_list:
-            start_item = time.time()
-            res = get_prediction(model, d.model_dump())
-            latency = (time.time() - start_item)*1000
-            
-            if "error" in res:
-                background_tasks.add_task(
-                    log_prediction_to_db,
-                    model_version=version,
-                    latency_ms=latency,
-                    status_code=400,
-                    inputs=d.model_dump(mode='json'),
-                    outputs={"error": res["error"]}
-                )
-                raise HTTPException(status_code=400, detail=f"Error in batch item: {res['error']}")
-            
-            background_tasks.add_task(
-                log_prediction_to_db,
-                model_version=version,
-                latency_ms=latency,
-                status_code=200,
-                inputs=d.model_dump(mode='json'),
-                outputs=res
-            )
-            results.append(res)
+        version = runtime.version
+
+        # Validation vectorisée : les règles de ScoringData appliquées à toute la matrice
+        stage_start = time.perf_counter()
+        matrix = records_to_matrix(records, runtime.column_names)
+        validation = get_batch_validator(runtime.column_names).validate(matrix)
+        valid_rows = np.flatnonzero(validation.valid)
+        valid_matrix = matrix[valid_rows].astype(np.float32)
+        # Part de la validation par ligne : latence journalisée des lignes invalides
+        validation_ms = (time.perf_counter() - stage_start) * 1000 / max(len(records), 1)
+        record_stage("features", stage_start)
+
+        # Scoring vectorisé des seules lignes valides : un appel ONNX par chunk
+        stage_start = time.perf_counter()
+        batch = await run_inference(request, get_matrix_prediction, runtime, valid_matrix)
+        inference_ms = (time.perf_counter() - stage_start) * 1000
+        record_stage("inference", stage_start)
+
+        stage_start = time.perf_counter()
+        if "error" in batch:
+            # Comme en succès : la durée mesurée de l'inférence répartie sur les lignes
+            row_latency = inference_ms / max(len(valid_rows), 1)
+            await log_predictions(request, background_tasks, [
+                {"model_version": version, "latency_ms": row_latency, "status_code": 400,
+                 "inputs": inputs, "outputs": {"error": batch["error"]}}
+                for inputs in records
+            ])
+            record_stage("log_enqueue", stage_start)
+            raise HTTPException(status_code=400, detail=f"Error in batch: {batch['error']}")
+
+        # Lignes scorées journalisées avec les valeurs typées de la matrice validée ("40" -> 40)
+        results, entries = [None] * len(records), []
+        scored_matrix = matrix[valid_rows]
+        for i, row, res, latency in zip(valid_rows, scored_matrix.tolist(), batch["results"], batch["latencies_ms"]):
+            results[i] = res
+            entries.append({"model_version": version, "latency_ms": latency, "status_code": 200,
+                            "inputs": row_inputs(runtime.column_names, row), "outputs": res})
+        for i, codes in validation.error_codes.items():
+            results[i] = {"row": i, "error": "Invalid input", "error_codes": codes}
+            entries.append({"model_version": version, "latency_ms": validation_ms, "status_code": 422,
+                            "inputs": records[i], "outputs": {"error": "Invalid input", "error_codes": codes}})
+        scores = np.array([res["score"] for res in batch["results"]], dtype=np.float64)
+        await log_predictions(request, background_tasks, entries, runtime, scored_matrix, scores)
+        record_stage("log_enqueue", stage_start)
+        if validation.nb_invalid:
+            logger.warning(f"⚠️ Batch validation: {validation.nb_invalid}/{len(records)} invalid row(s)")
         return results
     except HTTPException:
         raise
@@ -242,34 +489,271 @@ async def multiple_score(
         logger.error(f"❌ Bulk prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/reload_model")
-async def reload_model(request: Request):
+@router.post(
+    "/stream_score",
+    response_class=RequestStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def stream_score(request: Request, background_tasks: BackgroundTasks):
+    """
+    Streaming bulk scoring: one JSON record per line in, one JSON result per line out.
+    Records are read, validated and scored chunk by chunk, and each chunk of
+    results is sent as soon as it is scored, so memory does not grow with the
+    number of rows. Every output line carries the 'row' index of its input line.
+    Each chunk is logged (one entry per row) and feeds the drift monitor.
+    """
+    runtime = getattr(request.app.state, "runtime", None)
+    if not runtime:
+        logger.error("❌ Streaming scoring failed: Model is not loaded")
+        raise HTTPException(status_code=503, detail="Model is not loaded")
+
+    validator = get_batch_validator(runtime.column_names)
+
+    async def score_chunks():
+        offset, nb_invalid = 0, 0
+        start_time = time.perf_counter()
+        try:
+            async for chunk in iter_ndjson_chunks(request.stream(), BATCH_CHUNK_SIZE):
+                matrix = records_to_matrix([record or {} for record in chunk], runtime.column_names)
+                validation = validator.validate(matrix)
+                valid_rows = np.flatnonzero(validation.valid)
+
+                inference_start = time.perf_counter()
+                batch = await run_inference(
+                    request, get_matrix_prediction, runtime, matrix[valid_rows].astype(np.float32)
+                )
+                if "error" in batch:
+                    row_latency = (time.perf_counter() - inference_start) * 1000 / max(len(valid_rows), 1)
+                    await log_predictions(request, background_tasks, [
+                        {"model_version": runtime.version, "latency_ms": row_latency, "status_code": 400,
+                         "inputs": record or {}, "outputs": {"error": batch["error"]}}
+                        for record in chunk
+                    ])
+                    # Le statut HTTP est déjà parti : l'erreur est signalée dans le flux
+                    yield to_ndjson([{"row": offset, "error": f"Error in batch: {batch['error']}"}])
+                    return
+
+                results, entries = [None] * len(chunk), []
+                scored_rows = matrix[valid_rows].tolist()
+                for i, row, res, latency in zip(valid_rows, scored_rows, batch["results"], batch["latencies_ms"]):
+                    results[i] = {"row": offset + int(i), **res}
+                    entries.append({"model_version": runtime.version, "latency_ms": latency, "status_code": 200,
+                                    "inputs": row_inputs(runtime.column_names, row), "outputs": res})
+                for i, codes in validation.error_codes.items():
+                    error = "Invalid input" if chunk[i] is not None else "Invalid JSON"
+                    codes = codes if chunk[i] is not None else []
+                    results[i] = {"row": offset + i, "error": error, "error_codes": codes}
+                    entries.append({"model_version": runtime.version, "latency_ms": 0.0, "status_code": 422,
+                                    "inputs": chunk[i] or {}, "outputs": {"error": error, "error_codes": codes}})
+                scores = np.array([res["score"] for res in batch["results"]], dtype=np.float64)
+                await log_predictions(request, background_tasks, entries, runtime, matrix[valid_rows], scores)
+
+                nb_invalid += validation.nb_invalid
+                offset += len(chunk)
+                yield to_ndjson(results)
+        except ValueError as e:
+            logger.warning(f"⚠️ Invalid NDJSON stream: {e}")
+            yield to_ndjson([{"row": offset, "error": str(e)}])
+            return
+
+        latency = (time.perf_counter() - start_time) * 1000
+        logger.info(f"✅ Streaming scoring done: {offset} rows ({nb_invalid} invalid) in {latency:.1f} ms")
+
+    return RequestStreamingResponse(
+        score_chunks(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Threshold": str(runtime.threshold), "X-Model-Version": str(runtime.version)}
+    )
+
+@router.post("/csv_score", response_class=StreamingResponse)
+async def csv_score(request: Request, background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """
+    Bulk scoring of a CSV file, parsed server-side in chunks. Answers the same
+    CSV enriched with score, prediction, decision and error columns, streamed
+    chunk by chunk; badly typed cells are reported in place as invalid rows,
+    whatever their chunk. Each chunk is logged (one entry per row) and feeds
+    the drift monitor.
+    """
+    runtime = getattr(request.app.state, "runtime", None)
+    if not runtime:
+        logger.error("❌ CSV scoring failed: Model is not loaded")
+        raise HTTPException(status_code=503, detail="Model is not loaded")
+
+    # Le premier chunk est traité avant d'envoyer la réponse : un fichier
+    # illisible ou une colonne manquante donne encore une vraie erreur 400
+    try:
+        reader = read_csv_chunks(file.file, runtime, BATCH_CHUNK_SIZE)
+        first_chunk = await run_inference(request, score_next_chunk, runtime, reader, True)
+    except ValueError as e:
+        logger.warning(f"⚠️ Invalid CSV file: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid CSV file: {e}")
+
+    async def log_chunk(chunk):
+        valid_matrix = chunk.matrix[chunk.valid_rows]
+        row_latency = chunk.latency_ms / len(chunk.valid_rows) if len(chunk.valid_rows) else 0.0
+        outputs = format_predictions(chunk.scores, chunk.predictions, runtime.threshold)
+        entries = matrix_log_entries(runtime.version, runtime.column_names, valid_matrix, outputs, row_latency, 200)
+        invalid_rows = list(chunk.error_codes)
+        entries += matrix_log_entries(
+            runtime.version, runtime.column_names, chunk.matrix[invalid_rows],
+            [{"error": "Invalid input", "error_codes": chunk.error_codes[i]} for i in invalid_rows], 0.0, 422
+        )
+        await log_predictions(request, background_tasks, entries, runtime, valid_matrix, chunk.scores)
+
+    async def score_chunks():
+        start_time = time.perf_counter()
+        nb_chunks = 0
+        chunk = first_chunk
+        try:
+            while chunk is not None:
+                nb_chunks += 1
+                yield chunk.content
+                await log_chunk(chunk)
+                chunk = await run_inference(request, score_next_chunk, runtime, reader, False)
+        except Exception as e:
+            logger.error(f"❌ CSV scoring aborted after {nb_chunks} chunk(s): {e}")
+            raise
+        latency = (time.perf_counter() - start_time) * 1000
+        logger.info(f"✅ CSV scoring successful: {nb_chunks} chunk(s) in {latency:.1f} ms")
+
+    return StreamingResponse(
+        score_chunks(),
+        media_type=CSV_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="scored_{file.filename or "file.csv"}"',
+            "X-Threshold": str(runtime.threshold),
+            "X-Model-Version": str(runtime.version),
+        }
+    )
+
+@router.post(
+    "/columnar_score",
+    response_class=Response,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                RAW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+                ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def columnar_score(request: Request, background_tasks: BackgroundTasks):
+    """
+    Bulk scoring on a binary columnar payload, without JSON nor per-row validation.
+    Accepts an Arrow IPC stream or a raw little-endian float32 matrix described by
+    the 'X-Columns' header, and answers in the same format. Every row is logged
+    and feeds the drift monitor, chunk by chunk.
+    """
+    runtime = getattr(request.app.state, "runtime", None)
+    if not runtime:
+        logger.error("❌ Columnar scoring failed: Model is not loaded")
+        raise HTTPException(status_code=503, detail="Model is not loaded")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (RAW_MEDIA_TYPE, ARROW_MEDIA_TYPE):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type '{content_type}'. Use {RAW_MEDIA_TYPE} or {ARROW_MEDIA_TYPE}."
+        )
+
+    try:
+        body = await request.body()
+        if content_type == ARROW_MEDIA_TYPE:
+            matrix = decode_arrow_matrix(body, runtime.column_names)
+        else:
+            matrix = decode_raw_matrix(body, request.headers.get("x-columns"), runtime.column_names)
+    except ImportError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        logger.warning(f"⚠️ Invalid columnar payload: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid columnar payload: {e}")
+
+    if not np.isfinite(matrix).all():
+        raise HTTPException(status_code=400, detail="NaN or infinite values are not allowed")
+
+    try:
+        start_time = time.perf_counter()
+        scores, predictions = await run_inference(request, score_feature_matrix, runtime, matrix)
+        latency = (time.perf_counter() - start_time) * 1000
+        record_stage("inference", start_time)
+
+        stage_start = time.perf_counter()
+        row_latency = latency / len(matrix) if len(matrix) else 0.0
+        for start in range(0, len(matrix), BATCH_CHUNK_SIZE):
+            end = start + BATCH_CHUNK_SIZE
+            outputs = format_predictions(scores[start:end], predictions[start:end], runtime.threshold)
+            entries = matrix_log_entries(runtime.version, runtime.column_names, matrix[start:end], outputs, row_latency, 200)
+            await log_predictions(request, background_tasks, entries, runtime, matrix[start:end], scores[start:end])
+        record_stage("log_enqueue", stage_start)
+
+        if content_type == ARROW_MEDIA_TYPE:
+            content = encode_arrow_predictions(scores, predictions)
+        else:
+            content = encode_raw_predictions(scores, predictions)
+        logger.info(f"✅ Columnar scoring successful: {len(matrix)} rows in {latency:.1f} ms")
+
+        return Response(
+            content=content,
+            media_type=content_type,
+            headers={
+                "X-Columns": ",".join(RAW_OUTPUT_COLUMNS),
+                "X-Rows": str(len(matrix)),
+                "X-Threshold": str(runtime.threshold),
+                "X-Model-Version": str(runtime.version),
+            }
+        )
+    except Exception as e:
+        logger.error(f"❌ Columnar prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/reload_model", status_code=202)
+async def reload_model(request: Request, response: Response, wait: bool = False):
     """
-    Trigger download of the latest model version from Hugging Face.
-    After download, the model is reloaded into RAM immediately.
+    Start a background reload of the latest model version from Hugging Face.
+    The model is downloaded to a staging directory, validated, loaded and warmed
+    up off the event loop, then swapped in atomically; the current model keeps
+    serving meanwhile. Returns 202 with the job status (follow it on
+    /reload_model/status), or waits for the outcome with `wait=true`.
     """
     repo_id = os.getenv('HF_REPO_ID')
-    filename = os.getenv('HF_FILENAME', 'model.cb')
     token = os.getenv('HUGGINGFACE_TOKEN', None)
 
     if not repo_id:
         logger.error('❌ HF_REPO_ID has not been declared in your environment.')
         raise HTTPException(status_code=500, detail="HF_REPO_ID is not configured")
 
+    reloader = getattr(request.app.state, "model_reloader", None)
+    if reloader is None:
+        raise HTTPException(status_code=503, detail="Model reloader is not running")
     try:
-        logger.info(f"ℹ️ Manual reload requested. Downloading {filename} from {repo_id}...")
-        local_path = download_model_from_hf(repo_id, filename, token=token, cache_dir=MODEL_DIR)
-        
-        # Recharge le modèle en mémoire
-        new_model = load_model_instance()
-        if new_model:
-            request.app.state.model = new_model
-            logger.info("✅ Model reloaded and updated in app state")
-            return {'message':'✅ Last version model has been well retrieved from HF and reloaded in memory.'}
-        else:
-            logger.error("❌ Reload failed: Failed to create model instance from downloaded file")
-            raise HTTPException(status_code=500, detail="Failed to load the downloaded model into memory.")
-            
-    except Exception as e :
-        logger.error(f'❌ Reload error: {e}')
-        raise HTTPException(status_code=500, detail=f"Failed to reload model: {str(e)}")
+        logger.info(f"ℹ️ Manual reload requested from {repo_id}")
+        status = reloader.start(request.app, repo_id, token)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not wait:
+        return status
+
+    status = await reloader.wait()
+    if status["state"] != "succeeded":
+        raise HTTPException(status_code=500, detail=f"Failed to reload model: {status['error']}")
+    response.status_code = 200
+    return {**status, 'message': '✅ Last version model has been well retrieved from HF and reloaded in memory.'}
+
+@router.get("/reload_model/status")
+async def reload_model_status(request: Request):
+    """
+    Progress of the last model reload job: state (idle, running, succeeded,
+    failed), current stage, duration of each finished stage and error.
+    """
+    reloader = getattr(request.app.state, "model_reloader", None)
+    if reloader is None:
+        raise HTTPException(status_code=503, detail="Model reloader is not running")
+    runtime = getattr(request.app.state, "runtime", None)
+    return {**reloader.status(), "model_version": runtime.version if runtime else None}
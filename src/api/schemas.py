@@ -1,4 +1,5 @@
 import math
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 
 class ScoringData(BaseModel):
@@ -143,6 +144,14 @@ class PredictionResponse(BaseModel):
     threshold: float = Field(..., description="Seuil d'arbitrage utilisé")
     decision: str = Field(..., description="Décision textuelle")
 
+class BatchItemError(BaseModel):
+    """
+    Ligne d'un lot rejetée par la validation, renvoyée à sa place dans la réponse.
+    """
+    row: int = Field(..., description="Index de la ligne dans le lot")
+    error: str = Field(..., description="Message d'erreur")
+    error_codes: list[str] = Field(default_factory=list, description="Règles violées (COLONNE:règle)")
+
 class ModelStatusResponse(BaseModel):
     """
     État actuel du fichier modèle sur le disque.
@@ -170,3 +179,35 @@ class ModelInfoResponse(BaseModel):
     """
     message: str
     info: dict | None = None
+
+class LatencySummary(BaseModel):
+    """
+    Latences (ms) agrégées sur une période.
+    """
+    mean: float | None = None
+    p50: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+    max: float | None = None
+
+class MonitoringBucket(BaseModel):
+    """
+    Agrégats de monitoring pour une période et une version du modèle.
+    """
+    bucket: str = Field(..., description="Début de la période (ISO 8601) ou 'all'")
+    model_version: str | None = None
+    requests: int
+    errors: int
+    error_rate: float
+    approval_rate: float | None = Field(None, description="Part des prédictions accordées")
+    mean_score: float | None = None
+    latency_ms: LatencySummary
+
+class MonitoringSummaryResponse(BaseModel):
+    """
+    Séries de monitoring calculées en SQL.
+    """
+    bucket: str
+    start: datetime
+    end: datetime
+    series: list[MonitoringBucket]
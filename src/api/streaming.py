@@ -0,0 +1,77 @@
+import json
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+
+from config.config import STREAM_MAX_LINE_BYTES
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson_lines(
+    byte_chunks: AsyncIterator[bytes],
+    max_line_bytes: int = STREAM_MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """Split an incoming byte stream into non-empty lines, without reading it whole.
+
+    Only the current incomplete line is kept between two network chunks; a line
+    longer than `max_line_bytes` raises ValueError.
+    """
+    pending = b""
+    async for data in byte_chunks:
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+        if len(pending) > max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds {max_line_bytes} bytes")
+    if pending.strip():
+        yield pending
+
+
+async def iter_ndjson_chunks(
+    byte_chunks: AsyncIterator[bytes],
+    chunk_size: int,
+    max_line_bytes: int = STREAM_MAX_LINE_BYTES
+) -> AsyncIterator[list[dict | None]]:
+    """Group NDJSON records in lists of at most `chunk_size` records.
+
+    A line that is not a JSON object is kept in place as None so that row
+    indexes stay aligned with the input.
+    """
+    chunk = []
+    async for line in iter_ndjson_lines(byte_chunks, max_line_bytes):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        chunk.append(record if isinstance(record, dict) else None)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def to_ndjson(items: list[dict]) -> bytes:
+    """Serialize a list of result dicts as NDJSON lines."""
+    return "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items).encode("utf-8")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body generator reads the request body itself.
+
+    Under ASGI < 2.4 the base class listens for the client disconnect on
+    `receive`, which would steal the request body messages from the generator;
+    here the disconnect is detected by `request.stream()` instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,123 @@
+import functools
+from dataclasses import dataclass
+
+import numpy as np
+from annotated_types import Ge, Le
+
+from src.api.schemas import ScoringData
+
+
+@dataclass(frozen=True)
+class BatchValidation:
+    """Result of a vectorized validation: a validity mask and the error codes of invalid rows."""
+    valid: np.ndarray
+    error_codes: dict[int, list[str]]
+
+    @property
+    def nb_invalid(self) -> int:
+        return len(self.error_codes)
+
+
+class BatchValidator:
+    """NumPy counterpart of the `ScoringData` validators, applied to a whole feature matrix.
+
+    Bounds and integer/boolean types are read from the `ScoringData` fields, and
+    the cross-field rules mirror its custom validators. Each rule is evaluated
+    once on the full column; only invalid rows are then visited to list codes.
+    """
+
+    def __init__(self, column_names: tuple[str, ...]):
+        self.column_names = tuple(column_names)
+        index = {name: j for j, name in enumerate(self.column_names)}
+        # Chaque règle : (code d'erreur, fonction matrice -> masque des lignes en violation)
+        self.rules = []
+
+        for name, field in ScoringData.model_fields.items():
+            if name not in index:
+                continue
+            j = index[name]
+            self.rules.append((f"{name}:invalid_value", lambda m, j=j: ~np.isfinite(m[:, j])))
+            for constraint in field.metadata:
+                if isinstance(constraint, Ge):
+                    self.rules.append((f"{name}:below_min", lambda m, j=j, b=constraint.ge: m[:, j] < b))
+                elif isinstance(constraint, Le):
+                    self.rules.append((f"{name}:above_max", lambda m, j=j, b=constraint.le: m[:, j] > b))
+            if field.annotation is bool:
+                self.rules.append((f"{name}:not_boolean", lambda m, j=j: np.isfinite(m[:, j]) & (m[:, j] != 0) & (m[:, j] != 1)))
+            elif field.annotation is int:
+                self.rules.append((f"{name}:not_integer", lambda m, j=j: np.isfinite(m[:, j]) & (m[:, j] != np.round(m[:, j]))))
+
+        if {"YEARS_EMPLOYED", "YEARS_BIRTH"} <= index.keys():
+            employed, age = index["YEARS_EMPLOYED"], index["YEARS_BIRTH"]
+            self.rules.append(("YEARS_EMPLOYED:greater_than_age", lambda m: m[:, employed] > m[:, age]))
+
+        if {"FE_EXT_SOURCE_MIN", "FE_EXT_SOURCE_MEAN", "FE_EXT_SOURCE_MAX"} <= index.keys():
+            low, mean, high = index["FE_EXT_SOURCE_MIN"], index["FE_EXT_SOURCE_MEAN"], index["FE_EXT_SOURCE_MAX"]
+            self.rules.append(("FE_EXT_SOURCE_MAX:below_min", lambda m: m[:, high] < m[:, low]))
+            self.rules.append((
+                "FE_EXT_SOURCE_MEAN:outside_min_max",
+                lambda m: (m[:, mean] < m[:, low]) | (m[:, mean] > m[:, high])
+            ))
+
+    def validate(self, matrix: np.ndarray) -> BatchValidation:
+        """Apply every rule to the whole matrix in one pass per rule."""
+        violations = np.zeros((len(matrix), len(self.rules)), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for k, (_, rule) in enumerate(self.rules):
+                violations[:, k] = rule(matrix)
+
+        valid = ~violations.any(axis=1)
+        error_codes = {
+            int(i): [self.rules[k][0] for k in np.flatnonzero(violations[i])]
+            for i in np.flatnonzero(~valid)
+        }
+        return BatchValidation(valid=valid, error_codes=error_codes)
+
+
+@functools.lru_cache(maxsize=4)
+def get_batch_validator(column_names: tuple[str, ...]) -> BatchValidator:
+    """Validators are compiled once per model column layout."""
+    return BatchValidator(column_names)
+
+
+# Chaînes booléennes acceptées par Pydantic en mode lax (champs bool de ScoringData uniquement)
+BOOL_STRINGS = {"true": 1.0, "false": 0.0, "yes": 1.0, "no": 0.0, "on": 1.0, "off": 0.0, "t": 1.0, "f": 0.0, "y": 1.0, "n": 0.0}
+
+
+@functools.lru_cache(maxsize=4)
+def boolean_columns(column_names: tuple[str, ...]) -> tuple[bool, ...]:
+    """For each column, whether it is a boolean field of `ScoringData`."""
+    fields = ScoringData.model_fields
+    return tuple(name in fields and fields[name].annotation is bool for name in column_names)
+
+
+def _to_float(value, boolean: bool = False) -> float:
+    """Lenient cell conversion: None, non-numeric values and NaN all become NaN.
+
+    Boolean strings ("yes", "off"...) are only converted for boolean columns,
+    as Pydantic rejects them for numeric fields.
+    """
+    if value is None:
+        return np.nan
+    if boolean and isinstance(value, str) and value.strip().lower() in BOOL_STRINGS:
+        return BOOL_STRINGS[value.strip().lower()]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def records_to_matrix(records: list[dict], column_names: tuple[str, ...]) -> np.ndarray:
+    """Assemble raw JSON records into a float64 matrix, missing or invalid cells as NaN.
+
+    Well-typed records take a single np.fromiter pass; only a batch containing
+    missing keys or non-numeric values falls back to per-cell conversion.
+    """
+    n_rows, n_cols = len(records), len(column_names)
+    try:
+        values = (record[name] for record in records for name in column_names)
+        return np.fromiter(values, dtype=np.float64, count=n_rows * n_cols).reshape(n_rows, n_cols)
+    except (KeyError, TypeError, ValueError):
+        columns = tuple(zip(column_names, boolean_columns(tuple(column_names))))
+        values = (_to_float(record.get(name), boolean) for record in records for name, boolean in columns)
+        return np.fromiter(values, dtype=np.float64, count=n_rows * n_cols).reshape(n_rows, n_cols)
@@ -77,7 +77,7 @@ columns_header= [9,1,1,1]
 executor = get_executor()
 
 # On lance les futurs en arrière-plan
-f_api = executor.submit(fetch_service_status, "http://localhost:8000/api_health")
+f_api = executor.submit(fetch_service_status, "http://localhost:8000/ready")
 f_router = executor.submit(fetch_service_status, "http://localhost:8000/router_health")
 f_model = executor.submit(fetch_service_status, "http://localhost:8000/model_status")
 
@@ -268,22 +268,27 @@ with sco_csv:
             if uploader is None:
                 st.error("Aucun fichier CSV fourni. Importez un fichier avant de lancer le calcul.")
             else:
-                payload = csv_to_json(uploader)
-                response = requests.post("http://localhost:8000/multiple_score", json=payload, timeout=30)
+                # Le CSV est envoyé tel quel : parsing, validation et scoring côté API
+                files = {"file": (uploader.name, uploader.getvalue(), "text/csv")}
+                response = requests.post("http://localhost:8000/csv_score", files=files, timeout=300)
                 if response.status_code == 200:
                     try:
-                        result = response.json()
-                        # Affiche le tableau des réponses renvoyées par l'endpoint
+                        # Affiche le CSV enrichi (score, prediction, decision, error) renvoyé par l'endpoint
+                        import io
                         import pandas as pd
 
-                        if isinstance(result, list):
-                            df = pd.DataFrame(result)
-                            st.markdown("**Résultats (tableau)**")
-                            st.dataframe(df)
-                        else:
-                            st.write(result)
+                        df = pd.read_csv(io.StringIO(response.text))
+                        st.markdown("**Résultats (tableau)**")
+                        st.dataframe(df)
+                        st.download_button(
+                            label='Téléchargez les résultats',
+                            data=response.content,
+                            file_name=f'scored_{uploader.name}',
+                            mime='text/csv',
+                            icon=':material/download:'
+                        )
                     except Exception as exc:
-                        st.error(f"Impossible de parser la réponse JSON : {exc}")
+                        st.error(f"Impossible de lire le CSV renvoyé : {exc}")
                 else:
                     try:
                         error_detail = response.json().get("detail", [])
@@ -3,19 +3,15 @@ import requests
 import streamlit as st
 import concurrent.futures
 
-def csv_to_json(csv_file):
-    """Read an uploaded CSV (or path-like) and return a list of records.
-
-    Returns a Python list of dicts suitable to pass to `requests.post(..., json=...)`.
-    """
-    df = pd.read_csv(csv_file)
-    return df.to_dict(orient='records')
-
 def reload_model():
     try:
         resp = requests.post("http://localhost:8000/reload_model", timeout=10)
+        if resp.status_code == 409:
+            st.info("Un rechargement du modèle est déjà en cours")
+            return
         resp.raise_for_status()
-        st.success("Modèle rechargé avec succès")
+        # Rechargement en tâche de fond : l'ancien modèle reste servi jusqu'à la substitution
+        st.success("Rechargement du modèle lancé (suivi : /reload_model/status)")
     except requests.RequestException as e:
         st.error(f"Erreur lors du reload : {e}")
 
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+
+import numpy as np
+
+from config.config import MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_QUEUE_SIZE, INFERENCE_THREADS
+from config.logger import logger
+from src.model.model_service import get_batch_prediction
+
+
+class MicroBatcher:
+    """In-process dynamic batching scheduler placed in front of the ONNX session.
+
+    Single-row requests arriving within `window_ms` of the first queued one are
+    scored together (up to `max_batch_size` rows) with one inference call, and
+    each caller awaits its own row's result. Inference runs on `executor` so the
+    collector keeps gathering the next batch while up to `max_inflight` batches
+    are being scored; beyond that the queue fills up and new requests are shed.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = MICRO_BATCH_WINDOW_MS,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_queue_size: int = MICRO_BATCH_QUEUE_SIZE,
+        executor: Executor | None = None,
+        max_inflight: int = INFERENCE_THREADS,
+        wait_samples: int = 1024,
+    ):
+        self.window_s = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(max_inflight)
+
+        # Métriques
+        self.nb_batches = 0
+        self.nb_requests = 0
+        self.nb_rejected = 0
+        self.max_batch_seen = 0
+        self._batch_sizes = deque(maxlen=wait_samples)
+        self._queue_waits_ms = deque(maxlen=wait_samples)
+
+    async def start(self):
+        """Start the collector loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._collect_loop())
+            logger.info(
+                f"ℹ️ Micro-batching started (window={self.window_s * 1000:g} ms, "
+                f"max_batch={self.max_batch_size}, queue={self._queue.maxsize})"
+            )
+
+    async def stop(self):
+        """Stop the collector loop, score whatever is still queued and wait for in-flight batches."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._slots.acquire()
+            self._spawn(pending)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        logger.info("✅ Micro-batching stopped")
+
+    async def submit(self, model, data_dict: dict) -> dict:
+        """Queue one row and wait for its prediction.
+
+        Returns the same structure as `get_prediction`. Raises asyncio.QueueFull
+        when the queue is saturated so the caller can shed load.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((model, data_dict, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.nb_rejected += 1
+            raise
+        return await future
+
+    async def _collect_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Un slot d'inférence doit être libre avant de constituer le batch suivant
+            await self._slots.acquire()
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.window_s
+
+                while len(batch) < self.max_batch_size:
+                    # On vide d'abord ce qui est déjà en file sans attendre
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except TimeoutError:
+                        break
+            finally:
+                # Même en cas d'arrêt, les requêtes déjà retirées de la file sont scorées
+                if batch:
+                    self._spawn(batch)
+                else:
+                    self._slots.release()
+
+    def _spawn(self, batch: list):
+        task = asyncio.create_task(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        task.add_done_callback(lambda _: self._slots.release())
+
+    async def _run_batch(self, batch: list):
+        """Score a gathered batch off the event loop and resolve each caller's future."""
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter()
+        self.nb_batches += 1
+        self.nb_requests += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self._batch_sizes.append(len(batch))
+        self._queue_waits_ms.extend((now - enqueued_at) * 1000 for _, _, _, enqueued_at in batch)
+
+        # Un reload peut intervenir pendant la fenêtre : on regroupe par session
+        groups: dict[int, list] = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            model = items[0][0]
+            records = [data for _, data, _, _ in items]
+            try:
+                outcome = await loop.run_in_executor(self.executor, get_batch_prediction, model, records, len(items))
+            except Exception as e:
+                outcome = {"error": str(e)}
+            for i, (_, _, future, _) in enumerate(items):
+                if future.done():
+                    continue
+                if "error" in outcome:
+                    future.set_result({"error": outcome["error"]})
+                else:
+                    future.set_result(outcome["results"][i])
+
+    def stats(self) -> dict:
+        """Batch-size and queue-wait metrics for monitoring."""
+        waits = np.fromiter(self._queue_waits_ms, dtype=np.float64)
+        sizes = np.fromiter(self._batch_sizes, dtype=np.float64)
+        return {
+            "window_ms": self.window_s * 1000,
+            "max_batch_size": self.max_batch_size,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "batches": self.nb_batches,
+            "requests": self.nb_requests,
+            "rejected": self.nb_rejected,
+            "max_batch_seen": self.max_batch_seen,
+            "mean_batch_size": round(float(sizes.mean()), 2) if sizes.size else 0.0,
+            "queue_wait_ms": {
+                "mean": round(float(waits.mean()), 3) if waits.size else 0.0,
+                "p50": round(float(np.percentile(waits, 50)), 3) if waits.size else 0.0,
+                "p99": round(float(np.percentile(waits, 99)), 3) if waits.size else 0.0,
+                "max": round(float(waits.max()), 3) if waits.size else 0.0,
+            },
+        }
@@ -0,0 +1,154 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.config import DRIFT_WINDOW_SIZE, DRIFT_MIN_SAMPLES
+
+# Seuils usuels du PSI : < 0.1 stable, < 0.25 dérive modérée, au-delà dérive significative
+PSI_THRESHOLDS = ((0.1, "stable"), (0.25, "moderate"))
+EPSILON = 1e-4
+SCORE_COLUMN = "score"
+
+
+@dataclass
+class _Window:
+    """Sliding window of the last `size` observations of one model version."""
+    ring: np.ndarray      # (size, n_features) bin index per observation, -1 when the slot is empty
+    counts: np.ndarray    # (n_features, n_slots) histogram of the window
+    position: int = 0
+    filled: int = 0
+    observed: int = 0
+
+
+class DriftMonitor:
+    """Streaming per-feature histograms compared with a reference profile.
+
+    Each observation is binned with the reference edges (vectorized, O(features))
+    and added to a sliding window per model version, evicting the oldest one.
+    PSI and binned KS statistics are computed from the window histograms on
+    demand; nothing is read from the database.
+    """
+
+    def __init__(self, profile: dict, window_size: int = DRIFT_WINDOW_SIZE, min_samples: int = DRIFT_MIN_SAMPLES):
+        histograms = dict(profile["features"])
+        # La distribution des scores du modèle est suivie comme une colonne de plus
+        self.has_score = "score" in profile
+        if self.has_score:
+            histograms[SCORE_COLUMN] = profile["score"]
+        self.features = list(histograms)
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.reference_rows = profile.get("nb_rows")
+        self.reference_version = profile.get("model_version")
+
+        edges = [np.asarray(histograms[name]["edges"], dtype=float) for name in self.features]
+        self.nb_bins = max(len(e) for e in edges) + 1
+        # Bornes complétées par +inf : le bin d'une valeur est le nombre de bornes <= valeur
+        self._edges = np.full((len(self.features), self.nb_bins - 1), np.inf)
+        self._reference = np.zeros((len(self.features), self.nb_bins))
+        for i, name in enumerate(self.features):
+            self._edges[i, :len(edges[i])] = edges[i]
+            counts = np.asarray(histograms[name]["counts"], dtype=float)
+            self._reference[i, :len(counts)] = counts / max(counts.sum(), 1)
+        # Un slot par bin + un slot "valeur manquante"
+        self._missing_slot = self.nb_bins
+        self._offsets = np.arange(len(self.features))[None, :] * (self.nb_bins + 1)
+        self._windows: dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, version: str) -> _Window:
+        window = self._windows.get(version)
+        if window is None:
+            window = _Window(
+                ring=np.full((self.window_size, len(self.features)), -1, dtype=np.int16),
+                counts=np.zeros((len(self.features), self.nb_bins + 1), dtype=np.int64),
+            )
+            self._windows[version] = window
+        return window
+
+    def _histogram(self, bins: np.ndarray) -> np.ndarray:
+        flat = (bins + self._offsets).ravel()
+        return np.bincount(flat, minlength=len(self.features) * (self.nb_bins + 1)).reshape(len(self.features), -1)
+
+    def observe_matrix(self, version: str, matrix: np.ndarray):
+        """Add rows (columns in `self.features` order) to the window of `version`."""
+        matrix = np.asarray(matrix, dtype=float).reshape(-1, len(self.features))
+        bins = (matrix[:, :, None] >= self._edges[None]).sum(axis=2)
+        bins[np.isnan(matrix)] = self._missing_slot
+        nb_observed = len(bins)
+        bins = bins[-self.window_size:]
+
+        with self._lock:
+            window = self._window(version)
+            positions = (window.position + np.arange(len(bins))) % self.window_size
+            evicted = window.ring[positions]
+            evicted = evicted[evicted[:, 0] >= 0]
+            if len(evicted):
+                window.counts -= self._histogram(evicted)
+            window.counts += self._histogram(bins)
+            window.ring[positions] = bins
+            window.position = int((window.position + len(bins)) % self.window_size)
+            window.filled = min(self.window_size, window.filled + len(bins))
+            window.observed += nb_observed
+
+    def observe_columns(self, version: str, column_names, matrix: np.ndarray, scores: np.ndarray | None = None):
+        """Add a scored feature matrix whose columns follow `column_names` (bulk endpoints)."""
+        matrix = np.asarray(matrix, dtype=float)
+        index = {name: i for i, name in enumerate(column_names)}
+        missing = np.full(len(matrix), np.nan)
+        columns = [
+            np.asarray(scores, dtype=float) if name == SCORE_COLUMN and scores is not None
+            else matrix[:, index[name]] if name in index else missing
+            for name in self.features
+        ]
+        self.observe_matrix(version, np.column_stack(columns) if columns else matrix[:, :0])
+
+    def observe(self, version: str, inputs: dict):
+        """Add one logged input (feature name -> value, plus `score` when the profile has one)."""
+        row = [inputs.get(name) for name in self.features]
+        self.observe_matrix(version, np.array([[
+            float(value) if isinstance(value, (int, float)) else np.nan for value in row
+        ]]))
+
+    def _feature_stats(self, window: _Window) -> dict:
+        counts = window.counts[:, :self.nb_bins].astype(float)
+        nb_present = counts.sum(axis=1)
+        current = counts / np.maximum(nb_present, 1)[:, None]
+
+        p_cur = np.clip(current, EPSILON, None)
+        p_ref = np.clip(self._reference, EPSILON, None)
+        psi = ((p_cur - p_ref) * np.log(p_cur / p_ref)).sum(axis=1)
+        ks = np.abs(np.cumsum(current, axis=1) - np.cumsum(self._reference, axis=1)).max(axis=1)
+        missing_rate = window.counts[:, self._missing_slot] / max(window.filled, 1)
+
+        stats = {}
+        for i, name in enumerate(self.features):
+            if nb_present[i] < self.min_samples:
+                status = "insufficient_data"
+            else:
+                status = next((label for limit, label in PSI_THRESHOLDS if psi[i] < limit), "drift")
+            stats[name] = {
+                "psi": round(float(psi[i]), 4),
+                "ks": round(float(ks[i]), 4),
+                "missing_rate": round(float(missing_rate[i]), 4),
+                "samples": int(nb_present[i]),
+                "status": status,
+            }
+        return stats
+
+    def stats(self, version: str | None = None) -> dict:
+        with self._lock:
+            windows = {v: w for v, w in self._windows.items() if version is None or v == version}
+            versions = {}
+            for v, w in windows.items():
+                features = self._feature_stats(w)
+                score = features.pop(SCORE_COLUMN) if self.has_score else None
+                versions[v] = {"observed": w.observed, "window": w.filled, "features": features, "score": score}
+        return {
+            "reference_version": self.reference_version,
+            "window_size": self.window_size,
+            "min_samples": self.min_samples,
+            "reference_rows": self.reference_rows,
+            "versions": versions,
+        }
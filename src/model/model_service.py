@@ -1,9 +1,27 @@
 import os
 import time
-from config.config import MODEL_DIR
+from pathlib import Path
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+from config.config import (
+    MODEL_DIR,
+    BATCH_CHUNK_SIZE,
+    ORT_INTRA_OP_THREADS,
+    ORT_INTER_OP_THREADS,
+    ORT_GRAPH_OPTIMIZATION_LEVEL,
+    ORT_EXECUTION_MODE,
+    ORT_ENABLE_CPU_MEM_ARENA,
+    ORT_ENABLE_MEM_PATTERN,
+    INFERENCE_BACKEND,
+    DRIFT_REFERENCE_PATH,
+    MODEL_WARMUP_BATCH_SIZES,
+)
 import yaml
 from config.logger import logger
 from src.api.schemas import ScoringData
+from src.model.reference_profile import load_reference_profile
 import functools
 import onnxruntime as ort
 import numpy as np
@@ -30,8 +48,8 @@ def get_model_status() -> dict:
     return status
 # --- Chargement de la signature au démarrage ---
 @functools.lru_cache(maxsize=1)
-def get_model_signature() -> dict:
-    MLmodel_path = MODEL_DIR / "MLmodel"
+def get_model_signature(model_dir: Path | None = None) -> dict:
+    MLmodel_path = Path(model_dir or MODEL_DIR) / "MLmodel"
 
     if not MLmodel_path.exists():
         return {
@@ -80,8 +98,8 @@ def get_model_signature() -> dict:
     }
 
 @functools.lru_cache(maxsize=1)
-def get_model_info():
-    MLmodel_path = MODEL_DIR / "MLmodel"
+def get_model_info(model_dir: Path | None = None):
+    MLmodel_path = Path(model_dir or MODEL_DIR) / "MLmodel"
 
     if not MLmodel_path.exists():
         return {
@@ -109,64 +127,308 @@ def get_model_info():
         "best_threshold" : config.get('metadata',{}).get('best_threshold',None)
     }
 
-def load_model_instance():
-    """Charge le modèle ONNX en mémoire."""
-    onnx_path = MODEL_DIR / "model.onnx"
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+def build_session_options() -> ort.SessionOptions:
+    """Build the ONNX Runtime SessionOptions from the ORT_* settings of the config."""
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS
+    options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[ORT_GRAPH_OPTIMIZATION_LEVEL.lower()]
+    options.execution_mode = EXECUTION_MODES[ORT_EXECUTION_MODE.lower()]
+    options.enable_cpu_mem_arena = ORT_ENABLE_CPU_MEM_ARENA
+    options.enable_mem_pattern = ORT_ENABLE_MEM_PATTERN
+    return options
+
+def load_model_instance(model_dir: Path | None = None, model_bytes: bytes | None = None):
+    """Charge le modèle ONNX en mémoire (depuis `model_bytes` s'ils sont fournis)."""
+    onnx_path = Path(model_dir or MODEL_DIR) / "model.onnx"
     
-    if not onnx_path.exists():
+    if model_bytes is None and not onnx_path.exists():
         logger.error(f"❌ Critical: ONNX model file not found at {onnx_path}")
         return None
         
     try:
-        logger.info(f"ℹ️ Loading ONNX model from {onnx_path}...")
+        logger.info(f"ℹ️ Loading ONNX model from {'memory' if model_bytes is not None else onnx_path}...")
         # Utilise le CPU pour la portabilité maximale
-        session = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+        session = ort.InferenceSession(
+            model_bytes if model_bytes is not None else str(onnx_path),
+            sess_options=build_session_options(),
+            providers=['CPUExecutionProvider']
+        )
         logger.info("✅ ONNX model loaded successfully")
         return session
     except Exception as e:
         logger.error(f"❌ Failed to load ONNX model: {e}")
         return None
 
-def get_prediction(model: ort.InferenceSession, data_dict: dict):
-    if model is None:
-        logger.error("❌ Prediction failed: No ONNX session provided")
-        return {'error': 'Inference session is missing'}
-    
+@dataclass(frozen=True)
+class ModelRuntime:
+    """Immutable bundle of everything needed to score, precompiled at load time.
+
+    A reload builds a new ModelRuntime and swaps the reference in one assignment:
+    in-flight requests keep the runtime they started with, new requests only see
+    the new one, never a mix of old session and new metadata.
+    """
+    session: Any
+    input_name: str
+    column_names: tuple[str, ...]
+    threshold: float
+    version: str
+    signature: dict
+    info: dict
+    # Profil de référence (drift) livré avec le modèle, None s'il est absent
+    reference_profile: dict | None = None
+    _buffers: threading.local = field(default_factory=threading.local, repr=False, compare=False)
+
+    @property
+    def nb_features(self) -> int:
+        return len(self.column_names)
+
+    def row_buffer(self) -> np.ndarray:
+        """Reusable (1, n_features) float32 input buffer, one per thread."""
+        buffer = getattr(self._buffers, "row", None)
+        if buffer is None:
+            buffer = np.empty((1, self.nb_features), dtype=np.float32)
+            self._buffers.row = buffer
+        return buffer
+
+    def close(self):
+        """Release the inference backend (worker pool) if it holds resources."""
+        close = getattr(self.session, "close", None)
+        if callable(close):
+            close()
+
+def build_model_runtime(session, signature: dict, info: dict, reference_profile: dict | None = None) -> ModelRuntime:
+    """Precompile a loaded session and its MLmodel metadata into a ModelRuntime."""
+    column_names = tuple(col['name'] for col in signature['columns'])
+    return ModelRuntime(
+        session=session,
+        input_name=session.get_inputs()[0].name,
+        column_names=column_names,
+        threshold=signature.get('best_threshold') or 0.5,
+        version=info.get('mlflow_model_id') or "V3",
+        signature=signature,
+        info=info,
+        reference_profile=reference_profile,
+    )
+
+def clear_model_metadata_cache():
+    """Forget the cached MLmodel metadata so that the next read goes back to MODEL_DIR."""
+    get_model_signature.cache_clear()
+    get_model_info.cache_clear()
+
+def load_model_runtime() -> ModelRuntime | None:
+    """Load the inference backend and the model metadata into a fresh ModelRuntime.
+
+    The metadata caches are cleared first so that a reload never serves the
+    signature or threshold of the previous model.
+    """
+    clear_model_metadata_cache()
+
     signature = get_model_signature()
     if not signature['exists']:
-        logger.error("❌ Prediction failed: Signature file 'MLmodel' not found")
-        return {'error' : 'Signature file not found'}
-    
-    columns = signature['columns']
-    # Extraction et nettoyage des données (conversion None en 0.0)
-    ordered_values = [data_dict.get(col['name']) for col in columns]
-    clean_values = [v if v is not None else 0.0 for v in ordered_values]
-    
-    best_threshold = signature.get('best_threshold') or 0.5
+        logger.error("❌ Cannot build model runtime: Signature file 'MLmodel' not found")
+        return None
+
+    if INFERENCE_BACKEND == "process":
+        # Import local : worker_pool dépend lui-même de model_service
+        from src.model.worker_pool import InferenceWorkerPool
+        onnx_path = MODEL_DIR / "model.onnx"
+        if not onnx_path.exists():
+            logger.error(f"❌ Critical: ONNX model file not found at {onnx_path}")
+            return None
+        # Les workers (y compris ceux redémarrés plus tard) chargent ce modèle-ci,
+        # pas le contenu de MODEL_DIR qu'un rechargement peut remplacer entre-temps
+        loader = functools.partial(load_model_instance, model_bytes=onnx_path.read_bytes())
+        session = InferenceWorkerPool.create(loader=loader, n_features=signature['nb_features'])
+    else:
+        session = load_model_instance()
+    if session is None:
+        return None
+
+    info = get_model_info()
+    profile = load_reference_profile(DRIFT_REFERENCE_PATH, model_version=info.get('mlflow_model_id'))
+    runtime = build_model_runtime(session, signature, info, profile)
+    logger.info(f"✅ Model runtime ready (version={runtime.version}, {runtime.nb_features} features, threshold={runtime.threshold})")
+    return runtime
+
+def validate_model_dir(model_dir: Path) -> dict:
+    """
+    Objectif : Vérifier un modèle téléchargé avant qu'il ne remplace le modèle
+    courant : signature MLmodel présente, model.onnx chargeable, entrée de la
+    largeur de la signature et probabilités (n, 2) comprises entre 0 et 1.
+    Lève ValueError si l'artefact est invalide.
+    """
+    model_dir = Path(model_dir)
+    onnx_path = model_dir / "model.onnx"
+    if not onnx_path.exists():
+        raise ValueError(f"model.onnx not found in {model_dir}")
+    # Lecture hors cache : le cache lru ne concerne que le modèle servi
+    signature = get_model_signature.__wrapped__(model_dir)
+    if not signature["exists"] or not signature["columns"]:
+        raise ValueError(f"MLmodel signature not found or empty in {model_dir}")
 
     try:
-        # ONNX attend un array numpy 2D (batch_size, n_features)
-        input_name = model.get_inputs()[0].name
-        input_data = np.array([clean_values], dtype=np.float32)
-        
-        # session.run renvoie [labels, probabilities]
-        _, probas = model.run(None, {input_name: input_data})
-        # probas est de forme (1, 2) -> [[p_accord, p_refus]]
-        proba = float(probas[0][1])
-        
-        is_refused = int(proba >= best_threshold)
-        decision = "Refusé" if is_refused == 1 else "Accordé"
-
-        result = {
-            "score": round(proba, 4),
-            "prediction": is_refused,
-            "threshold": best_threshold,
-            "decision": decision
-        }
-        
-        logger.info(f"✅ Prediction successful: Decision={decision}, Score={round(proba, 4)} (Mode=ONNX)")
+        session = ort.InferenceSession(str(onnx_path), sess_options=build_session_options(), providers=['CPUExecutionProvider'])
+    except Exception as e:
+        raise ValueError(f"model.onnx cannot be loaded: {e}") from e
+    model_input = session.get_inputs()[0]
+    width = model_input.shape[-1] if model_input.shape else None
+    if isinstance(width, int) and width != signature["nb_features"]:
+        raise ValueError(f"Model expects {width} features, signature lists {signature['nb_features']}")
+
+    outputs = session.run(None, {model_input.name: np.zeros((2, signature["nb_features"]), dtype=np.float32)})
+    probas = np.asarray(outputs[-1], dtype=np.float64)
+    if probas.shape != (2, 2) or not np.all((probas >= 0) & (probas <= 1)):
+        raise ValueError(f"Unexpected model output: probabilities of shape {probas.shape}")
+    return {
+        "model_version": get_model_info.__wrapped__(model_dir).get("mlflow_model_id"),
+        "nb_features": signature["nb_features"],
+    }
+
+def warm_up(runtime: ModelRuntime, batch_sizes: list[int] | None = None) -> dict:
+    """Run synthetic batches through a fresh runtime so that ONNX allocations happen before real traffic.
+
+    Returns the duration (ms) of each warm-up call by batch size.
+    """
+    warm_workers = getattr(runtime.session, "warm_up", None)
+    if callable(warm_workers):
+        # Mode "process" : un appel ne chaufferait que le worker libre, le pool chauffe chaque session
+        timings = warm_workers(batch_sizes or MODEL_WARMUP_BATCH_SIZES)
+        logger.info(f"✅ Model warm-up done on every inference worker (ms by batch size: {timings})")
+        return timings
+
+    timings = {}
+    for size in batch_sizes or MODEL_WARMUP_BATCH_SIZES:
+        matrix = np.zeros((size, runtime.nb_features), dtype=np.float32)
+        start = time.perf_counter()
+        if size == 1:
+            # Même chemin que /individual_score (buffer réutilisé par thread)
+            result = get_prediction(runtime, {})
+            if "error" in result:
+                raise RuntimeError(f"Warm-up prediction failed: {result['error']}")
+        else:
+            score_feature_matrix(runtime, matrix)
+        timings[size] = round((time.perf_counter() - start) * 1000, 3)
+    logger.info(f"✅ Model warm-up done (ms by batch size: {timings})")
+    return timings
+
+def build_feature_matrix(records: list[dict], column_names: list[str]) -> np.ndarray:
+    """Assemble records into one contiguous (n_rows, n_features) float32 matrix.
+
+    Columns follow `column_names` order; missing or None values become 0.0.
+    """
+    n_rows, n_cols = len(records), len(column_names)
+    values = itertools.chain.from_iterable(
+        (0.0 if (v := record.get(name)) is None else v for name in column_names)
+        for record in records
+    )
+    matrix = np.fromiter(values, dtype=np.float32, count=n_rows * n_cols)
+    return matrix.reshape(n_rows, n_cols)
+
+def score_matrix(runtime: ModelRuntime, matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Run one ONNX call on a feature matrix and threshold the whole batch.
+
+    Returns (scores, predictions): class-1 probabilities and 0/1 refusal flags.
+    """
+    # session.run renvoie [labels, probabilities], probabilities de forme (n, 2)
+    _, probas = runtime.session.run(None, {runtime.input_name: matrix})
+    scores = np.asarray(probas, dtype=np.float64)[:, 1]
+    predictions = (scores >= runtime.threshold).astype(np.int8)
+    return scores, predictions
+
+def score_feature_matrix(runtime: ModelRuntime, matrix: np.ndarray, chunk_size: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Score an already assembled feature matrix with one ONNX call per chunk.
+
+    Chunks are row slices of the matrix (views), so the input is never copied.
+    """
+    chunk_size = chunk_size or BATCH_CHUNK_SIZE
+    scores = np.empty(len(matrix), dtype=np.float64)
+    predictions = np.empty(len(matrix), dtype=np.int8)
+    for start in range(0, len(matrix), chunk_size):
+        end = start + chunk_size
+        scores[start:end], predictions[start:end] = score_matrix(runtime, matrix[start:end])
+    return scores, predictions
+
+def format_predictions(scores: np.ndarray, predictions: np.ndarray, threshold: float) -> list[dict]:
+    """Convert vectorized scores/predictions into the API response format."""
+    decisions = np.where(predictions == 1, "Refusé", "Accordé")
+    return [
+        {"score": score, "prediction": prediction, "threshold": threshold, "decision": decision}
+        for score, prediction, decision in zip(
+            np.round(scores, 4).tolist(), predictions.tolist(), decisions.tolist()
+        )
+    ]
+
+def get_prediction(runtime: ModelRuntime, data_dict: dict):
+    if runtime is None:
+        logger.error("❌ Prediction failed: No model runtime provided")
+        return {'error': 'Inference session is missing'}
+
+    try:
+        # ONNX attend un array numpy 2D (batch_size, n_features) : buffer réutilisé
+        input_data = runtime.row_buffer()
+        input_data[0] = [0.0 if (v := data_dict.get(name)) is None else v for name in runtime.column_names]
+        scores, predictions = score_matrix(runtime, input_data)
+        result = format_predictions(scores, predictions, runtime.threshold)[0]
+
+        logger.info(f"✅ Prediction successful: Decision={result['decision']}, Score={result['score']} (Mode=ONNX)")
         return result
 
     except Exception as e:
         logger.error(f"❌ ONNX Prediction computation error: {e}")
         return {"error": str(e)}
+
+def get_batch_prediction(runtime: ModelRuntime, records: list[dict], chunk_size: int | None = None) -> dict:
+    """Score a list of records: assemble them into one feature matrix, then
+    delegate to `get_matrix_prediction`.
+    """
+    if runtime is None:
+        logger.error("❌ Batch prediction failed: No model runtime provided")
+        return {'error': 'Inference session is missing'}
+
+    try:
+        matrix = build_feature_matrix(records, runtime.column_names)
+    except Exception as e:
+        logger.error(f"❌ ONNX Batch prediction computation error: {e}")
+        return {"error": str(e)}
+    return get_matrix_prediction(runtime, matrix, chunk_size)
+
+def get_matrix_prediction(runtime: ModelRuntime, matrix: np.ndarray, chunk_size: int | None = None) -> dict:
+    """Score an already validated float32 feature matrix with one ONNX call per
+    chunk of `chunk_size` rows (defaults to BATCH_CHUNK_SIZE).
+
+    Returns {"results": [...], "latencies_ms": [...]} where each row's latency is
+    its chunk latency spread over the chunk rows, or {"error": ...} on failure.
+    """
+    if runtime is None:
+        logger.error("❌ Batch prediction failed: No model runtime provided")
+        return {'error': 'Inference session is missing'}
+
+    chunk_size = chunk_size or BATCH_CHUNK_SIZE
+    results, latencies_ms = [], []
+    try:
+        for start in range(0, len(matrix), chunk_size):
+            chunk = matrix[start:start + chunk_size]
+            start_chunk = time.perf_counter()
+            scores, predictions = score_matrix(runtime, chunk)
+            results.extend(format_predictions(scores, predictions, runtime.threshold))
+            chunk_latency = (time.perf_counter() - start_chunk) * 1000
+            latencies_ms.extend([chunk_latency / len(chunk)] * len(chunk))
+    except Exception as e:
+        logger.error(f"❌ ONNX Batch prediction computation error: {e}")
+        return {"error": str(e)}
+
+    logger.info(f"✅ Batch prediction successful: {len(results)} rows in {-(-len(matrix) // chunk_size)} chunk(s) (Mode=ONNX)")
+    return {"results": results, "latencies_ms": latencies_ms}
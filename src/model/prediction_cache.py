@@ -0,0 +1,90 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config.config import PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_S
+
+
+class PredictionCache:
+    """Size-bounded LRU cache of individual predictions with a TTL.
+
+    Keys hash the model version and the feature vector in model column order,
+    cast to float32 as fed to ONNX: two payloads the model cannot tell apart
+    share an entry. `invalidate()` (on model reload) empties the cache and
+    bumps a generation counter so that predictions computed on the previous
+    runtime while the reload happened are not stored afterwards.
+    """
+
+    def __init__(self, max_size: int = PREDICTION_CACHE_SIZE, ttl_s: float = PREDICTION_CACHE_TTL_S):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.generation = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(runtime, data_dict: dict) -> bytes:
+        """Canonical key: model version + ordered float32 feature vector (None as 0.0, like get_prediction)."""
+        vector = np.fromiter(
+            (0.0 if (v := data_dict.get(name)) is None else v for name in runtime.column_names),
+            dtype=np.float32,
+            count=len(runtime.column_names),
+        )
+        digest = hashlib.blake2b(str(runtime.version).encode(), digest_size=16)
+        digest.update(vector.tobytes())
+        return digest.digest()
+
+    def get(self, key: bytes) -> dict | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, value: dict, generation: int):
+        """Store `value` unless the cache was invalidated since `generation` was read."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
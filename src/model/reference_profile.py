@@ -0,0 +1,123 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.logger import logger
+
+# Incrémenté à chaque changement incompatible du format du fichier
+PROFILE_FORMAT_VERSION = 1
+REFERENCE_PROFILE_FILE = "reference_profile.json"
+PROFILE_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def bin_edges(values: np.ndarray, nb_bins: int) -> np.ndarray:
+    """Interior bin edges: one bin per value for discrete features, quantile bins otherwise.
+
+    A value equal to an edge falls in the upper bin (`np.searchsorted(..., side="right")`).
+    """
+    uniques = np.unique(values)
+    if len(uniques) <= nb_bins:
+        return (uniques[:-1] + uniques[1:]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, nb_bins + 1)[1:-1]))
+
+
+def feature_histogram(series: pd.Series | np.ndarray, nb_bins: int) -> dict:
+    """Bin edges, counts, moments and quantiles of one feature."""
+    values = pd.to_numeric(pd.Series(series), errors="coerce").astype(float).to_numpy()
+    present = values[~np.isnan(values)]
+    edges = bin_edges(present, nb_bins) if len(present) else np.array([])
+    counts = np.bincount(np.searchsorted(edges, present, side="right"), minlength=len(edges) + 1)
+    histogram = {
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "missing": int(len(values) - len(present)),
+    }
+    if len(present):
+        uniques = np.unique(present)
+        histogram.update({
+            "mean": float(present.mean()),
+            "std": float(present.std()),
+            "min": float(present.min()),
+            "max": float(present.max()),
+            "quantiles": {str(q): float(v) for q, v in zip(PROFILE_QUANTILES, np.quantile(present, PROFILE_QUANTILES))},
+        })
+        if len(uniques) <= nb_bins:
+            # Feature discrète : une valeur par bin
+            histogram["values"] = uniques.tolist()
+    return histogram
+
+
+def build_reference_profile(df: pd.DataFrame, columns: list[str], nb_bins: int = 10,
+                            scores: np.ndarray | None = None, model_version: str | None = None) -> dict:
+    """
+    Objectif : Résumer les données d'entraînement en un profil compact :
+    pour chaque feature du modèle, les bornes des bins et leurs effectifs,
+    les moments et quantiles, et la distribution des scores du modèle.
+    """
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns in training data: {', '.join(missing)}")
+    profile = {
+        "format_version": PROFILE_FORMAT_VERSION,
+        "model_version": model_version,
+        "created_on": datetime.now(timezone.utc).isoformat(),
+        "nb_rows": len(df),
+        "nb_bins": nb_bins,
+        "features": {column: feature_histogram(df[column], nb_bins) for column in columns},
+    }
+    if scores is not None:
+        profile["score"] = feature_histogram(np.asarray(scores, dtype=float), nb_bins)
+    return profile
+
+
+def reference_frame(profile: dict, nb_rows: int = 10000, seed: int = 0) -> pd.DataFrame:
+    """
+    Objectif : Échantillon synthétique des données de référence, tiré des
+    histogrammes du profil (valeurs exactes pour les features discrètes,
+    uniforme dans le bin sinon) : les jobs de drift (Evidently) n'ont plus
+    à relire le Parquet d'entraînement.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, histogram in profile["features"].items():
+        counts = np.asarray(histogram["counts"], dtype=float)
+        if counts.sum() == 0:
+            columns[name] = np.full(nb_rows, np.nan)
+            continue
+        bins = rng.choice(len(counts), size=nb_rows, p=counts / counts.sum())
+        if "values" in histogram:
+            columns[name] = np.asarray(histogram["values"])[bins]
+        else:
+            bounds = np.concatenate([[histogram["min"]], histogram["edges"], [histogram["max"]]])
+            columns[name] = rng.uniform(bounds[bins], bounds[bins + 1])
+    return pd.DataFrame(columns)
+
+
+def save_reference_profile(profile: dict, path: Path | str):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile, indent=1))
+
+
+def load_reference_profile(path: Path | str, model_version: str | None = None) -> dict | None:
+    """Load a profile; warns when it was built for another model version or format."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        profile = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"❌ Failed to load reference profile {path}: {e}")
+        return None
+
+    if profile.get("format_version", PROFILE_FORMAT_VERSION) > PROFILE_FORMAT_VERSION:
+        logger.error(f"❌ Reference profile {path} has an unsupported format version {profile['format_version']}")
+        return None
+    if model_version and profile.get("model_version") and profile["model_version"] != model_version:
+        logger.warning(
+            f"⚠️ Reference profile built for model {profile['model_version']}, loaded model is {model_version}"
+        )
+    return profile
@@ -0,0 +1,275 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from config.config import INFERENCE_WORKERS, INFERENCE_WORKER_TIMEOUT_S, BATCH_CHUNK_SIZE
+from config.logger import logger
+from src.model.model_service import load_model_instance, get_model_signature
+
+
+def _worker_main(conn, loader, n_features: int | None = None):
+    """Entry point of an inference worker process.
+
+    Loads its own ONNX session, reports the input layout to the parent, then
+    scores the rows the parent writes in the shared input buffer and writes the
+    probabilities in the shared output buffer.
+    """
+    session = loader()
+    if session is None:
+        conn.send(("error", "ONNX model could not be loaded in worker"))
+        return
+
+    node = session.get_inputs()[0]
+    shape = getattr(node, "shape", None) or []
+    if len(shape) > 1 and isinstance(shape[1], int):
+        n_features = shape[1]
+    elif n_features is None:
+        n_features = get_model_signature()["nb_features"]
+    conn.send(("ready", node.name, n_features))
+
+    _, in_name, out_name, max_rows = conn.recv()
+    # track=False : c'est le process API qui possède (et libère) les segments
+    shm_in = SharedMemory(name=in_name, track=False)
+    shm_out = SharedMemory(name=out_name, track=False)
+    inputs = np.ndarray((max_rows, n_features), dtype=np.float32, buffer=shm_in.buf)
+    outputs = np.ndarray((max_rows, 2), dtype=np.float32, buffer=shm_out.buf)
+
+    try:
+        while True:
+            try:
+                n_rows = conn.recv()
+            except EOFError:
+                # Le process API a disparu
+                break
+            if n_rows is None:
+                break
+            try:
+                _, probas = session.run(None, {node.name: inputs[:n_rows]})
+                outputs[:n_rows] = np.asarray(probas, dtype=np.float32)
+                conn.send(("ok", n_rows))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        del inputs, outputs
+        shm_in.close()
+        shm_out.close()
+
+
+class _WorkerSlot:
+    """One worker process with its pipe and its pair of shared-memory buffers."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.shm_in = None
+        self.shm_out = None
+        self.inputs = None
+        self.outputs = None
+
+
+class InferenceWorkerPool:
+    """Pool of inference worker processes, each holding its own ONNX session.
+
+    Feature matrices are passed to the workers through shared-memory buffers
+    (no pickling of rows). The pool exposes `get_inputs()` and `run()` like an
+    onnxruntime.InferenceSession so it can be used wherever a session is
+    expected. Crashed or hung workers are restarted with the same `loader`;
+    `n_features` is the input width used when the model input shape is dynamic.
+    """
+
+    class NodeArg:
+        def __init__(self, name):
+            self.name = name
+
+    def __init__(
+        self,
+        nb_workers: int = INFERENCE_WORKERS,
+        max_rows: int = BATCH_CHUNK_SIZE,
+        timeout_s: float = INFERENCE_WORKER_TIMEOUT_S,
+        loader=load_model_instance,
+        n_features: int | None = None,
+    ):
+        self.nb_workers = nb_workers
+        self.max_rows = max_rows
+        self.timeout_s = timeout_s
+        self.loader = loader
+        self.signature_n_features = n_features
+        self.input_name = None
+        self.n_features = None
+        self.nb_restarts = 0
+        self._ctx = mp.get_context("spawn")
+        self._slots = [_WorkerSlot(i) for i in range(nb_workers)]
+        self._idle: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+
+        try:
+            for slot in self._slots:
+                self._start_worker(slot)
+                self._idle.put(slot)
+        except Exception:
+            self._closed = True
+            self._shutdown_workers()
+            raise
+        logger.info(f"✅ Inference worker pool started ({nb_workers} processes, {max_rows} rows/buffer)")
+
+    @classmethod
+    def create(cls, **kwargs):
+        """Start a pool, returning None (like load_model_instance) if workers cannot load the model."""
+        try:
+            return cls(**kwargs)
+        except Exception as e:
+            logger.error(f"❌ Failed to start inference worker pool: {e}")
+            return None
+
+    def _start_worker(self, slot: _WorkerSlot):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.loader, self.signature_n_features),
+            name=f"onnx-worker-{slot.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        if not parent_conn.poll(self.timeout_s):
+            process.kill()
+            raise RuntimeError(f"Inference worker {slot.index} did not start in time")
+        status, *payload = parent_conn.recv()
+        if status != "ready":
+            process.join()
+            raise RuntimeError(payload[0])
+
+        input_name, n_features = payload
+        with self._lock:
+            if self.n_features is None:
+                self.input_name, self.n_features = input_name, n_features
+        if slot.shm_in is None:
+            # Buffers alloués une seule fois et réutilisés par les workers redémarrés
+            slot.shm_in = SharedMemory(create=True, size=self.max_rows * self.n_features * 4)
+            slot.shm_out = SharedMemory(create=True, size=self.max_rows * 2 * 4)
+            slot.inputs = np.ndarray((self.max_rows, self.n_features), dtype=np.float32, buffer=slot.shm_in.buf)
+            slot.outputs = np.ndarray((self.max_rows, 2), dtype=np.float32, buffer=slot.shm_out.buf)
+
+        parent_conn.send(("attach", slot.shm_in.name, slot.shm_out.name, self.max_rows))
+        slot.process, slot.conn = process, parent_conn
+
+    def _restart_worker(self, slot: _WorkerSlot, reason: str):
+        logger.warning(f"⚠️ Restarting inference worker {slot.index}: {reason}")
+        if slot.process is not None and slot.process.is_alive():
+            slot.process.kill()
+        if slot.process is not None:
+            slot.process.join()
+        if slot.conn is not None:
+            slot.conn.close()
+        self.nb_restarts += 1
+        self._start_worker(slot)
+
+    def _run_on(self, slot: _WorkerSlot, chunk: np.ndarray) -> np.ndarray:
+        if not slot.process.is_alive():
+            self._restart_worker(slot, "process is not alive")
+
+        n_rows = len(chunk)
+        slot.inputs[:n_rows] = chunk
+        try:
+            slot.conn.send(n_rows)
+            if not slot.conn.poll(self.timeout_s):
+                self._restart_worker(slot, f"no answer after {self.timeout_s}s")
+                raise TimeoutError("Inference worker timed out")
+            status, payload = slot.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            self._restart_worker(slot, f"crashed ({e.__class__.__name__})")
+            raise RuntimeError("Inference worker crashed during prediction") from e
+
+        if status != "ok":
+            raise RuntimeError(payload)
+        return slot.outputs[:n_rows].copy()
+
+    def get_inputs(self):
+        return [self.NodeArg(self.input_name)]
+
+    def run(self, output_names, input_feed: dict):
+        """Score a feature matrix on the workers, chunked to the shared buffer size."""
+        if self._closed:
+            raise RuntimeError("Inference worker pool is closed")
+        matrix = np.ascontiguousarray(next(iter(input_feed.values())), dtype=np.float32)
+        probas = np.empty((len(matrix), 2), dtype=np.float32)
+
+        for start in range(0, len(matrix), self.max_rows):
+            end = start + self.max_rows
+            slot = self._idle.get()
+            try:
+                probas[start:end] = self._run_on(slot, matrix[start:end])
+            finally:
+                self._idle.put(slot)
+
+        return [probas.argmax(axis=1), probas]
+
+    def warm_up(self, batch_sizes: list[int]) -> dict:
+        """Run the synthetic batches on every worker, not just the idle one, so
+        that no session is left cold. Every worker is held until the end.
+
+        Returns the duration (ms) of the slowest worker by batch size.
+        """
+        slots = [self._idle.get() for _ in self._slots]
+        timings = {}
+        try:
+            for size in batch_sizes:
+                # Un batch plus grand que le buffer partagé y passe par morceaux de max_rows
+                chunk = np.zeros((min(size, self.max_rows), self.n_features), dtype=np.float32)
+                durations = []
+                for slot in slots:
+                    start = time.perf_counter()
+                    self._run_on(slot, chunk)
+                    durations.append((time.perf_counter() - start) * 1000)
+                timings[size] = round(max(durations), 3)
+        finally:
+            for slot in slots:
+                self._idle.put(slot)
+        return timings
+
+    def close(self, timeout_s: float | None = None):
+        """Wait for in-flight predictions, stop the workers and free the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+
+        for _ in self._slots:
+            try:
+                self._idle.get(timeout=timeout_s)
+            except queue.Empty:
+                break
+        self._shutdown_workers()
+        logger.info("✅ Inference worker pool stopped")
+
+    def _shutdown_workers(self):
+        for slot in self._slots:
+            try:
+                slot.conn.send(None)
+            except (OSError, AttributeError):
+                pass
+            if slot.process is not None:
+                slot.process.join(timeout=5)
+                if slot.process.is_alive():
+                    slot.process.kill()
+            if slot.shm_in is not None:
+                slot.inputs = slot.outputs = None
+                for shm in (slot.shm_in, slot.shm_out):
+                    shm.close()
+                    shm.unlink()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.nb_workers,
+            "alive": sum(1 for slot in self._slots if slot.process is not None and slot.process.is_alive()),
+            "idle": self._idle.qsize(),
+            "restarts": self.nb_restarts,
+            "rows_per_buffer": self.max_rows,
+        }
@@ -8,9 +8,11 @@ uv run python -m scripts.download_model_from_hf
 echo "🚀 Starting FastAPI..."
 uv run uvicorn src.api.main:app --host 0.0.0.0 --port 8000 &
 
-# 2. Wait a few seconds for the API to initialize
-echo "⏳ Waiting for API to launch..."
-sleep 5
+# 2. Wait until the API is ready (model loaded and warmed up, database reachable)
+echo "⏳ Waiting for API readiness..."
+if ! uv run python -m scripts.wait_for_ready --url http://localhost:8000/ready --timeout "${API_READY_TIMEOUT_S:-120}"; then
+    echo "⚠️ API is not ready yet, starting Streamlit anyway"
+fi
 
 # 3. Start Streamlit in the foreground (Port 7860 for HF Spaces)
 echo "🚀 Starting Streamlit..."
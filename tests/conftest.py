@@ -28,33 +28,62 @@ class DummyModel:
         # Code says: decision = "Refusé" if is_refused == 1 else "Accordé"
         # is_refused = int(proba >= best_threshold)
         # If we want to return a fixed value, we can use 0.42.
-        return [None, [[0.58, 0.42]]]
+        # One row of probabilities per input row (batch inference)
+        n_rows = len(next(iter(input_feed.values())))
+        return [None, [[0.58, 0.42]] * n_rows]
 
     def predict_proba(self, X):
         # Legacy method if needed
         return [[0.58, 0.42] for _ in X]
 
 
+def build_dummy_runtime(session=None, threshold=0.5, version="test_version"):
+    """Builds a ModelRuntime around a DummyModel with the ScoringData signature,
+    so tests do not depend on the MLmodel file (missing in CI).
+    """
+    from src.api.schemas import ScoringData
+    signature = {
+        "exists": True,
+        "columns": [{"name": name, "type": "double"} for name in ScoringData.model_fields],
+        "nb_features": len(ScoringData.model_fields),
+        "best_threshold": threshold,
+    }
+    info = {"exists": True, "mlflow_model_id": version, "best_threshold": threshold}
+    return model_service_module.build_model_runtime(session or DummyModel(), signature, info)
+
+
 @pytest.fixture(scope="session")
 def client():
-    """FastAPI TestClient with a patched model loader to avoid loading the real model.
+    """FastAPI TestClient with a patched runtime loader to avoid loading the real model.
 
     This fixture:
-    - temporarily replaces `load_model_instance` in `src.app.main` with a function returning `DummyModel()`
+    - temporarily replaces `load_model_runtime` in `src.api.main` with a function returning a DummyModel runtime
     - starts the client (triggering startup/shutdown event handlers)
     - restores the original function after use
     """
-    # We must patch where it is imported (src.app.main), because main.py does "from ... import ..."
+    # We must patch where it is imported (src.api.main), because main.py does "from ... import ..."
     from src.api import main
-    original_loader = getattr(main, "load_model_instance", None)
+    original_loader = getattr(main, "load_model_runtime", None)
     
     try:
-        main.load_model_instance = lambda: DummyModel()
+        main.load_model_runtime = lambda: build_dummy_runtime()
         with TestClient(app) as c:
             yield c
     finally:
         if original_loader is not None:
-            main.load_model_instance = original_loader
+            main.load_model_runtime = original_loader
+
+
+@pytest.fixture
+def dummy_runtime():
+    """A ModelRuntime wrapping DummyModel (score 0.42, threshold 0.5)."""
+    return build_dummy_runtime()
+
+
+@pytest.fixture
+def runtime_factory():
+    """Factory building DummyModel runtimes with a custom session, threshold or version."""
+    return build_dummy_runtime
 
 
 @pytest.fixture
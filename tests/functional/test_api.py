@@ -1,7 +1,29 @@
+import asyncio
+import time
 import pytest
-from unittest.mock import patch
+from contextlib import ExitStack
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, patch
 from src.api.schemas import ScoringData
+from sqlalchemy import text
 from src.api.main import app as fastapi_app
+from src.api.database.database import engine, write_prediction_logs
+from src.model import model_service
+from src.model.prediction_cache import PredictionCache
+from src.model.drift_monitor import DriftMonitor
+
+def patch_reload_steps(runtime=None, **download_kwargs):
+    """Patches the download, validation and promotion steps of a background reload,
+    and the runtime it loads (None: loading fails)."""
+    stack = ExitStack()
+    mocks = {
+        "download": stack.enter_context(patch("src.api.model_reload.download_repo_from_hf", **download_kwargs)),
+        "validate": stack.enter_context(patch("src.api.model_reload.validate_model_dir")),
+        "promote": stack.enter_context(patch("src.api.model_reload.promote_model_dir")),
+        "restore": stack.enter_context(patch("src.api.model_reload.restore_model_dir")),
+        "load": stack.enter_context(patch("src.api.model_reload.load_model_runtime", return_value=runtime)),
+    }
+    return stack, mocks
 
 class TestApiRoutes:
     
@@ -11,6 +33,33 @@ class TestApiRoutes:
         assert response.status_code == 200
         assert response.json() == {'message': 'API is running correctly'}
 
+    def test_readiness(self, client):
+        """Verifies /ready reports ready once the startup warm-up is done and the database answers."""
+        import time
+        for _ in range(100):
+            response = client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["checks"] == {"model_loaded": True, "warmed_up": True, "database": True}
+        assert set(body["warmup_ms"]) == {str(size) for size in model_service.MODEL_WARMUP_BATCH_SIZES}
+
+    def test_not_ready_without_database_or_model(self, client):
+        """Verifies /ready answers 503 while a dependency is missing."""
+        with patch("src.api.main.async_ping_database", return_value=False):
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()["checks"]["database"] is False
+
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = None
+        try:
+            assert client.get("/ready").json()["checks"]["model_loaded"] is False
+        finally:
+            fastapi_app.state.runtime = original_runtime
+
     def test_router_health(self, client):
         """Verifies that the router is correctly mounted."""
         response = client.get("/router_health")
@@ -102,23 +151,44 @@ class TestApiRoutes:
 
     def test_model_signature_error(self, client):
         """Simulates an internal error when retrieving model signature."""
-        with patch("src.api.routes.get_model_signature", side_effect=Exception("Corrupted file")):
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = replace(original_runtime, signature={"exists": True})
+        try:
             response = client.get("/model_signature")
             assert response.status_code == 500
             assert "Internal server error" in response.json()["detail"]
+        finally:
+            fastapi_app.state.runtime = original_runtime
 
     def test_model_info_error(self, client):
         """Simulates an internal error when retrieving model info."""
-        with patch("src.api.routes.get_model_info", side_effect=Exception("Unexpected structure")):
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = replace(original_runtime, info={})
+        try:
             response = client.get("/model_info")
             assert response.status_code == 500
             assert "Internal server error" in response.json()["detail"]
+        finally:
+            fastapi_app.state.runtime = original_runtime
+
+    def test_model_metadata_follows_runtime(self, client, dummy_runtime):
+        """Signature and info describe the runtime serving predictions, not the files on disk."""
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = replace(dummy_runtime, info={**dummy_runtime.info, "mlflow_model_id": "m-served"})
+        try:
+            with patch("src.model.model_service.get_model_info", return_value={"exists": True, "mlflow_model_id": "m-disk"}):
+                info = client.get("/model_info").json()["info"]
+            signature = client.get("/model_signature").json()
+            assert info["mlflow_model_id"] == "m-served"
+            assert signature["nb_features"] == len(ScoringData.model_fields)
+        finally:
+            fastapi_app.state.runtime = original_runtime
 
     def test_prediction_model_not_loaded(self, client, sample_payload):
         """Verifies 503 error if model is not loaded in app state."""
-        # Temporarily remove model from app state
-        original_model = getattr(fastapi_app.state, "model", None)
-        fastapi_app.state.model = None
+        # Temporarily remove model runtime from app state
+        original_runtime = getattr(fastapi_app.state, "runtime", None)
+        fastapi_app.state.runtime = None
         
         try:
             response = client.post("/individual_score", json=sample_payload)
@@ -126,8 +196,8 @@ class TestApiRoutes:
             # Checked actual msg: "Model is currently not loaded on the server. Please reload it."
             assert "not loaded" in response.json()["detail"]
         finally:
-            # Restore model to avoid breaking other tests
-            fastapi_app.state.model = original_model
+            # Restore runtime to avoid breaking other tests
+            fastapi_app.state.runtime = original_runtime
 
     def test_prediction_internal_error(self, client, sample_payload):
         """Simulates a crash during value prediction."""
@@ -136,6 +206,105 @@ class TestApiRoutes:
             assert response.status_code == 500
             assert "CatBoost crash" in response.json()["detail"]
 
+    def test_prediction_batcher_queue_full(self, client, sample_payload):
+        """A saturated micro-batching queue sheds load with a 503."""
+        batcher = MagicMock()
+        batcher.submit = AsyncMock(side_effect=asyncio.QueueFull)
+        original_batcher = fastapi_app.state.batcher
+        fastapi_app.state.batcher = batcher
+        try:
+            response = client.post("/individual_score", json=sample_payload)
+            assert response.status_code == 503
+            assert "queue is full" in response.json()["detail"]
+        finally:
+            fastapi_app.state.batcher = original_batcher
+
+    def test_prediction_other_queue_full_is_not_shed(self, client, sample_payload):
+        """A QueueFull raised outside the batcher is an internal error, not a 503."""
+        with patch("src.api.routes.log_prediction", AsyncMock(side_effect=asyncio.QueueFull)):
+            response = client.post("/individual_score", json=sample_payload)
+        assert response.status_code == 500
+
+    def test_runtime_stats(self, client):
+        """Verifies the runtime stats endpoint (micro-batching disabled by default)."""
+        response = client.get("/runtime_stats")
+        assert response.status_code == 200
+        assert response.json()["batcher"] is None
+
+    def test_predictions_are_queued_on_log_writer(self, client, sample_payload):
+        """Verifies that prediction logs go through the batched log writer."""
+        before = client.get("/runtime_stats").json()["log_writer"]["enqueued"]
+        client.post("/multiple_score", json=[sample_payload, sample_payload])
+        assert client.get("/runtime_stats").json()["log_writer"]["enqueued"] == before + 2
+
+    def test_batch_prediction_logs_typed_string_values(self, client, sample_payload):
+        """A numeric string accepted by validation is stored in its typed log column."""
+        writer = fastapi_app.state.log_writer
+        with patch.object(writer, "put", AsyncMock()) as put:
+            response = client.post("/multiple_score", json=[{**sample_payload, "YEARS_BIRTH": "40"}])
+        assert response.status_code == 200
+        [entry] = [call.args[0] for call in put.call_args_list]
+
+        write_prediction_logs([{**entry, "model_version": "typed_string_test"}])
+        with engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT status_code, years_birth, inputs FROM prediction_logs "
+                "WHERE model_version = 'typed_string_test'"
+            )).one()
+        assert row.status_code == 200
+        assert row.years_birth == 40
+        assert row.inputs is None
+
+    def test_predictions_feed_drift_monitor(self, client, sample_payload):
+        """Verifies that successful predictions update the online drift histograms."""
+        assert client.get("/monitoring/drift").status_code == 503
+
+        profile = {"nb_rows": 2, "features": {
+            name: {"edges": [float(value)], "counts": [1, 1]} for name, value in sample_payload.items()
+        }}
+        fastapi_app.state.drift_monitor = DriftMonitor(profile, window_size=10, min_samples=1)
+        try:
+            client.post("/individual_score", json=sample_payload)
+            client.post("/multiple_score", json=[sample_payload, {**sample_payload, "CODE_GENDER": 5}])
+            response = client.get("/monitoring/drift")
+            assert response.status_code == 200
+            [stats] = response.json()["versions"].values()
+            assert stats["observed"] == 2
+            assert stats["features"]["AMT_ANNUITY"]["samples"] == 2
+        finally:
+            fastapi_app.state.drift_monitor = None
+
+    def test_reload_swaps_drift_monitor(self, client, runtime_factory, sample_payload):
+        """Verifies that a reloaded model shipping a new reference profile gets a new drift monitor."""
+        import dataclasses
+        profile = {"nb_rows": 2, "model_version": "new", "features": {
+            name: {"edges": [float(value)], "counts": [1, 1]} for name, value in sample_payload.items()
+        }}
+        new_runtime = dataclasses.replace(runtime_factory(version="new"), reference_profile=profile)
+        original_runtime = fastapi_app.state.runtime
+        try:
+            stack, _ = patch_reload_steps(new_runtime)
+            with stack, patch.object(type(original_runtime), "close"):
+                assert client.post("/reload_model", params={"wait": True}).status_code == 200
+            assert client.get("/monitoring/drift").json()["reference_version"] == "new"
+        finally:
+            fastapi_app.state.drift_monitor = None
+            fastapi_app.state.runtime = original_runtime
+
+    def test_prediction_runs_off_event_loop(self, client, sample_payload):
+        """Verifies that inference runs on the dedicated inference thread pool."""
+        import threading
+        threads = []
+
+        def fake_prediction(model, data_dict):
+            threads.append(threading.current_thread().name)
+            return {"score": 0.42, "prediction": 0, "threshold": 0.5, "decision": "Accordé"}
+
+        with patch("src.api.routes.get_prediction", side_effect=fake_prediction):
+            response = client.post("/individual_score", json=sample_payload)
+            assert response.status_code == 200
+            assert threads[0].startswith("onnx-inference")
+
     # --- Batch Prediction Tests ---
 
     def test_batch_prediction_nominal(self, client, sample_payload):
@@ -161,70 +330,173 @@ class TestApiRoutes:
 
     def test_batch_prediction_model_not_loaded(self, client, sample_payload):
         """Verifies 503 if model not loaded during batch."""
-        original_model = getattr(fastapi_app.state, "model", None)
-        fastapi_app.state.model = None
+        original_runtime = getattr(fastapi_app.state, "runtime", None)
+        fastapi_app.state.runtime = None
         try:
             response = client.post("/multiple_score", json=[sample_payload])
             assert response.status_code == 503
         finally:
-             fastapi_app.state.model = original_model
+             fastapi_app.state.runtime = original_runtime
 
     def test_batch_prediction_item_error(self, client, sample_payload):
-        """Verifies handling of an error within one item of the batch."""
-        # Simulate get_prediction returning an error dict for the first item
-        # We need to preserve the real behavior for valid items if possible, 
-        # but here we mock get_prediction entirely to test the route logic.
-        
-        # Scenario: 1st call -> error, 2nd call -> success
-        mock_returns = [
-            {"error": "Value too high"},
-            {"score": 0.42, "decision": "Accepted"}
-        ]
-        
-        with patch("src.api.routes.get_prediction", side_effect=mock_returns):
+        """Verifies handling of an inference error during batch scoring."""
+        # The batch is scored vectorized: a failing chunk fails the whole request
+        with patch("src.api.routes.get_matrix_prediction", return_value={"error": "Value too high"}):
             batch = [sample_payload, sample_payload]
-            # The route raises 400 immediately if ANY item fails
             response = client.post("/multiple_score", json=batch)
             assert response.status_code == 400
             assert "Value too high" in response.json()["detail"]
 
-    # --- Reload Model Tests ---
+    def test_batch_prediction_error_logs_measured_latency(self, client, sample_payload):
+        """Rows of a failed batch are logged with the measured inference time, not 0 ms."""
+        def slow_failure(*args):
+            time.sleep(0.02)
+            return {"error": "Value too high"}
 
-    def test_reload_model_success(self, client):
-        """Verifies model reload triggers download and update."""
-        with patch("src.api.routes.download_model_from_hf") as mock_dl, \
-             patch("src.api.routes.load_model_instance") as mock_load:
-            
-            # Mock load_model_instance to return a 'NewModel'
-            mock_load.return_value = "NewModelInstance"
-            
-            response = client.post("/reload_model")
-            
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        writer = fastapi_app.state.log_writer
+        with patch.object(writer, "put", AsyncMock()) as put:
+            with patch("src.api.routes.get_matrix_prediction", side_effect=slow_failure):
+                assert client.post("/multiple_score", json=[sample_payload, sample_payload]).status_code == 400
+            assert client.post("/multiple_score", json=[too_old]).status_code == 200
+
+        *failed, invalid = [call.args[0] for call in put.call_args_list]
+        assert [entry["status_code"] for entry in failed] == [400, 400]
+        assert all(entry["latency_ms"] >= 10 for entry in failed)
+        assert invalid["status_code"] == 422 and invalid["latency_ms"] > 0
+
+    def test_batch_prediction_large_batch_chunked(self, client, sample_payload):
+        """Verifies that a batch larger than the chunk size is fully scored."""
+        batch = [sample_payload] * 5
+        mock_sig = {"exists": True, "columns": [{"name": k} for k in sample_payload.keys()]}
+
+        with patch("src.model.model_service.get_model_signature", return_value=mock_sig), \
+             patch("src.model.model_service.BATCH_CHUNK_SIZE", 2):
+            response = client.post("/multiple_score", json=batch)
             assert response.status_code == 200
-            assert "model has been well retrieved" in response.json()["message"]
-            
-            # Verify download and load were called
-            mock_dl.assert_called_once()
-            mock_load.assert_called_once()
-            
-            # Verify app state was updated
-            assert fastapi_app.state.model == "NewModelInstance"
+            assert [r["score"] for r in response.json()] == [0.42] * 5
+
+    def test_batch_prediction_invalid_rows_reported_inline(self, client, sample_payload):
+        """Verifies that invalid rows are reported in place while valid rows are scored."""
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        missing = {k: v for k, v in sample_payload.items() if k != "CODE_GENDER"}
+        batch = [sample_payload, too_old, missing]
+
+        response = client.post("/multiple_score", json=batch)
+        assert response.status_code == 200
+
+        results = response.json()
+        assert results[0]["score"] == 0.42
+        assert results[1] == {"row": 1, "error": "Invalid input", "error_codes": ["YEARS_EMPLOYED:greater_than_age"]}
+        assert results[2]["error_codes"] == ["CODE_GENDER:invalid_value"]
+
+    def test_prediction_cache_skips_inference(self, client, sample_payload, runtime_factory):
+        """Verifies that a repeated payload is served from the cache and that a reload invalidates it."""
+        fastapi_app.state.prediction_cache = PredictionCache(max_size=10, ttl_s=60)
+        original_runtime = fastapi_app.state.runtime
+        try:
+            with patch("src.api.routes.get_prediction", wraps=model_service.get_prediction) as mock_predict:
+                first = client.post("/individual_score", json=sample_payload)
+                second = client.post("/individual_score", json=sample_payload)
+                assert first.json() == second.json()
+                assert mock_predict.call_count == 1
+
+            stats = client.get("/runtime_stats").json()["prediction_cache"]
+            assert stats["hits"] == 1 and stats["misses"] == 1
+
+            stack, _ = patch_reload_steps(runtime_factory())
+            with stack, patch.object(type(original_runtime), "close"):
+                assert client.post("/reload_model", params={"wait": True}).status_code == 200
+            assert client.get("/runtime_stats").json()["prediction_cache"]["size"] == 0
+        finally:
+            fastapi_app.state.prediction_cache = None
+            fastapi_app.state.runtime = original_runtime
+
+    # --- Reload Model Tests ---
+
+    def test_reload_model_success(self, client, runtime_factory):
+        """Verifies model reload downloads, validates, warms up and atomically swaps the runtime."""
+        original_runtime = fastapi_app.state.runtime
+        new_runtime = runtime_factory(version="new_version")
+        stack, mocks = patch_reload_steps(new_runtime)
+
+        with stack, patch.object(type(original_runtime), "close") as mock_close, \
+             patch("src.api.model_reload.warm_up") as mock_warm_up:
+            try:
+                response = client.post("/reload_model", params={"wait": True})
+
+                assert response.status_code == 200
+                assert "model has been well retrieved" in response.json()["message"]
+                assert response.json()["new_version"] == "new_version"
+                assert set(response.json()["stages"]) == {"downloading", "validating", "promoting", "loading", "warming_up"}
+
+                # Verify every step ran, in a staging directory first
+                mocks["download"].assert_called_once()
+                assert mocks["download"].call_args.kwargs["local_dir"] == fastapi_app.state.model_reloader.staging_dir
+                mocks["validate"].assert_called_once()
+                mock_warm_up.assert_called_once_with(new_runtime)
+
+                # Verify app state was swapped and the old runtime released
+                assert fastapi_app.state.runtime is new_runtime
+                mock_close.assert_called_once()
+                assert client.get("/runtime_stats").json()["model_version"] == "new_version"
+            finally:
+                fastapi_app.state.runtime = original_runtime
+
+    def test_reload_model_runs_in_background(self, client, runtime_factory, sample_payload):
+        """Verifies the reload returns 202 at once and scoring keeps using the current model meanwhile."""
+        import threading
+        release = threading.Event()
+        original_runtime = fastapi_app.state.runtime
+        stack, _ = patch_reload_steps(runtime_factory(version="new_version"), side_effect=lambda *a, **k: release.wait(5))
+
+        with stack, patch.object(type(original_runtime), "close"):
+            try:
+                response = client.post("/reload_model")
+                assert response.status_code == 202
+                assert response.json()["state"] == "running"
+
+                # Téléchargement bloqué : l'API sert toujours l'ancien modèle, un second reload est refusé
+                assert client.post("/individual_score", json=sample_payload).status_code == 200
+                status = client.get("/reload_model/status").json()
+                assert (status["stage"], status["model_version"]) == ("downloading", "test_version")
+                assert client.post("/reload_model").status_code == 409
+
+                release.set()
+                for _ in range(100):
+                    status = client.get("/reload_model/status").json()
+                    if status["state"] != "running":
+                        break
+                    threading.Event().wait(0.05)
+                assert status["state"] == "succeeded"
+                assert status["model_version"] == "new_version"
+            finally:
+                release.set()
+                fastapi_app.state.runtime = original_runtime
 
     def test_reload_model_failure_download(self, client):
-        """Verifies behavior if download fails."""
-        with patch("src.api.routes.download_model_from_hf", side_effect=Exception("HF Down")):
-            response = client.post("/reload_model")
+        """Verifies behavior if download fails: the current model stays in place."""
+        original_runtime = fastapi_app.state.runtime
+        stack, mocks = patch_reload_steps(side_effect=Exception("HF Down"))
+        with stack:
+            response = client.post("/reload_model", params={"wait": True})
             assert response.status_code == 500
             assert "HF Down" in response.json()["detail"]
+            mocks["promote"].assert_not_called()
+        assert fastapi_app.state.runtime is original_runtime
+        status = client.get("/reload_model/status").json()
+        assert (status["state"], status["stage"]) == ("failed", "downloading")
 
     def test_reload_model_failure_load(self, client):
-        """Verifies behavior if load fails (returns None)."""
-        with patch("src.api.routes.download_model_from_hf"), \
-             patch("src.api.routes.load_model_instance", return_value=None):
-            
-            response = client.post("/reload_model")
+        """Verifies behavior if load fails (returns None): the previous model directory is restored."""
+        original_runtime = fastapi_app.state.runtime
+        stack, mocks = patch_reload_steps(None)
+        with stack:
+            response = client.post("/reload_model", params={"wait": True})
             assert response.status_code == 500
             assert "Failed to reload" in response.json()["detail"]
+            mocks["restore"].assert_called_once()
+        assert fastapi_app.state.runtime is original_runtime
 
     # --- Missing File / Warning Logs Scenarios ---
 
@@ -238,14 +510,22 @@ class TestApiRoutes:
 
     def test_model_signature_missing_file_warning(self, client):
         """Covers: ⚠️ Model signature requested but MLmodel file is missing."""
-        with patch("src.api.routes.get_model_signature", return_value={"exists": False}):
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = None
+        try:
             response = client.get("/model_signature")
             assert response.status_code == 404
             assert "Signature file (MLmodel) not found" in response.json()["detail"]
+        finally:
+            fastapi_app.state.runtime = original_runtime
 
     def test_model_info_missing_file_warning(self, client):
         """Covers: ⚠️ Model info requested but MLmodel metadata is missing."""
-        with patch("src.api.routes.get_model_info", return_value={"exists": False}):
+        original_runtime = fastapi_app.state.runtime
+        fastapi_app.state.runtime = replace(original_runtime, info={"exists": False})
+        try:
             response = client.get("/model_info")
             assert response.status_code == 404
-            assert "Model information not found" in response.json()["detail"] 
+            assert "Model information not found" in response.json()["detail"]
+        finally:
+            fastapi_app.state.runtime = original_runtime 
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from src.api.main import app as fastapi_app
+from src.api.schemas import ScoringData
+from src.model.drift_monitor import DriftMonitor
+
+COLUMNS = list(ScoringData.model_fields)
+
+
+def build_matrix(sample_payload, n_rows=3, columns=COLUMNS):
+    row = [float(sample_payload[name]) for name in columns]
+    return np.array([row] * n_rows, dtype="<f4")
+
+
+class TestColumnarScoring:
+
+    def test_raw_float32_round_trip(self, client, sample_payload):
+        """A raw float32 matrix is scored and answered as a (n, 2) float32 matrix."""
+        matrix = build_matrix(sample_payload)
+        response = client.post(
+            "/columnar_score",
+            content=matrix.tobytes(),
+            headers={"Content-Type": "application/octet-stream", "X-Columns": ",".join(COLUMNS)},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["x-columns"] == "score,prediction"
+        result = np.frombuffer(response.content, dtype="<f4").reshape(-1, 2)
+        assert result.shape == (3, 2)
+        assert np.allclose(result[:, 0], 0.42)
+        assert (result[:, 1] == 0).all()
+
+    def test_raw_columns_are_reordered(self, client, sample_payload):
+        """Columns sent in another order than the model signature are realigned."""
+        reversed_columns = COLUMNS[::-1]
+        matrix = build_matrix(sample_payload, columns=reversed_columns)
+        response = client.post(
+            "/columnar_score",
+            content=matrix.tobytes(),
+            headers={"Content-Type": "application/octet-stream", "X-Columns": ",".join(reversed_columns)},
+        )
+        assert response.status_code == 200
+        assert response.headers["x-rows"] == "3"
+
+    def test_rows_are_logged_and_monitored(self, client, sample_payload):
+        """Every scored row is queued on the log writer and observed by the drift monitor, chunk by chunk."""
+        profile = {"nb_rows": 2, "score": {"edges": [0.5], "counts": [1, 1]}, "features": {
+            name: {"edges": [float(value)], "counts": [1, 1]} for name, value in sample_payload.items()
+        }}
+        fastapi_app.state.drift_monitor = DriftMonitor(profile, window_size=10, min_samples=1)
+        before = client.get("/runtime_stats").json()["log_writer"]["enqueued"]
+        try:
+            with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+                response = client.post(
+                    "/columnar_score",
+                    content=build_matrix(sample_payload, n_rows=5).tobytes(),
+                    headers={"Content-Type": "application/octet-stream", "X-Columns": ",".join(COLUMNS)},
+                )
+            assert response.status_code == 200
+            assert client.get("/runtime_stats").json()["log_writer"]["enqueued"] == before + 5
+            [stats] = client.get("/monitoring/drift").json()["versions"].values()
+            assert stats["observed"] == 5
+        finally:
+            fastapi_app.state.drift_monitor = None
+
+    def test_raw_invalid_payloads(self, client, sample_payload):
+        """Missing header, truncated rows, missing columns and NaN are rejected with 400."""
+        matrix = build_matrix(sample_payload)
+        raw = {"Content-Type": "application/octet-stream"}
+
+        assert client.post("/columnar_score", content=matrix.tobytes(), headers=raw).status_code == 400
+        truncated = client.post("/columnar_score", content=matrix.tobytes()[:-2], headers={**raw, "X-Columns": ",".join(COLUMNS)})
+        assert truncated.status_code == 400
+        missing = client.post("/columnar_score", content=matrix[:, 1:].tobytes(), headers={**raw, "X-Columns": ",".join(COLUMNS[1:])})
+        assert "Missing columns" in missing.json()["detail"]
+
+        matrix[0, 0] = np.nan
+        nan = client.post("/columnar_score", content=matrix.tobytes(), headers={**raw, "X-Columns": ",".join(COLUMNS)})
+        assert nan.status_code == 400
+
+    def test_unsupported_content_type(self, client):
+        """JSON is not accepted on the columnar endpoint."""
+        response = client.post("/columnar_score", json=[{"a": 1}])
+        assert response.status_code == 415
+
+    def test_arrow_ipc_round_trip(self, client, sample_payload):
+        """An Arrow IPC stream with one column per feature is answered in Arrow IPC."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc as ipc
+
+        table = pa.table({name: [sample_payload[name]] * 4 for name in COLUMNS})
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        response = client.post(
+            "/columnar_score",
+            content=sink.getvalue().to_pybytes(),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+
+        assert response.status_code == 200
+        result = ipc.open_stream(response.content).read_all()
+        assert result.column_names == ["score", "prediction", "decision"]
+        assert result.num_rows == 4
+        assert result.column("decision").to_pylist() == ["Accordé"] * 4
+
+    def test_arrow_fixed_size_list_features(self, client, sample_payload):
+        """A single FixedSizeList 'features' column is accepted as a row-major matrix."""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc as ipc
+
+        matrix = build_matrix(sample_payload, n_rows=2)
+        features = pa.FixedSizeListArray.from_arrays(pa.array(matrix.ravel()), len(COLUMNS))
+        table = pa.table({"features": features})
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        response = client.post(
+            "/columnar_score",
+            content=sink.getvalue().to_pybytes(),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+        assert response.status_code == 200
+        assert ipc.open_stream(response.content).read_all().num_rows == 2
@@ -0,0 +1,82 @@
+import io
+import pandas as pd
+from unittest.mock import patch
+from src.api.schemas import ScoringData
+
+
+def to_csv_file(records):
+    return {"file": ("clients.csv", pd.DataFrame(records).to_csv(index=False).encode(), "text/csv")}
+
+
+class TestCsvScoring:
+
+    def test_csv_round_trip(self, client, sample_payload):
+        """The uploaded CSV comes back with score, prediction, decision and error columns."""
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        records = [sample_payload, too_old, sample_payload]
+
+        with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+            response = client.post("/csv_score", files=to_csv_file(records))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        result = pd.read_csv(io.StringIO(response.text))
+        assert len(result) == 3
+        assert list(result.columns[-4:]) == ["score", "prediction", "decision", "error"]
+        assert result.loc[0, "score"] == 0.42 and result.loc[2, "decision"] == "Accordé"
+        assert pd.isna(result.loc[1, "score"])
+        assert result.loc[1, "error"] == "YEARS_EMPLOYED:greater_than_age"
+
+    def test_csv_rows_are_logged_and_monitored(self, client, sample_payload):
+        """UI bulk scoring stays audited: every CSV row is logged, scored rows feed the drift monitor."""
+        from src.api.main import app as fastapi_app
+        from src.model.drift_monitor import DriftMonitor
+
+        profile = {"nb_rows": 2, "features": {
+            name: {"edges": [float(value)], "counts": [1, 1]} for name, value in sample_payload.items()
+        }}
+        fastapi_app.state.drift_monitor = DriftMonitor(profile, window_size=10, min_samples=1)
+        before = client.get("/runtime_stats").json()["log_writer"]["enqueued"]
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        try:
+            with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+                response = client.post("/csv_score", files=to_csv_file([sample_payload, too_old, sample_payload]))
+            assert response.status_code == 200
+            assert client.get("/runtime_stats").json()["log_writer"]["enqueued"] == before + 3
+            [stats] = client.get("/monitoring/drift").json()["versions"].values()
+            assert stats["observed"] == 2
+        finally:
+            fastapi_app.state.drift_monitor = None
+
+    def test_csv_missing_column(self, client, sample_payload):
+        """A CSV without a model column is rejected before streaming starts."""
+        record = {k: v for k, v in sample_payload.items() if k != "CODE_GENDER"}
+        response = client.post("/csv_score", files=to_csv_file([record]))
+        assert response.status_code == 400
+        assert "CODE_GENDER" in response.json()["detail"]
+
+    def test_csv_badly_typed_cell_past_first_chunk(self, client, sample_payload):
+        """A non-numeric cell in a later chunk is reported in place, the stream is not truncated."""
+        records = [sample_payload, sample_payload, {**sample_payload, "AMT_ANNUITY": "abc"}, sample_payload]
+
+        with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+            response = client.post("/csv_score", files=to_csv_file(records))
+
+        assert response.status_code == 200
+        result = pd.read_csv(io.StringIO(response.text))
+        assert len(result) == 4
+        assert pd.isna(result.loc[2, "score"])
+        assert result.loc[2, "error"] == "AMT_ANNUITY:invalid_value"
+        assert result.loc[3, "score"] == 0.42
+
+    def test_csv_boolean_strings(self, client, sample_payload):
+        """Boolean strings are read like /multiple_score does, for boolean fields only."""
+        boolean = next(name for name, field in ScoringData.model_fields.items() if field.annotation is bool)
+        numeric = "AMT_ANNUITY"
+        records = [{**sample_payload, boolean: "yes"}, {**sample_payload, numeric: "yes"}]
+
+        response = client.post("/csv_score", files=to_csv_file(records))
+
+        result = pd.read_csv(io.StringIO(response.text))
+        assert result.loc[0, "score"] == 0.42
+        assert result.loc[1, "error"] == f"{numeric}:invalid_value"
@@ -1,5 +1,21 @@
+import asyncio
+import json
 import pytest
-from src.api.database.database import init_db, SessionLocal
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from src.api.database.migrations import add_missing_columns, backfill_typed_columns
+from src.api.database.database import (
+    init_db,
+    SessionLocal,
+    PoolMetrics,
+    bulk_insert_prediction_logs,
+    async_bulk_insert_prediction_logs,
+    write_prediction_logs,
+    copy_records,
+    use_copy,
+    pool_kwargs,
+    to_async_url
+)
 from src.api.database.table_models import PredictionLog
 
 def test_database_insertion():
@@ -38,4 +54,149 @@ def test_database_insertion():
 
     finally:
         # On nettoie la session à la fin
-        db.close()
\ No newline at end of file
+        db.close()
+
+def test_bulk_insertion():
+    """
+    Objectif : Vérifier qu'un lot de logs est inséré en une seule transaction.
+    """
+    init_db()
+    rows = [
+        {"model_version": "v1_bulk", "latency_ms": float(i), "status_code": 200, "inputs": {"feature": i}, "outputs": {"pred": 0}}
+        for i in range(5)
+    ]
+    bulk_insert_prediction_logs(rows)
+
+    db = SessionLocal()
+    try:
+        queried = db.query(PredictionLog).filter(PredictionLog.model_version == "v1_bulk").all()
+        assert len(queried) >= 5
+        assert all(log.timestamp is not None for log in queried)
+    finally:
+        db.close()
+
+
+def test_async_bulk_insertion():
+    """
+    Objectif : Vérifier l'insertion par lot via le moteur asynchrone (aiosqlite)
+    et la mesure de l'attente de connexion du pool.
+    """
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from src.api.database import database
+
+    init_db()
+    async_engine = create_async_engine(to_async_url(str(database.engine.url)))
+    metrics = PoolMetrics(async_engine.sync_engine)
+    rows = [{"model_version": "v1_async", "latency_ms": 1.0, "status_code": 200, "inputs": {}, "outputs": {}}]
+
+    async def scenario():
+        try:
+            await async_bulk_insert_prediction_logs(rows)
+        finally:
+            await async_engine.dispose()
+
+    with patch.object(database, "async_engine", async_engine), patch.object(database, "async_pool_metrics", metrics):
+        asyncio.run(scenario())
+
+    db = SessionLocal()
+    try:
+        assert db.query(PredictionLog).filter(PredictionLog.model_version == "v1_async").count() >= 1
+    finally:
+        db.close()
+    assert metrics.stats()["checkouts"] == 1
+    assert metrics.stats()["timeouts"] == 0
+
+
+def test_database_urls_and_pool_settings():
+    """
+    Objectif : Vérifier la correspondance des drivers asynchrones et les réglages du pool.
+    """
+    assert to_async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert to_async_url("sqlite:///./test_db.db") == "sqlite+aiosqlite:///./test_db.db"
+    assert pool_kwargs("sqlite:///:memory:") == {}
+    assert {"pool_size", "max_overflow", "pool_pre_ping", "pool_recycle"} <= pool_kwargs("postgresql://host/db").keys()
+
+
+def test_copy_records_and_dispatch():
+    """
+    Objectif : Vérifier le format des lignes COPY et le choix COPY / INSERT selon la base.
+    """
+    from datetime import datetime, timezone
+    from src.api.database import database
+
+    row = {
+        "timestamp": datetime(2026, 1, 1, 12, tzinfo=timezone.utc),
+        "model_version": "v1", "latency_ms": 1.5, "status_code": 200,
+        "inputs": {"feature": 1}, "outputs": {"pred": 0},
+    }
+    record = dict(zip(database.COPY_COLUMNS, copy_records([row])[0]))
+    assert record["timestamp"] == datetime(2026, 1, 1, 12)
+    assert (record["inputs"], record["outputs"]) == ('{"feature": 1}', '{"pred": 0}')
+
+    assert use_copy("postgresql") and not use_copy("sqlite")
+    with patch.object(database, "copy_prediction_logs") as mock_copy, \
+         patch.object(database, "bulk_insert_prediction_logs") as mock_insert, \
+         patch.object(database, "use_copy", return_value=True):
+        write_prediction_logs([row])
+    mock_copy.assert_called_once()
+    mock_insert.assert_not_called()
+
+
+def test_typed_log_rows(sample_payload):
+    """
+    Objectif : Vérifier que les logs de l'API sont stockés en colonnes typées
+    (features, score, prédiction) sans blob JSON pour les appels réussis.
+    """
+    init_db()
+    ok = {
+        "model_version": "v1_typed", "latency_ms": 2.0, "status_code": 200, "inputs": sample_payload,
+        "outputs": {"score": 0.42, "prediction": 0, "threshold": 0.5, "decision": "Accordé"},
+    }
+    invalid = {
+        "model_version": "v1_typed", "latency_ms": 0.0, "status_code": 422, "inputs": {"CODE_GENDER": "x"},
+        "outputs": {"error": "Invalid input", "error_codes": ["CODE_GENDER:invalid_value"]},
+    }
+    write_prediction_logs([ok, invalid])
+
+    db = SessionLocal()
+    try:
+        logs = db.query(PredictionLog).filter(PredictionLog.model_version == "v1_typed").order_by(PredictionLog.id).all()
+        scored, rejected = logs[-2:]
+        assert scored.score == pytest.approx(0.42) and scored.prediction == 0
+        assert scored.fe_ext_source_mean == pytest.approx(sample_payload["FE_EXT_SOURCE_MEAN"])
+        assert scored.name_family_status_married is sample_payload["NAME_FAMILY_STATUS_Married"]
+        assert scored.inputs is None and scored.outputs is None
+        assert rejected.error == "Invalid input: CODE_GENDER:invalid_value"
+        assert rejected.code_gender is None and rejected.inputs == {"CODE_GENDER": "x"}
+    finally:
+        db.close()
+
+
+def test_migrate_legacy_table(tmp_path, sample_payload):
+    """
+    Objectif : Vérifier la migration d'une table JSON historique : ajout des
+    colonnes typées puis backfill par lots.
+    """
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE prediction_logs (id INTEGER PRIMARY KEY, timestamp DATETIME, model_version VARCHAR,"
+            " latency_ms FLOAT, inputs JSON, outputs JSON, status_code INTEGER)"
+        ))
+        for i in range(5):
+            conn.execute(
+                text("INSERT INTO prediction_logs (model_version, latency_ms, inputs, outputs, status_code) VALUES ('v0', 1.0, :i, :o, 200)"),
+                {"i": json.dumps(sample_payload), "o": json.dumps({"score": 0.1 * i, "prediction": 0, "threshold": 0.5})}
+            )
+
+    added = add_missing_columns(legacy_engine)
+    assert "score" in added and "fe_ext_source_mean" in added
+    assert add_missing_columns(legacy_engine) == []
+
+    assert backfill_typed_columns(legacy_engine, batch_size=2, drop_json=True) == 5
+    with legacy_engine.connect() as conn:
+        rows = conn.execute(text("SELECT score, years_birth, outputs FROM prediction_logs ORDER BY id")).all()
+    assert [round(row[0], 2) for row in rows] == [0.0, 0.1, 0.2, 0.3, 0.4]
+    assert rows[0][1] == sample_payload["YEARS_BIRTH"] and rows[0][2] is None
+    assert backfill_typed_columns(legacy_engine) == 0
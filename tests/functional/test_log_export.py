@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.api.database.database import init_db, write_prediction_logs, bulk_insert_prediction_logs
+from src.api.database.export import export_prediction_logs, read_watermark
+from src.api.database.database import engine
+
+WINDOW = {"start": datetime(2025, 6, 1), "end": datetime(2025, 6, 2)}
+
+
+def entries(version, sample_payload, nb_rows, score=0.42):
+    return [{
+        "timestamp": datetime(2025, 6, 1, 8, i), "model_version": version, "latency_ms": 1.0,
+        "status_code": 200, "inputs": sample_payload,
+        "outputs": {"score": score, "prediction": 0, "threshold": 0.5}
+    } for i in range(nb_rows)]
+
+
+class TestLogExport:
+
+    def test_incremental_export(self, tmp_path, sample_payload):
+        """Row groups of batch_rows rows, typed feature columns, and a watermark-based second run."""
+        init_db()
+        version = f"export_{uuid.uuid4().hex[:8]}"
+        write_prediction_logs(entries(version, sample_payload, 5))
+
+        first = export_prediction_logs(engine, tmp_path, batch_rows=2, safety_lag_s=0, **WINDOW)
+        metadata = pq.ParquetFile(first["file"]).metadata
+        assert all(metadata.row_group(i).num_rows <= 2 for i in range(metadata.num_row_groups))
+        df = pd.read_parquet(first["file"])
+        df = df[df["model_version"] == version]
+        assert len(df) == 5
+        assert df["FE_EXT_SOURCE_MEAN"].dtype == "float32" and df["NAME_FAMILY_STATUS_Married"].dtype == bool
+        assert round(float(df["score"].iloc[0]), 2) == 0.42
+        assert "inputs" not in df.columns
+        assert read_watermark(tmp_path)["last_id"] == first["last_id"]
+
+        write_prediction_logs(entries(version, sample_payload, 3, score=0.9))
+        second = export_prediction_logs(engine, tmp_path, batch_rows=2, safety_lag_s=0, **WINDOW)
+        assert second["rows"] == 3
+        assert set(pd.read_parquet(second["file"])["score"].astype(float).round(2)) == {0.9}
+        assert export_prediction_logs(engine, tmp_path, safety_lag_s=0, **WINDOW)["file"] is None
+
+    def test_incremental_export_stops_at_launch_horizon(self, tmp_path, sample_payload):
+        """Rows committed during the safety lag are left for the next run, never skipped."""
+        init_db()
+        version = f"horizon_{uuid.uuid4().hex[:8]}"
+        write_prediction_logs(entries(version, sample_payload, 2))
+
+        late_rows = lambda _: write_prediction_logs(entries(version, sample_payload, 3, score=0.9))
+        with patch("src.api.database.export.time.sleep", side_effect=late_rows) as sleep:
+            first = export_prediction_logs(engine, tmp_path, safety_lag_s=5, **WINDOW)
+        sleep.assert_called_once_with(5)
+        df = pd.read_parquet(first["file"])
+        assert set(df[df["model_version"] == version]["score"].astype(float).round(2)) == {0.42}
+
+        second = export_prediction_logs(engine, tmp_path, safety_lag_s=0, **WINDOW)
+        assert second["rows"] == 3
+        assert set(pd.read_parquet(second["file"])["score"].astype(float).round(2)) == {0.9}
+
+    def test_legacy_json_rows_are_flattened(self, tmp_path, sample_payload):
+        """Rows written before the typed schema are exported with typed columns."""
+        init_db()
+        version = f"legacy_{uuid.uuid4().hex[:8]}"
+        bulk_insert_prediction_logs(entries(version, sample_payload, 1, score=0.3))
+
+        summary = export_prediction_logs(engine, tmp_path, incremental=False, **WINDOW)
+        df = pd.read_parquet(summary["file"])
+        row = df[df["model_version"] == version].iloc[0]
+        assert round(float(row["score"]), 2) == 0.3
+        assert row["YEARS_BIRTH"] == sample_payload["YEARS_BIRTH"]
+        assert read_watermark(tmp_path) is None
@@ -0,0 +1,46 @@
+from src.api.metrics import ERRORS, IN_FLIGHT, REQUESTS, STAGE_LATENCY
+
+
+class TestMetricsEndpoint:
+
+    def test_individual_score_stages(self, client, sample_payload):
+        """One scoring call records its status and every stage of its latency."""
+        labels = ("/individual_score", "test_version")
+        before = {stage: STAGE_LATENCY.count((*labels, stage)) for stage in
+                  ("parse", "validation", "features", "inference", "serialization", "log_enqueue")}
+        requests_before = REQUESTS.value((*labels, "200"))
+
+        assert client.post("/individual_score", json=sample_payload).status_code == 200
+
+        assert REQUESTS.value((*labels, "200")) == requests_before + 1
+        for stage, count in before.items():
+            assert STAGE_LATENCY.count((*labels, stage)) == count + 1, stage
+        assert IN_FLIGHT.value(("/individual_score",)) == 0
+
+    def test_validation_errors_are_counted(self, client, sample_payload):
+        labels = ("/individual_score", "test_version", "422")
+        errors_before = ERRORS.value(labels)
+
+        assert client.post("/individual_score", json={**sample_payload, "CODE_GENDER": 5}).status_code == 422
+
+        assert ERRORS.value(labels) == errors_before + 1
+
+    def test_multiple_score_stages(self, client, sample_payload):
+        labels = ("/multiple_score", "test_version", "inference")
+        count_before = STAGE_LATENCY.count(labels)
+
+        assert client.post("/multiple_score", json=[sample_payload, sample_payload]).status_code == 200
+
+        assert STAGE_LATENCY.count(labels) == count_before + 1
+
+    def test_exposition_format(self, client, sample_payload):
+        client.post("/individual_score", json=sample_payload)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert "# TYPE api_stage_duration_seconds histogram" in text
+        assert 'api_stage_duration_seconds_bucket{endpoint="/individual_score",model_version="test_version",stage="inference",le="+Inf"}' in text
+        assert 'api_requests_in_flight{endpoint="/metrics"} 1' in text
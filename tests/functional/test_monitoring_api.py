@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.api.database.database import init_db, write_prediction_logs
+
+
+def log(version, hour, latency_ms, status_code=200, prediction=0):
+    outputs = {"score": 0.7 if prediction else 0.2, "prediction": prediction, "threshold": 0.5}
+    if status_code != 200:
+        outputs = {"error": "Invalid input", "error_codes": []}
+    return {
+        "timestamp": datetime(2026, 1, 1, hour, 30), "model_version": version,
+        "latency_ms": latency_ms, "status_code": status_code, "inputs": {}, "outputs": outputs
+    }
+
+
+@pytest.fixture
+def logged_version():
+    """Writes hour 10: 8 scored calls (latency 1..8, 2 refused) and 2 rejected calls; hour 11: one call."""
+    init_db()
+    version = f"monitoring_{uuid.uuid4().hex[:8]}"
+    rows = [log(version, 10, float(ms), prediction=int(ms > 6)) for ms in range(1, 9)]
+    rows += [log(version, 10, 0.5, status_code=422) for _ in range(2)]
+    rows.append(log(version, 11, 2.0))
+    write_prediction_logs(rows)
+    return version
+
+
+class TestMonitoringSummary:
+
+    def test_hourly_series(self, client, logged_version):
+        """Counts, rates and latency percentiles are aggregated per hour in SQL."""
+        response = client.get("/monitoring/summary", params={
+            "bucket": "hour", "start": "2026-01-01T00:00:00", "end": "2026-01-02T00:00:00",
+            "model_version": logged_version
+        })
+
+        assert response.status_code == 200
+        first, second = response.json()["series"]
+        assert first["bucket"].startswith("2026-01-01T10:00")
+        assert (first["requests"], first["errors"], first["error_rate"]) == (10, 2, 0.2)
+        assert first["approval_rate"] == 0.75
+        assert first["latency_ms"] == {"mean": 3.7, "p50": 3.0, "p95": 8.0, "p99": 8.0, "max": 8.0}
+        assert second["requests"] == 1 and second["latency_ms"]["p50"] == 2.0
+
+    def test_whole_window(self, client, logged_version):
+        """bucket=all returns one row per model version; rows outside the window are ignored."""
+        params = {"bucket": "all", "start": "2026-01-01T10:00:00Z", "end": "2026-01-01T11:00:00Z",
+                  "model_version": logged_version}
+        [summary] = client.get("/monitoring/summary", params=params).json()["series"]
+        assert summary["bucket"] == "all" and summary["requests"] == 10
+
+    def test_invalid_parameters(self, client):
+        assert client.get("/monitoring/summary", params={"bucket": "week"}).status_code == 422
+        params = {"start": "2026-01-02T00:00:00", "end": "2026-01-01T00:00:00"}
+        assert client.get("/monitoring/summary", params=params).status_code == 422
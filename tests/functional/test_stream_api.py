@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+
+def to_ndjson(records):
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+class TestStreamScoring:
+
+    def test_stream_round_trip(self, client, sample_payload):
+        """Each NDJSON input line gets one NDJSON result line, in input order."""
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        body = to_ndjson([sample_payload, too_old]) + b"not json\n" + to_ndjson([sample_payload])
+
+        with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+            response = client.post("/stream_score", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["row"] for r in results] == [0, 1, 2, 3]
+        assert results[0]["score"] == 0.42 and results[3]["decision"] == "Accordé"
+        assert results[1]["error_codes"] == ["YEARS_EMPLOYED:greater_than_age"]
+        assert results[2]["error"] == "Invalid JSON"
+
+    def test_stream_rows_are_logged_and_monitored(self, client, sample_payload):
+        """Valid and invalid rows are all logged; only scored rows feed the drift monitor."""
+        from src.api.main import app as fastapi_app
+        from src.model.drift_monitor import DriftMonitor
+
+        profile = {"nb_rows": 2, "features": {
+            name: {"edges": [float(value)], "counts": [1, 1]} for name, value in sample_payload.items()
+        }}
+        fastapi_app.state.drift_monitor = DriftMonitor(profile, window_size=10, min_samples=1)
+        before = client.get("/runtime_stats").json()["log_writer"]["enqueued"]
+        too_old = {**sample_payload, "YEARS_EMPLOYED": sample_payload["YEARS_BIRTH"] + 1}
+        try:
+            with patch("src.api.routes.BATCH_CHUNK_SIZE", 2):
+                client.post("/stream_score", content=to_ndjson([sample_payload, too_old, sample_payload]))
+            assert client.get("/runtime_stats").json()["log_writer"]["enqueued"] == before + 3
+            [stats] = client.get("/monitoring/drift").json()["versions"].values()
+            assert stats["observed"] == 2
+        finally:
+            fastapi_app.state.drift_monitor = None
+
+    def test_stream_inference_error_is_reported_in_stream(self, client, sample_payload):
+        """Once streaming has started, an inference error is sent as a final error line."""
+        with patch("src.api.routes.get_matrix_prediction", return_value={"error": "Value too high"}):
+            response = client.post("/stream_score", content=to_ndjson([sample_payload]))
+
+        last = json.loads(response.text.splitlines()[-1])
+        assert "Value too high" in last["error"]
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.model.batcher import MicroBatcher
+
+
+class CountingModel:
+    """Mimics onnxruntime.InferenceSession and records the size of every batch."""
+    class MockNodeArg:
+        name = "float_input"
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def get_inputs(self):
+        return [self.MockNodeArg()]
+
+    def run(self, output_names, input_feed):
+        n_rows = len(next(iter(input_feed.values())))
+        self.batch_sizes.append(n_rows)
+        return [None, [[0.58, 0.42]] * n_rows]
+
+
+@pytest.fixture
+def counting_runtime(runtime_factory):
+    """Factory of runtimes whose session records its batch sizes."""
+    return lambda model=None: runtime_factory(model or CountingModel())
+
+
+class TestMicroBatcher:
+
+    def test_concurrent_requests_share_one_run(self, sample_payload, counting_runtime):
+        """Requests arriving in the same window are scored with a single ONNX call."""
+        model = CountingModel()
+        runtime = counting_runtime(model)
+
+        async def scenario():
+            batcher = MicroBatcher(window_ms=50, max_batch_size=64, max_queue_size=100)
+            await batcher.start()
+            results = await asyncio.gather(*(batcher.submit(runtime, sample_payload) for _ in range(5)))
+            await batcher.stop()
+            return results, batcher.stats()
+
+        results, stats = asyncio.run(scenario())
+
+        assert model.batch_sizes == [5]
+        assert [r["score"] for r in results] == [0.42] * 5
+        assert stats["batches"] == 1
+        assert stats["requests"] == 5
+        assert stats["mean_batch_size"] == 5.0
+
+    def test_max_batch_size_is_respected(self, sample_payload, counting_runtime):
+        """A batch never exceeds max_batch_size rows."""
+        model = CountingModel()
+        runtime = counting_runtime(model)
+
+        async def scenario():
+            batcher = MicroBatcher(window_ms=50, max_batch_size=2, max_queue_size=100)
+            await batcher.start()
+            await asyncio.gather(*(batcher.submit(runtime, sample_payload) for _ in range(5)))
+            await batcher.stop()
+
+        asyncio.run(scenario())
+        assert max(model.batch_sizes) <= 2
+        assert sum(model.batch_sizes) == 5
+
+    def test_queue_full_is_rejected(self, sample_payload, counting_runtime):
+        """When the queue is saturated, submit raises QueueFull instead of waiting."""
+        async def scenario():
+            # Collecteur non démarré : la file ne se vide jamais
+            batcher = MicroBatcher(window_ms=1, max_batch_size=4, max_queue_size=1)
+            first = asyncio.ensure_future(batcher.submit(counting_runtime(), sample_payload))
+            await asyncio.sleep(0)
+            with pytest.raises(asyncio.QueueFull):
+                await batcher.submit(counting_runtime(), sample_payload)
+            await batcher.stop()
+            return await first, batcher.stats()
+
+        result, stats = asyncio.run(scenario())
+        assert result["score"] == 0.42
+        assert stats["rejected"] == 1
+
+    def test_inference_error_propagates_to_callers(self, sample_payload, counting_runtime):
+        """An inference error is returned to every caller of the batch."""
+        async def scenario():
+            batcher = MicroBatcher(window_ms=10, max_batch_size=8, max_queue_size=10)
+            await batcher.start()
+            results = await asyncio.gather(*(batcher.submit(None, sample_payload) for _ in range(2)))
+            await batcher.stop()
+            return results
+
+        results = asyncio.run(scenario())
+        assert all("error" in r for r in results)
+
+    def test_batches_run_on_executor(self, sample_payload, counting_runtime):
+        """Inference of a batch runs on the provided executor, not on the event loop."""
+        threads = []
+
+        class ThreadRecordingModel(CountingModel):
+            def run(self, output_names, input_feed):
+                threads.append(threading.current_thread().name)
+                return super().run(output_names, input_feed)
+
+        runtime = counting_runtime(ThreadRecordingModel())
+
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="onnx-inference") as executor:
+                batcher = MicroBatcher(window_ms=10, max_batch_size=8, max_queue_size=10, executor=executor, max_inflight=1)
+                await batcher.start()
+                await asyncio.gather(*(batcher.submit(runtime, sample_payload) for _ in range(3)))
+                await batcher.stop()
+
+        asyncio.run(scenario())
+        assert threads and all(name.startswith("onnx-inference") for name in threads)
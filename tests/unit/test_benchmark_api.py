@@ -0,0 +1,45 @@
+from scripts.benchmark_api import compare_to_baseline, generate_rows
+from src.api.schemas import ScoringData
+from src.api.validation import get_batch_validator, records_to_matrix
+
+
+def scenario(name="multiple_score/batch=100/concurrency=1", rows_s=10000.0, p99=10.0, rss=300.0, errors=0):
+    return {"name": name, "errors": errors, "throughput_rows_s": rows_s, "rss_mb": rss,
+            "latency_ms": {"p50": 2.0, "p95": 5.0, "p99": p99}}
+
+
+def test_synthetic_rows_are_valid():
+    """Benchmark rows pass both the Pydantic schema and the vectorized batch validation."""
+    rows = generate_rows(500, seed=1)
+    columns = tuple(ScoringData.model_fields)
+
+    for row in rows[:50]:
+        ScoringData(**row)
+    assert get_batch_validator(columns).validate(records_to_matrix(rows, columns)).nb_invalid == 0
+    assert generate_rows(500, seed=1) == rows
+
+
+def test_compare_to_baseline():
+    baseline = {"scenarios": [scenario()]}
+    thresholds = {"max_throughput_drop": 0.1, "max_latency_increase": 0.2, "max_rss_increase": 0.25}
+
+    assert compare_to_baseline([scenario(rows_s=9500, p99=11.5)], baseline, **thresholds) == []
+    regressions = compare_to_baseline([scenario(rows_s=8000, p99=13.0, rss=400)], baseline, **thresholds)
+    assert [r.split(": ")[1].split()[0] for r in regressions] == ["throughput", "p99", "RSS"]
+    # Un scénario absent de la baseline n'est pas comparé, mais les erreurs font toujours échouer
+    assert compare_to_baseline([scenario(name="new", errors=2)], baseline, **thresholds) == ["new: 2 failed request(s)"]
+
+
+def test_benchmark_model_outputs_probability_tensor(tmp_path):
+    """The generated model answers (n, 2) probabilities like the production model, not a ZipMap."""
+    import pytest
+    pytest.importorskip("catboost")
+    pytest.importorskip("onnx")
+    from scripts.benchmark_api import build_benchmark_model, build_benchmark_runtime
+    from src.model.model_service import get_batch_prediction
+
+    runtime = build_benchmark_runtime(build_benchmark_model(tmp_path / "model.onnx", nb_rows=200))
+    batch = get_batch_prediction(runtime, generate_rows(3))
+
+    assert len(batch["results"]) == 3
+    assert all(0 <= result["score"] <= 1 for result in batch["results"])
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from src.api.columnar import decode_raw_matrix
+
+
+class TestColumnarDecoding:
+
+    def test_raw_matrix_in_model_order_is_zero_copy(self):
+        """The decoded matrix is a view on the request buffer when columns are in model order."""
+        body = np.arange(6, dtype="<f4").tobytes()
+        matrix = decode_raw_matrix(body, "A,B,C", ("A", "B", "C"))
+
+        assert matrix.shape == (2, 3)
+        assert np.shares_memory(matrix, np.frombuffer(body, dtype="<f4"))
+
+    def test_raw_matrix_reordered_to_model_order(self):
+        """Columns are realigned on the model order when the header differs."""
+        body = np.array([[1, 2], [3, 4]], dtype="<f4").tobytes()
+        matrix = decode_raw_matrix(body, "B, A", ("A", "B"))
+
+        assert matrix.tolist() == [[2, 1], [4, 3]]
+        assert matrix.flags["C_CONTIGUOUS"]
+
+    def test_raw_matrix_missing_column(self):
+        with pytest.raises(ValueError, match="Missing columns: C"):
+            decode_raw_matrix(np.zeros(2, dtype="<f4").tobytes(), "A,B", ("A", "B", "C"))
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import json
+import logging
+
+from src.model.drift_monitor import DriftMonitor
+from src.model.reference_profile import (
+    bin_edges,
+    build_reference_profile,
+    reference_frame,
+    save_reference_profile,
+    load_reference_profile
+)
+
+rng = np.random.default_rng(0)
+
+
+def training_frame(nb_rows=5000):
+    return pd.DataFrame({
+        "AMT_ANNUITY": rng.normal(25_000, 5_000, nb_rows),
+        "NAME_FAMILY_STATUS_Married": rng.random(nb_rows) < 0.6,
+    })
+
+
+def build_monitor(window_size=1000, min_samples=200):
+    profile = build_reference_profile(training_frame(), ["AMT_ANNUITY", "NAME_FAMILY_STATUS_Married"], nb_bins=10)
+    return DriftMonitor(profile, window_size=window_size, min_samples=min_samples)
+
+
+class TestReferenceProfile:
+
+    def test_bin_edges(self):
+        """Discrete features get one bin per value, continuous ones quantile bins."""
+        assert bin_edges(np.array([0.0, 1.0, 1.0]), 10).tolist() == [0.5]
+        edges = bin_edges(rng.normal(size=10_000), 10)
+        assert len(edges) == 9 and np.all(np.diff(edges) > 0)
+
+    def test_profile_counts(self):
+        profile = build_reference_profile(training_frame(1000), ["AMT_ANNUITY", "NAME_FAMILY_STATUS_Married"])
+        annuity = profile["features"]["AMT_ANNUITY"]
+        assert sum(annuity["counts"]) == 1000 and len(annuity["counts"]) == len(annuity["edges"]) + 1
+        assert len(profile["features"]["NAME_FAMILY_STATUS_Married"]["counts"]) == 2
+
+
+    def test_moments_scores_and_versioning(self, tmp_path, caplog):
+        """The artifact holds moments, quantiles, the score distribution and the model version."""
+        df = training_frame(1000)
+        scores = rng.beta(2, 5, 1000)
+        profile = build_reference_profile(df, ["AMT_ANNUITY", "NAME_FAMILY_STATUS_Married"], scores=scores, model_version="m-1")
+
+        annuity = profile["features"]["AMT_ANNUITY"]
+        assert annuity["mean"] == pytest.approx(df["AMT_ANNUITY"].mean())
+        assert annuity["quantiles"]["0.5"] == pytest.approx(df["AMT_ANNUITY"].median())
+        assert profile["features"]["NAME_FAMILY_STATUS_Married"]["values"] == [0.0, 1.0]
+        assert sum(profile["score"]["counts"]) == 1000
+
+        path = tmp_path / "reference_profile.json"
+        save_reference_profile(profile, path)
+        with caplog.at_level(logging.WARNING):
+            assert load_reference_profile(path, model_version="m-2")["model_version"] == "m-1"
+        assert "m-1" in caplog.text
+
+        path.write_text(json.dumps({**profile, "format_version": 99}))
+        assert load_reference_profile(path) is None
+        assert load_reference_profile(tmp_path / "missing.json") is None
+
+    def test_reference_frame_matches_profile(self):
+        """A sample drawn from the profile is not seen as drift against it."""
+        profile = build_reference_profile(training_frame(), ["AMT_ANNUITY", "NAME_FAMILY_STATUS_Married"])
+        sample = reference_frame(profile, nb_rows=2000)
+        assert set(sample["NAME_FAMILY_STATUS_Married"]) == {0.0, 1.0}
+
+        monitor = DriftMonitor(profile, window_size=2000)
+        monitor.observe_matrix("v1", sample.to_numpy(dtype=float))
+        features = monitor.stats()["versions"]["v1"]["features"]
+        assert all(feature["status"] == "stable" for feature in features.values())
+
+
+class TestDriftMonitor:
+
+    def test_same_distribution_is_stable(self):
+        monitor = build_monitor()
+        monitor.observe_matrix("v1", training_frame(1000).to_numpy(dtype=float))
+
+        features = monitor.stats("v1")["versions"]["v1"]["features"]
+        assert features["AMT_ANNUITY"]["status"] == "stable"
+        assert features["AMT_ANNUITY"]["psi"] < 0.1
+        assert features["NAME_FAMILY_STATUS_Married"]["samples"] == 1000
+
+    def test_shift_is_detected_per_version(self):
+        monitor = build_monitor()
+        shifted = training_frame(1000)
+        shifted["AMT_ANNUITY"] += 10_000
+        monitor.observe_matrix("v1", training_frame(1000).to_numpy(dtype=float))
+        monitor.observe_matrix("v2", shifted.to_numpy(dtype=float))
+
+        versions = monitor.stats()["versions"]
+        assert versions["v1"]["features"]["AMT_ANNUITY"]["status"] == "stable"
+        assert versions["v2"]["features"]["AMT_ANNUITY"]["status"] == "drift"
+        assert versions["v2"]["features"]["AMT_ANNUITY"]["ks"] > 0.5
+        assert versions["v2"]["features"]["NAME_FAMILY_STATUS_Married"]["status"] == "stable"
+
+    def test_observe_columns_realigns_features(self):
+        """A bulk matrix in the model column order is mapped onto the monitored features."""
+        monitor = build_monitor(min_samples=1)
+        frame = training_frame(500)
+        matrix = np.column_stack([np.zeros(500), frame["NAME_FAMILY_STATUS_Married"], frame["AMT_ANNUITY"]])
+        monitor.observe_columns("v1", ["OTHER", "NAME_FAMILY_STATUS_Married", "AMT_ANNUITY"], matrix)
+
+        features = monitor.stats("v1")["versions"]["v1"]["features"]
+        assert features["AMT_ANNUITY"]["status"] == "stable"
+        assert features["NAME_FAMILY_STATUS_Married"]["samples"] == 500
+
+    def test_sliding_window_evicts_oldest(self):
+        """Only the last window_size observations count: the histogram follows the recent traffic."""
+        monitor = build_monitor(window_size=500)
+        shifted = training_frame(500)
+        shifted["AMT_ANNUITY"] += 10_000
+        monitor.observe_matrix("v1", shifted.to_numpy(dtype=float))
+        for row in training_frame(500).to_dict("records"):
+            monitor.observe("v1", row)
+
+        stats = monitor.stats("v1")["versions"]["v1"]
+        assert stats["observed"] == 1000 and stats["window"] == 500
+        assert stats["features"]["AMT_ANNUITY"]["status"] == "stable"
+
+    def test_missing_values_and_min_samples(self):
+        monitor = build_monitor(min_samples=10)
+        for _ in range(5):
+            monitor.observe("v1", {"AMT_ANNUITY": None, "NAME_FAMILY_STATUS_Married": True})
+
+        features = monitor.stats("v1")["versions"]["v1"]["features"]
+        assert features["AMT_ANNUITY"]["missing_rate"] == 1.0 and features["AMT_ANNUITY"]["samples"] == 0
+        assert features["NAME_FAMILY_STATUS_Married"]["status"] == "insufficient_data"
+
+    def test_score_distribution(self):
+        """The score is monitored next to the features when the profile has a score histogram."""
+        profile = build_reference_profile(training_frame(), ["AMT_ANNUITY"], scores=rng.beta(2, 5, 5000))
+        monitor = DriftMonitor(profile, min_samples=10)
+        for _ in range(20):
+            monitor.observe("v1", {"AMT_ANNUITY": 25_000.0, "score": 0.99})
+
+        stats = monitor.stats("v1")["versions"]["v1"]
+        assert list(stats["features"]) == ["AMT_ANNUITY"]
+        assert stats["score"]["status"] == "drift"
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from scripts.load_test import Drift, arrival_offsets, build_payloads, load_records, run_load
+
+
+class SlowClient:
+    """Fake HTTP client serving one request at a time in `service_s` seconds."""
+
+    def __init__(self, service_s: float):
+        self.service_s = service_s
+        self._lock = asyncio.Lock()
+
+    async def post(self, endpoint, content, headers):
+        async with self._lock:
+            await asyncio.sleep(self.service_s)
+        return type("Response", (), {"status_code": 200})()
+
+
+def test_arrival_offsets():
+    assert np.allclose(arrival_offsets(10, 4, "constant"), [0.0, 0.1, 0.2, 0.3])
+    poisson = arrival_offsets(100, 20000, "poisson", seed=1)
+    assert poisson[0] == 0.0 and np.all(np.diff(poisson) >= 0)
+    assert np.diff(poisson).mean() == pytest.approx(0.01, rel=0.05)
+    with pytest.raises(ValueError):
+        arrival_offsets(10, 4, "burst")
+
+
+def test_drift_injection():
+    records = [{"AMT_ANNUITY": 100.0, "CODE_GENDER": 0}]
+    drift = Drift.parse("AMT_ANNUITY*2")
+    assert drift.apply(records[0]) == {"AMT_ANNUITY": 200.0, "CODE_GENDER": 0}
+    assert Drift.parse("CODE_GENDER=1").apply(records[0])["CODE_GENDER"] == 1.0
+    with pytest.raises(ValueError, match="Invalid drift"):
+        Drift.parse("AMT_ANNUITY**2")
+
+    # La dérive ne commence qu'après drift_start_s
+    offsets = np.arange(4) * 1.0
+    bodies, nb_drifted = build_payloads(records, 4, offsets, drifts=[drift], drift_start_s=2.0)
+    assert nb_drifted == 2
+    assert [json.loads(body)["AMT_ANNUITY"] for body in bodies] == [100.0, 100.0, 200.0, 200.0]
+
+
+def test_load_jsonl_records(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    path.write_text('{"AMT_ANNUITY": 1.0}\n\n{"inputs": {"AMT_ANNUITY": 2.0}, "status_code": 200}\n')
+    assert load_records("jsonl", path) == [{"AMT_ANNUITY": 1.0}, {"AMT_ANNUITY": 2.0}]
+
+
+def test_latency_is_corrected_for_coordinated_omission():
+    """A server slower than the arrival rate: the wait behind earlier requests counts in the latency."""
+    offsets = arrival_offsets(100, 10, "constant")
+    report = asyncio.run(run_load(SlowClient(0.03), "/individual_score", [b"{}"] * 10, offsets))
+
+    assert report["statuses"] == {"200": 10}
+    # Les requêtes s'accumulent côté serveur : la dernière attend ~10 x 30 ms moins 90 ms de décalage planifié
+    assert report["latency_ms"]["max"] > 150
+    assert report["latency_ms"]["p50"] > 2 * 30
@@ -0,0 +1,246 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.api.database.log_writer import PredictionLogWriter
+from src.api.database.spill_buffer import SpillBuffer
+
+
+class RecordingSink:
+    """Stands in for the database: records each flushed batch."""
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("database is down")
+        self.batches.append(list(rows))
+
+
+def entry(i):
+    return {"model_version": "test", "latency_ms": 1.0, "status_code": 200, "inputs": {"i": i}, "outputs": {}}
+
+
+class TestPredictionLogWriter:
+
+    def test_flushes_full_batches(self):
+        """Rows are written in batches of flush_rows without waiting for the interval."""
+        sink = RecordingSink()
+
+        async def scenario():
+            writer = PredictionLogWriter(flush_rows=3, flush_interval_ms=10_000, max_queue_size=100, write_rows=sink)
+            await writer.start()
+            for i in range(6):
+                await writer.put(entry(i))
+            await asyncio.sleep(0.05)
+            written = writer.nb_written
+            await writer.stop()
+            return written
+
+        assert asyncio.run(scenario()) == 6
+        assert [len(batch) for batch in sink.batches] == [3, 3]
+        assert "timestamp" in sink.batches[0][0]
+
+    def test_flushes_on_interval_and_drains_on_stop(self):
+        """A partial batch is written after the interval; stop() writes what is left."""
+        sink = RecordingSink()
+
+        async def scenario():
+            writer = PredictionLogWriter(flush_rows=100, flush_interval_ms=20, max_queue_size=100, write_rows=sink)
+            await writer.start()
+            await writer.put(entry(0))
+            await asyncio.sleep(0.1)
+            after_interval = writer.nb_written
+            await writer.put(entry(1))
+            await writer.stop()
+            return after_interval, writer.nb_written
+
+        assert asyncio.run(scenario()) == (1, 2)
+
+    @pytest.mark.parametrize("policy,kept", [("drop_newest", [0, 1]), ("drop_oldest", [2, 3]), ("block", [0, 1])])
+    def test_full_queue_policies(self, policy, kept):
+        """When the queue is full, rows are dropped according to the policy."""
+        sink = RecordingSink()
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=100, flush_interval_ms=10_000, max_queue_size=2,
+                policy=policy, block_timeout_ms=10, write_rows=sink
+            )
+            await writer.start()
+            for i in range(4):
+                await writer.put(entry(i))
+            stats = writer.stats()
+            await writer.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats["dropped"] == 2
+        assert stats["queue_depth"] == 2
+        assert [row["inputs"]["i"] for row in sink.batches[0]] == kept
+
+    def test_write_failure_is_counted(self):
+        """A failing flush loses its rows but does not stop the writer."""
+        async def scenario():
+            writer = PredictionLogWriter(flush_rows=1, flush_interval_ms=10, write_rows=RecordingSink(fail=True))
+            await writer.start()
+            await writer.put(entry(0))
+            await writer.stop()
+            return writer.stats()
+
+        assert asyncio.run(scenario())["failed"] == 1
+
+    def test_spills_failed_flushes_and_replays(self, tmp_path):
+        """While the database is down rows go to disk; they are written back once it recovers."""
+        sink = RecordingSink(fail=True)
+        spill = SpillBuffer(tmp_path, fsync=False)
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=2, flush_interval_ms=10, write_rows=sink, spill=spill, replay_interval_s=0.02
+            )
+            await writer.start()
+            for i in range(4):
+                await writer.put(entry(i))
+            await asyncio.sleep(0.05)
+            during_outage = writer.stats()
+
+            sink.fail = False
+            await asyncio.sleep(0.1)
+            await writer.stop()
+            return during_outage, writer.stats()
+
+        during_outage, after = asyncio.run(scenario())
+        assert during_outage["spilled"] == 4 and during_outage["failed"] == 0
+        assert after["written"] == 4 and after["spill"]["pending_segments"] == 0
+        assert sorted(row["inputs"]["i"] for batch in sink.batches for row in batch) == [0, 1, 2, 3]
+
+    def test_full_queue_spills_instead_of_dropping(self, tmp_path):
+        """With a spill buffer, rows refused by a full queue are kept on disk."""
+        spill = SpillBuffer(tmp_path, fsync=False)
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=100, flush_interval_ms=10_000, max_queue_size=2,
+                policy="drop_newest", write_rows=RecordingSink(), spill=spill, replay_interval_s=60
+            )
+            await writer.start()
+            for i in range(4):
+                await writer.put(entry(i))
+            await writer.stop()
+            return writer.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["dropped"] == 0 and stats["spilled"] == 2
+        [segment] = spill.sealed_segments()
+        assert [row["inputs"]["i"] for row in spill.read_segment(segment)] == [2, 3]
+
+    def test_full_queue_spills_in_batches(self, tmp_path):
+        """Rows refused by a full queue are spilled together, not with one disk write each."""
+        spill = SpillBuffer(tmp_path, fsync=False)
+        appends = []
+        append = spill.append
+        spill.append = lambda rows: (appends.append(len(rows)), append(rows))
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=100, flush_interval_ms=10_000, max_queue_size=1,
+                write_rows=RecordingSink(), spill=spill, replay_interval_s=60
+            )
+            await writer.start()
+            accepted = [await writer.put(entry(i)) for i in range(5)]
+            await writer.stop()
+            return accepted, writer.stats()
+
+        accepted, stats = asyncio.run(scenario())
+        assert accepted == [True, False, False, False, False]
+        assert appends == [4] and stats["spilled"] == 4
+
+    def test_drop_oldest_under_concurrent_puts(self):
+        """Concurrent puts on a full queue never surface QueueFull to the caller."""
+        sink = RecordingSink()
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=100, flush_interval_ms=10_000, max_queue_size=2, policy="drop_oldest", write_rows=sink
+            )
+            await writer.start()
+            results = await asyncio.gather(*(writer.put(entry(i)) for i in range(10)), return_exceptions=True)
+            stats = writer.stats()
+            await writer.stop()
+            return results, stats
+
+        results, stats = asyncio.run(scenario())
+        assert results == [True] * 10
+        assert stats["dropped"] == 8 and stats["queue_depth"] == 2
+
+    def test_full_queue_spills_without_blocking(self, tmp_path):
+        """With a spill buffer, the "block" policy does not make the caller wait for the database."""
+        spill = SpillBuffer(tmp_path, fsync=False)
+
+        async def scenario():
+            writer = PredictionLogWriter(
+                flush_rows=100, flush_interval_ms=10_000, max_queue_size=1, policy="block",
+                block_timeout_ms=10_000, write_rows=RecordingSink(), spill=spill, replay_interval_s=60
+            )
+            await writer.start()
+            await writer.put(entry(0))
+            accepted = await asyncio.wait_for(writer.put(entry(1)), 1)
+            await writer.stop()
+            return accepted, writer.stats()
+
+        accepted, stats = asyncio.run(scenario())
+        assert accepted is False and stats["spilled"] == 1
+
+    def test_replay_error_does_not_stop_the_loop(self, tmp_path):
+        """An unexpected replay error is logged and the replay loop keeps running."""
+        spill = SpillBuffer(tmp_path, fsync=False)
+        spill.append([entry(0)])
+
+        async def scenario():
+            writer = PredictionLogWriter(write_rows=RecordingSink(), spill=spill, replay_interval_s=0.01)
+            calls = []
+
+            async def failing_replay():
+                calls.append(1)
+                raise OSError("disk error")
+
+            writer.replay = failing_replay
+            await writer.start()
+            await asyncio.sleep(0.1)
+            alive = not writer._replay_task.done()
+            await writer.stop()
+            return len(calls), alive
+
+        nb_calls, alive = asyncio.run(scenario())
+        assert nb_calls > 1 and alive
+
+    def test_stop_finishes_the_segment_being_replayed(self, tmp_path):
+        """stop() waits for the replayed segment to be written and deleted, so it is never replayed twice."""
+        spill = SpillBuffer(tmp_path, fsync=False)
+        spill.append([entry(0), entry(1)])
+        spill.seal()
+        writing = threading.Event()
+
+        class SlowSink(RecordingSink):
+            def __call__(self, rows):
+                writing.set()
+                time.sleep(0.1)
+                super().__call__(rows)
+
+        sink = SlowSink()
+
+        async def scenario():
+            writer = PredictionLogWriter(write_rows=sink, spill=spill, replay_interval_s=0.01)
+            await writer.start()
+            await asyncio.to_thread(writing.wait, 1)
+            await writer.stop()
+
+        asyncio.run(scenario())
+        assert len(sink.batches) == 1
+        assert spill.sealed_segments() == []
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="policy"):
+            PredictionLogWriter(policy="random")
@@ -0,0 +1,49 @@
+import pytest
+
+from src.api.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulated_on_render():
+    """A value equal to a bound falls in that bucket ('le' is inclusive); +Inf holds every observation."""
+    histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(("inference",), value)
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{stage="inference",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{stage="inference",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="inference"} 2.65' in lines
+    assert 'latency_seconds_count{stage="inference"} 4' in lines
+    assert histogram.count(("inference",)) == 4
+
+
+def test_counter_and_gauge():
+    counter = Counter("requests_total", "Requests.", ("endpoint",))
+    counter.inc(("/a",))
+    counter.inc(("/a",), 2)
+    gauge = Gauge("in_flight", "In flight.", ("endpoint",))
+    gauge.inc(("/a",))
+    gauge.inc(("/a",))
+    gauge.dec(("/a",))
+
+    assert counter.value(("/a",)) == 3
+    assert gauge.value(("/a",)) == 1
+    assert counter.value(("/b",)) == 0
+
+
+def test_registry_render_and_label_escaping():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("errors_total", "Errors.", ("model_version",)))
+    counter.inc(('v"1\\',))
+
+    text = registry.render()
+    assert text.startswith("# HELP errors_total Errors.\n# TYPE errors_total counter\n")
+    assert 'errors_total{model_version="v\\"1\\\\"} 1\n' in text
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    registry.register(Counter("requests_total", "Requests."))
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Gauge("requests_total", "Requests."))
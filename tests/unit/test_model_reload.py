@@ -0,0 +1,53 @@
+from src.api.model_reload import promote_model_dir, restore_model_dir
+
+
+def test_promote_then_restore_model_dir(tmp_path):
+    """The staged model replaces the served one, which is kept as backup and can be put back."""
+    model_dir, staging_dir, backup_dir = tmp_path / "model", tmp_path / "staging", tmp_path / "previous"
+    model_dir.mkdir()
+    (model_dir / "model.onnx").write_text("old")
+    staging_dir.mkdir()
+    (staging_dir / "model.onnx").write_text("new")
+
+    promote_model_dir(staging_dir, model_dir, backup_dir)
+    assert (model_dir / "model.onnx").read_text() == "new"
+    assert (backup_dir / "model.onnx").read_text() == "old"
+    assert not staging_dir.exists()
+
+    restore_model_dir(model_dir, backup_dir)
+    assert (model_dir / "model.onnx").read_text() == "old"
+    assert not backup_dir.exists()
+
+
+def test_failed_reload_resets_metadata_cache(tmp_path, dummy_runtime):
+    """After a rejected model, the metadata caches describe the restored model again."""
+    import asyncio
+    from types import SimpleNamespace
+    from unittest.mock import patch
+    from src.api.model_reload import ModelReloader
+    from src.model import model_service
+
+    model_dir, staging_dir, backup_dir = tmp_path / "model", tmp_path / "staging", tmp_path / "previous"
+    model_dir.mkdir()
+    (model_dir / "MLmodel").write_text("model_id: m-old\nsignature:\n  inputs: '[\"A\"]'\n")
+
+    def download(repo_id, token=None, local_dir=None):
+        local_dir.mkdir(parents=True)
+        (local_dir / "MLmodel").write_text("model_id: m-new\nsignature:\n  inputs: '[\"A\"]'\n")
+
+    async def scenario():
+        reloader = ModelReloader(model_dir, staging_dir, backup_dir)
+        reloader.start(SimpleNamespace(state=SimpleNamespace(runtime=dummy_runtime)), "repo/model")
+        return await reloader.wait()
+
+    with patch("src.api.model_reload.download_repo_from_hf", side_effect=download), \
+         patch("src.api.model_reload.validate_model_dir"), \
+         patch("src.api.model_reload.warm_up", side_effect=RuntimeError("bad outputs")), \
+         patch.object(model_service, "MODEL_DIR", model_dir), \
+         patch.object(model_service, "load_model_instance", return_value=dummy_runtime.session):
+        status = asyncio.run(scenario())
+        info = model_service.get_model_info()
+    model_service.clear_model_metadata_cache()
+
+    assert (status["state"], status["stage"]) == ("failed", "warming_up")
+    assert info["mlflow_model_id"] == "m-old"
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, mock_open, MagicMock
 from pathlib import Path
 import json
+import numpy as np
 from src.model import model_service
 
 class TestModelService:
@@ -82,3 +83,117 @@ metadata:
              {"name": "B", "type": "double", "description": None},
              {"name": "C", "type": "double", "description": None}
         ]
+
+    def test_build_feature_matrix(self):
+        """Verifies column ordering, None handling and dtype of the batch matrix."""
+        records = [{"B": 2, "A": 1.5}, {"A": None, "B": True}]
+        matrix = model_service.build_feature_matrix(records, ["A", "B"])
+
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        assert matrix.tolist() == [[1.5, 2.0], [0.0, 1.0]]
+
+    def test_batch_prediction_one_run_per_chunk(self):
+        """Verifies chunked scoring, vectorized thresholding and latency spreading."""
+        model = MagicMock()
+        model.get_inputs.return_value = [MagicMock()]
+
+        def fake_run(output_names, input_feed):
+            # La feature "P" est renvoyée telle quelle comme probabilité de refus
+            p_refus = next(iter(input_feed.values()))[:, 0]
+            return [None, np.column_stack([1 - p_refus, p_refus])]
+
+        model.run.side_effect = fake_run
+        sig = {"exists": True, "columns": [{"name": "P"}], "best_threshold": 0.5}
+        runtime = model_service.build_model_runtime(model, sig, {"mlflow_model_id": "m-1"})
+        records = [{"P": 0.2}, {"P": 0.7}, {"P": 0.5}]
+
+        batch = model_service.get_batch_prediction(runtime, records, chunk_size=2)
+
+        assert model.run.call_count == 2
+        assert [r["prediction"] for r in batch["results"]] == [0, 1, 1]
+        assert [r["decision"] for r in batch["results"]] == ["Accordé", "Refusé", "Refusé"]
+        assert len(batch["latencies_ms"]) == 3
+        # Les deux lignes du premier chunk partagent la latence du chunk
+        assert batch["latencies_ms"][0] == batch["latencies_ms"][1]
+
+    @patch('src.model.model_service.ORT_INTRA_OP_THREADS', 2)
+    @patch('src.model.model_service.ORT_INTER_OP_THREADS', 1)
+    @patch('src.model.model_service.ORT_GRAPH_OPTIMIZATION_LEVEL', 'extended')
+    @patch('src.model.model_service.ORT_EXECUTION_MODE', 'parallel')
+    @patch('src.model.model_service.ORT_ENABLE_CPU_MEM_ARENA', False)
+    def test_build_session_options(self):
+        """Verifies the SessionOptions are built from the ORT_* settings."""
+        options = model_service.build_session_options()
+
+        assert options.intra_op_num_threads == 2
+        assert options.inter_op_num_threads == 1
+        assert options.graph_optimization_level == model_service.ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        assert options.execution_mode == model_service.ort.ExecutionMode.ORT_PARALLEL
+        assert options.enable_cpu_mem_arena is False
+
+    @patch('src.model.model_service.MODEL_DIR', Path('/fake/path'))
+    @patch('pathlib.Path.exists', return_value=True)
+    def test_load_model_runtime_refreshes_metadata(self, mock_exists):
+        """A runtime load clears the metadata caches and precompiles the new model's metadata."""
+        session = MagicMock()
+        session.get_inputs.return_value = [MagicMock()]
+        session.get_inputs.return_value[0].name = "float_input"
+
+        def mlmodel(model_id, threshold):
+            return f"""
+model_id: {model_id}
+signature:
+  inputs: '["A", "B"]'
+metadata:
+  best_threshold: {threshold}
+"""
+
+        with patch.object(model_service, "load_model_instance", return_value=session):
+            with patch("builtins.open", mock_open(read_data=mlmodel("m-old", 0.4))):
+                old = model_service.load_model_runtime()
+            with patch("builtins.open", mock_open(read_data=mlmodel("m-new", 0.6))):
+                new = model_service.load_model_runtime()
+                # Le cache lru est invalidé : les endpoints de métadonnées voient le nouveau modèle
+                assert model_service.get_model_info()["mlflow_model_id"] == "m-new"
+
+        assert (old.version, old.threshold) == ("m-old", 0.4)
+        assert (new.version, new.threshold) == ("m-new", 0.6)
+        assert new.input_name == "float_input"
+        assert new.column_names == ("A", "B")
+
+    def test_runtime_is_immutable(self, dummy_runtime):
+        """The runtime bundle cannot be partially mutated after load."""
+        import dataclasses
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            dummy_runtime.threshold = 0.9
+
+    def test_get_prediction_reuses_row_buffer(self, dummy_runtime, sample_payload):
+        """Single-row predictions reuse the runtime's per-thread input buffer."""
+        buffer = dummy_runtime.row_buffer()
+        result = model_service.get_prediction(dummy_runtime, sample_payload)
+
+        assert result["score"] == 0.42
+        assert dummy_runtime.row_buffer() is buffer
+        assert buffer[0, dummy_runtime.column_names.index("AMT_ANNUITY")] == sample_payload["AMT_ANNUITY"]
+
+    def test_warm_up_runs_each_batch_size(self, dummy_runtime):
+        """Verifies the warm-up scores one synthetic batch per configured size."""
+        with patch.object(model_service, "score_matrix", wraps=model_service.score_matrix) as mock_score:
+            timings = model_service.warm_up(dummy_runtime, [1, 8, 64])
+
+        assert list(timings) == [1, 8, 64]
+        assert [call.args[1].shape[0] for call in mock_score.call_args_list] == [1, 8, 64]
+
+    def test_validate_model_dir_rejects_incomplete_artifacts(self, tmp_path):
+        """Verifies a staged model without model.onnx or MLmodel signature is rejected."""
+        with pytest.raises(ValueError, match="model.onnx not found"):
+            model_service.validate_model_dir(tmp_path)
+
+        (tmp_path / "model.onnx").write_bytes(b"not a model")
+        with pytest.raises(ValueError, match="signature"):
+            model_service.validate_model_dir(tmp_path)
+
+        (tmp_path / "MLmodel").write_text("signature:\n  inputs: '[{\"name\": \"A\", \"type\": \"double\"}]'\n")
+        with pytest.raises(ValueError, match="cannot be loaded"):
+            model_service.validate_model_dir(tmp_path)
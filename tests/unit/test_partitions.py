@@ -0,0 +1,90 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from src.api.database import partitions
+from src.api.database.partitions import (
+    upcoming_partitions,
+    partition_bounds,
+    expired_partitions,
+    partitioned_log_table,
+    create_partitioned_table,
+    ensure_partitions,
+    apply_retention
+)
+
+
+def mock_engine():
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    return engine, conn
+
+
+class TestPartitions:
+
+    def test_upcoming_partitions(self):
+        """Daily and monthly ranges cover the current period plus `ahead` next ones, across year ends."""
+        daily = upcoming_partitions(date(2026, 12, 31), "daily", ahead=1)
+        assert daily == [
+            ("prediction_logs_p20261231", date(2026, 12, 31), date(2027, 1, 1)),
+            ("prediction_logs_p20270101", date(2027, 1, 1), date(2027, 1, 2)),
+        ]
+        monthly = upcoming_partitions(date(2026, 11, 18), "monthly", ahead=2)
+        assert [name for name, _, _ in monthly] == [
+            "prediction_logs_p202611", "prediction_logs_p202612", "prediction_logs_p202701"
+        ]
+        assert monthly[1][1:] == (date(2026, 12, 1), date(2027, 1, 1))
+
+    def test_expired_partitions(self):
+        """Only partitions entirely older than the window expire; the default partition never does."""
+        assert partition_bounds("prediction_logs_p202602") == (date(2026, 2, 1), date(2026, 3, 1))
+        assert partition_bounds("prediction_logs_default") is None
+
+        names = ["prediction_logs_p202608", "prediction_logs_default", "prediction_logs_p202607", "prediction_logs_p202609"]
+        # Fenêtre de 30 jours au 18/09 : coupure au 19/08, août n'est pas encore entièrement expiré
+        assert expired_partitions(names, date(2026, 9, 18), retention_days=30) == ["prediction_logs_p202607"]
+
+    def test_partitioned_table_ddl(self):
+        """The partition key is part of the primary key and every index is kept."""
+        table = partitioned_log_table()
+        ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (timestamp)" in ddl
+        assert "PRIMARY KEY (id, timestamp)" in ddl
+        assert "id SERIAL NOT NULL" in ddl
+        assert "ix_prediction_logs_version_timestamp" in {index.name for index in table.indexes}
+
+    def test_non_postgres_fallback(self, tmp_path):
+        """Partitioning is skipped (plain table) on other databases; unknown settings are rejected."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+        assert create_partitioned_table(engine, "monthly") is False
+        assert create_partitioned_table(engine, "none") is False
+        with pytest.raises(ValueError):
+            create_partitioned_table(engine, "weekly")
+
+    def test_ensure_partitions_creates_missing_only(self):
+        engine, conn = mock_engine()
+        with patch.object(partitions, "list_partitions", return_value=["prediction_logs_p202610"]):
+            created = ensure_partitions(engine, "monthly", ahead=1, today=date(2026, 10, 18))
+
+        assert created == ["prediction_logs_p202611"]
+        statement = str(conn.execute.call_args.args[0])
+        assert "PARTITION OF prediction_logs FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')" in statement
+
+    @pytest.mark.parametrize("action, expected", [
+        ("drop", "DROP TABLE prediction_logs_p20261001"),
+        ("detach", "ALTER TABLE prediction_logs DETACH PARTITION prediction_logs_p20261001"),
+    ])
+    def test_apply_retention(self, action, expected):
+        """Expired partitions are dropped or detached, no row-level DELETE."""
+        engine, conn = mock_engine()
+        names = ["prediction_logs_p20261001", "prediction_logs_p20261017", "prediction_logs_default"]
+        with patch.object(partitions, "list_partitions", return_value=names):
+            expired = apply_retention(engine, retention_days=7, action=action, today=date(2026, 10, 18))
+
+        assert expired == ["prediction_logs_p20261001"]
+        assert [str(call.args[0]) for call in conn.execute.call_args_list] == [expected]
+        assert apply_retention(engine, retention_days=0) == []
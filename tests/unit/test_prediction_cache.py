@@ -0,0 +1,50 @@
+from unittest.mock import patch
+from src.model.prediction_cache import PredictionCache
+
+
+class TestPredictionCache:
+
+    def test_key_is_canonical(self, runtime_factory, sample_payload):
+        """Key order and int/float spelling do not matter; the model version does."""
+        runtime = runtime_factory()
+        reordered = dict(reversed(list(sample_payload.items())))
+        as_floats = {k: float(v) for k, v in sample_payload.items()}
+
+        key = PredictionCache.make_key(runtime, sample_payload)
+        assert PredictionCache.make_key(runtime, reordered) == key
+        assert PredictionCache.make_key(runtime, as_floats) == key
+        assert PredictionCache.make_key(runtime_factory(version="other"), sample_payload) != key
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once max_size is reached."""
+        cache = PredictionCache(max_size=2, ttl_s=60)
+        cache.put(b"a", {"score": 1}, cache.generation)
+        cache.put(b"b", {"score": 2}, cache.generation)
+        assert cache.get(b"a") == {"score": 1}
+        cache.put(b"c", {"score": 3}, cache.generation)
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2 and stats["misses"] == 1
+
+    def test_ttl_expiration(self):
+        """Entries older than ttl_s are treated as misses."""
+        cache = PredictionCache(max_size=10, ttl_s=5)
+        with patch("src.model.prediction_cache.time.monotonic", return_value=100.0):
+            cache.put(b"a", {"score": 1}, cache.generation)
+        with patch("src.model.prediction_cache.time.monotonic", return_value=106.0):
+            assert cache.get(b"a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidation_drops_in_flight_results(self):
+        """A result computed before an invalidation is not stored after it."""
+        cache = PredictionCache(max_size=10, ttl_s=60)
+        generation = cache.generation
+        cache.put(b"a", {"score": 1}, generation)
+        cache.invalidate()
+        cache.put(b"b", {"score": 2}, generation)
+
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["invalidations"] == 1
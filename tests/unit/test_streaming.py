@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from src.api.streaming import iter_ndjson_chunks, iter_ndjson_lines
+
+
+async def byte_stream(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+class TestNdjsonStreaming:
+
+    def test_lines_split_across_network_chunks(self):
+        """Lines cut between two network chunks are reassembled; blank lines are skipped."""
+        lines = asyncio.run(collect(iter_ndjson_lines(byte_stream(b'{"a": 1}\n{"a"', b': 2}\n\n{"a": 3}'))))
+        assert lines == [b'{"a": 1}', b'{"a": 2}', b'{"a": 3}']
+
+    def test_line_too_long_is_rejected(self):
+        """A line without newline cannot grow beyond the configured limit."""
+        with pytest.raises(ValueError, match="exceeds"):
+            asyncio.run(collect(iter_ndjson_lines(byte_stream(b"x" * 20, b"x" * 20), max_line_bytes=32)))
+
+    def test_chunks_keep_invalid_lines_in_place(self):
+        """Records are grouped by chunk_size; invalid JSON lines are kept as None."""
+        stream = byte_stream(b'{"a": 1}\nnot json\n[1, 2]\n{"a": 4}\n{"a": 5}\n')
+        chunks = asyncio.run(collect(iter_ndjson_chunks(stream, chunk_size=2)))
+        assert chunks == [[{"a": 1}, None], [None, {"a": 4}], [{"a": 5}]]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from src.api.schemas import ScoringData
+from src.api.validation import BatchValidator, records_to_matrix
+
+COLUMNS = tuple(ScoringData.model_fields)
+
+
+@pytest.fixture
+def validator():
+    return BatchValidator(COLUMNS)
+
+
+def is_valid_for_pydantic(record):
+    try:
+        ScoringData(**record)
+        return True
+    except ValidationError:
+        return False
+
+
+class TestBatchValidator:
+
+    def test_valid_batch(self, validator, sample_payload):
+        """A batch of valid records has an all-True mask and no error codes."""
+        matrix = records_to_matrix([sample_payload] * 3, COLUMNS)
+        result = validator.validate(matrix)
+
+        assert result.valid.all()
+        assert result.nb_invalid == 0
+
+    def test_error_codes(self, validator, sample_payload):
+        """Each invalid row lists every rule it violates."""
+        records = [
+            {**sample_payload, "FE_EXT_SOURCE_MEAN": 1.5},
+            {**sample_payload, "CODE_GENDER": 0.5},
+            {**sample_payload, "NAME_FAMILY_STATUS_Married": 2},
+            {**sample_payload, "FE_EXT_SOURCE_MIN": 0.9, "FE_EXT_SOURCE_MAX": 0.5},
+            {**sample_payload, "YEARS_BIRTH": "n/a"},
+        ]
+        result = validator.validate(records_to_matrix(records, COLUMNS))
+
+        assert not result.valid.any()
+        assert "FE_EXT_SOURCE_MEAN:above_max" in result.error_codes[0]
+        assert result.error_codes[1] == ["CODE_GENDER:not_integer"]
+        assert "NAME_FAMILY_STATUS_Married:not_boolean" in result.error_codes[2]
+        assert "FE_EXT_SOURCE_MAX:below_min" in result.error_codes[3]
+        assert result.error_codes[4] == ["YEARS_BIRTH:invalid_value"]
+
+    def test_parity_with_pydantic(self, validator, sample_payload):
+        """The vectorized rules accept exactly the records that ScoringData accepts."""
+        rng = np.random.default_rng(0)
+        records = []
+        for _ in range(200):
+            record = dict(sample_payload)
+            for name in rng.choice(COLUMNS, size=2, replace=False):
+                record[name] = float(rng.choice([-1.0, 0.0, 0.5, 1.0, 2.0, 150.0]))
+            records.append(record)
+
+        result = validator.validate(records_to_matrix(records, COLUMNS))
+        expected = [is_valid_for_pydantic(record) for record in records]
+
+        assert result.valid.tolist() == expected
+
+    def test_boolean_strings_parity_with_pydantic(self, validator, sample_payload):
+        """Boolean strings are accepted for boolean fields only, as ScoringData does."""
+        records = [
+            {**sample_payload, "NAME_FAMILY_STATUS_Married": "yes"},
+            {**sample_payload, "NAME_FAMILY_STATUS_Married": "off"},
+            {**sample_payload, "CODE_GENDER": "t"},
+            {**sample_payload, "AMT_ANNUITY": "on"},
+        ]
+        result = validator.validate(records_to_matrix(records, COLUMNS))
+
+        assert result.valid.tolist() == [is_valid_for_pydantic(record) for record in records] == [True, True, False, False]
+        assert result.error_codes[3] == ["AMT_ANNUITY:invalid_value"]
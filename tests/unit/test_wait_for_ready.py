@@ -0,0 +1,45 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from scripts.wait_for_ready import is_ready, wait_for_ready
+
+
+def serve(statuses: list[int]):
+    """Local HTTP server answering /ready with the given status codes, then the last one."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            body = json.dumps({"ready": status == 200, "checks": {"warmed_up": status == 200}}).encode()
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/ready"
+
+
+def test_waits_until_ready():
+    server, url = serve([503, 503, 200])
+    try:
+        assert is_ready(url) == (False, {"ready": False, "checks": {"warmed_up": False}})
+        assert wait_for_ready(url, timeout_s=5, interval_s=0.01)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_times_out_when_never_ready():
+    server, url = serve([503])
+    try:
+        assert not wait_for_ready(url, timeout_s=0.1, interval_s=0.01)
+    finally:
+        server.shutdown()
+        server.server_close()
+    # Aucune API à l'écoute
+    assert is_ready(url, timeout_s=0.5) == (False, None)
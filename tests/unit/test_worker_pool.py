@@ -0,0 +1,115 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from src.model.worker_pool import InferenceWorkerPool
+
+
+class FakeSession:
+    """Mimics onnxruntime.InferenceSession inside a worker process.
+    The refusal probability is the first feature; a negative first feature
+    makes the worker process crash.
+    """
+    class MockNodeArg:
+        name = "float_input"
+        shape = [None, 3]
+
+    def get_inputs(self):
+        return [self.MockNodeArg()]
+
+    def run(self, output_names, input_feed):
+        matrix = input_feed["float_input"]
+        if (matrix[:, 0] < 0).any():
+            os._exit(1)
+        return [None, np.column_stack([1 - matrix[:, 0], matrix[:, 0]])]
+
+
+def fake_loader():
+    return FakeSession()
+
+
+def failing_loader():
+    return None
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = InferenceWorkerPool(nb_workers=2, max_rows=4, timeout_s=30, loader=fake_loader)
+    yield pool
+    pool.close()
+
+
+class TestInferenceWorkerPool:
+
+    def test_behaves_like_a_session(self, pool):
+        """The pool exposes the worker session input name and returns (n, 2) probabilities."""
+        assert pool.get_inputs()[0].name == "float_input"
+
+        matrix = np.array([[0.1, 0, 0], [0.9, 0, 0]], dtype=np.float32)
+        _, probas = pool.run(None, {"float_input": matrix})
+
+        assert probas.shape == (2, 2)
+        assert np.allclose(probas[:, 1], [0.1, 0.9])
+
+    def test_batch_larger_than_buffer_is_chunked(self, pool):
+        """Matrices larger than the shared buffers are split across calls."""
+        matrix = np.zeros((10, 3), dtype=np.float32)
+        matrix[:, 0] = np.linspace(0, 0.9, 10)
+
+        _, probas = pool.run(None, {"float_input": matrix})
+        assert np.allclose(probas[:, 1], matrix[:, 0])
+
+    def test_crashed_worker_is_restarted(self, pool):
+        """A worker crash fails the current call, then the pool keeps serving."""
+        restarts = pool.nb_restarts
+        with pytest.raises(RuntimeError, match="crashed"):
+            pool.run(None, {"float_input": np.array([[-1, 0, 0]], dtype=np.float32)})
+
+        assert pool.nb_restarts == restarts + 1
+        _, probas = pool.run(None, {"float_input": np.array([[0.3, 0, 0]], dtype=np.float32)})
+        assert np.isclose(probas[0, 1], 0.3)
+        assert pool.stats()["alive"] == 2
+
+    def test_warm_up_reaches_every_worker(self, pool):
+        """Each synthetic batch runs on every worker, capped to the shared buffer size."""
+        with patch.object(pool, "_run_on", wraps=pool._run_on) as run_on:
+            timings = pool.warm_up([1, 64])
+
+        assert list(timings) == [1, 64]
+        calls = [(call.args[0].index, len(call.args[1])) for call in run_on.call_args_list]
+        assert sorted(calls) == [(0, 1), (0, 4), (1, 1), (1, 4)]
+        assert pool.stats()["idle"] == 2
+
+    def test_runtime_warm_up_uses_the_pool(self, pool):
+        """warm_up() on a process-backed runtime warms the whole pool."""
+        from src.model import model_service
+
+        signature = {"exists": True, "columns": [{"name": n} for n in "ABC"], "best_threshold": 0.5}
+        runtime = model_service.build_model_runtime(pool, signature, {"mlflow_model_id": "m-1"})
+        with patch.object(pool, "warm_up", wraps=pool.warm_up) as warm_up:
+            model_service.warm_up(runtime, [1, 8])
+        warm_up.assert_called_once_with([1, 8])
+
+    def test_create_returns_none_when_model_missing(self):
+        """Like load_model_instance, a pool whose workers cannot load the model is None."""
+        assert InferenceWorkerPool.create(nb_workers=1, loader=failing_loader) is None
+
+
+def test_process_backend_pins_the_loaded_model(tmp_path):
+    """Pool workers (and restarted ones) load the model bytes read at creation, not MODEL_DIR."""
+    from src.model import model_service
+
+    (tmp_path / "model.onnx").write_bytes(b"model-v1")
+    signature = {"exists": True, "columns": [{"name": "A"}, {"name": "B"}], "nb_features": 2, "best_threshold": 0.5}
+    with patch.object(model_service, "MODEL_DIR", tmp_path), \
+         patch.object(model_service, "INFERENCE_BACKEND", "process"), \
+         patch.object(model_service, "get_model_signature", return_value=signature), \
+         patch.object(model_service, "get_model_info", return_value={"exists": True}), \
+         patch.object(InferenceWorkerPool, "create", return_value=None) as create:
+        model_service.load_model_runtime()
+
+    loader = create.call_args.kwargs["loader"]
+    (tmp_path / "model.onnx").write_bytes(b"model-v2")
+    assert loader.keywords["model_bytes"] == b"model-v1"
+    assert create.call_args.kwargs["n_features"] == 2